@@ -0,0 +1,139 @@
+"""
+Import time of `flet_secure_storage`, measured in fresh interpreters.
+
+Usage:
+    python benchmarks/bench_import.py                             # print results
+    python benchmarks/bench_import.py --save benchmarks/import_baseline.json
+    python benchmarks/bench_import.py --compare benchmarks/import_baseline.json --tolerance 0.25
+
+Every statement runs in a new Python process so nothing is cached between
+runs. `total` is the wall time of the statement, including flet, and `own` is
+the time spent in the modules of this package alone (from `python -X
+importtime`). With `--compare` the script exits with status 1 when the median
+of either grows by more than the tolerance.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+STATEMENTS = {
+    "package": "import flet_secure_storage",
+    "secure_storage": "from flet_secure_storage import SecureStorage",
+    "options": "from flet_secure_storage.options import AndroidOptions",
+    "memory_backend": "from flet_secure_storage import MemoryBackend",
+}
+PACKAGE = "flet_secure_storage"
+# Prints the wall time of the statement in seconds as the last line of stdout
+_TIMER = (
+    "import time\nstart = time.perf_counter()\n{}\nprint(time.perf_counter() - start)"
+)
+
+
+def _run_once(statement: str) -> tuple[float, float]:
+    """
+    Returns the total and own import time of `statement` in milliseconds.
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _TIMER.format(statement)],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    total = float(completed.stdout.split()[-1]) * 1000
+    own_us = 0
+    # Lines look like "import time:  self [us] | cumulative | imported package"
+    for line in completed.stderr.splitlines():
+        fields = line.removeprefix("import time:").split("|")
+        if len(fields) == 3 and fields[2].strip().split(".")[0] == PACKAGE:
+            own_us += int(fields[0])
+    return total, own_us / 1000
+
+
+def run(statements: dict[str, str], repeat: int) -> dict[str, dict[str, float]]:
+    results: dict[str, dict[str, float]] = {}
+    for name, statement in statements.items():
+        # The first run compiles the bytecode, so it is not counted
+        _run_once(statement)
+        totals, owns = zip(*(_run_once(statement) for _ in range(repeat)))
+        results[name] = {
+            "repeat": repeat,
+            "total_ms": statistics.median(totals),
+            "own_ms": statistics.median(owns),
+        }
+        print(_format(name, results[name]), flush=True)
+    return results
+
+
+def _format(name: str, result: dict[str, float]) -> str:
+    return (
+        f"{name:<16} total {result['total_ms']:>8.2f} ms"
+        f"  own {result['own_ms']:>8.2f} ms"
+    )
+
+
+def compare(
+    baseline: dict[str, dict[str, float]],
+    current: dict[str, dict[str, float]],
+    tolerance: float,
+) -> list[str]:
+    """
+    Returns a message for every statement that imports slower than the
+    baseline by more than `tolerance` (0.25 = 25%).
+    """
+    regressions = []
+    for name, base in baseline.items():
+        result = current.get(name)
+        if result is None:
+            continue
+        for metric in ("total_ms", "own_ms"):
+            if result[metric] > base[metric] * (1 + tolerance):
+                regressions.append(
+                    f"{name}: {metric} {result[metric]:.2f} ms is above "
+                    f"the baseline of {base[metric]:.2f} ms"
+                )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--repeat", type=int, default=15, help="Processes per statement"
+    )
+    parser.add_argument("--save", type=Path, help="Write the results to a JSON file")
+    parser.add_argument("--compare", type=Path, help="Baseline JSON to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    results = run(STATEMENTS, args.repeat)
+
+    if args.save is not None:
+        args.save.write_text(
+            json.dumps(
+                {
+                    "python": platform.python_version(),
+                    "settings": {"repeat": args.repeat},
+                    "results": results,
+                },
+                indent=2,
+            )
+            + "\n"
+        )
+
+    if args.compare is not None:
+        baseline = json.loads(args.compare.read_text())
+        regressions = compare(baseline["results"], results, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.tolerance:.0%} of {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,236 @@
+"""
+Microbenchmarks of `SecureStorage` against a fake client with simulated latency.
+
+Usage:
+    python benchmarks/bench_storage.py                            # print results
+    python benchmarks/bench_storage.py --save benchmarks/baseline.json
+    python benchmarks/bench_storage.py --compare benchmarks/baseline.json --tolerance 0.25
+
+Every call to the fake client waits `--latency` seconds (1 ms by default), so
+results follow the number of round trips rather than timer noise. With
+`--compare` the script exits with status 1 when the throughput of a benchmark
+drops, or its p95 latency grows, by more than the tolerance, or when it makes
+more calls to the client per operation than the baseline.
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
+
+from fake_backend import LatencyBackend
+
+from flet_secure_storage import CacheOptions, SecureStorage
+
+SIZES = (10, 100, 1_000, 10_000, 100_000)
+# get_keys, scan and clear touch every key, so they run fewer times on large stores
+FULL_SCAN_BUDGET = 200_000
+# Simulated round trip to the client, in seconds
+LATENCY = 0.001
+
+
+def _storage(backend: LatencyBackend, cache: bool) -> SecureStorage:
+    svc = SecureStorage(cache=CacheOptions() if cache else None)
+    svc._invoke_method = backend.invoke  # type: ignore[method-assign,assignment]
+    return svc
+
+
+def _populate(backend: LatencyBackend, size: int) -> None:
+    backend.storage = {f"key{i}": f"value{i}" for i in range(size)}
+
+
+async def _measure(
+    backend: LatencyBackend,
+    operation: Callable[[int], Awaitable[Any]],
+    iterations: int,
+    before: Callable[[], None] | None = None,
+) -> dict[str, float]:
+    durations = []
+    calls = backend.calls
+    for i in range(iterations):
+        if before is not None:
+            before()
+        start = time.perf_counter()
+        await operation(i)
+        durations.append(time.perf_counter() - start)
+    total = sum(durations)
+    if len(durations) > 1:
+        cuts = statistics.quantiles(durations, n=100, method="inclusive")
+        p50, p95 = cuts[49], cuts[94]
+    else:
+        p50 = p95 = durations[0]
+    return {
+        "iterations": iterations,
+        "calls_per_op": (backend.calls - calls) / iterations,
+        "ops_per_sec": iterations / total if total else float("inf"),
+        "p50_ms": p50 * 1000,
+        "p95_ms": p95 * 1000,
+    }
+
+
+async def run(
+    sizes: tuple[int, ...],
+    iterations: int,
+    latency: float,
+    jitter: float,
+    cache: bool,
+) -> dict[str, dict[str, float]]:
+    results: dict[str, dict[str, float]] = {}
+    for size in sizes:
+        backend = LatencyBackend(latency=latency, jitter=jitter)
+        svc = _storage(backend, cache)
+        _populate(backend, size)
+        scans = max(3, min(iterations, FULL_SCAN_BUDGET // size))
+
+        async def set_(i: int) -> Any:
+            return await svc.set(f"key{i % size}", f"new{i}")
+
+        async def get(i: int) -> Any:
+            return await svc.get(f"key{i % size}")
+
+        async def contains_key(i: int) -> Any:
+            return await svc.contains_key(f"key{(i * 7) % (size * 2)}")
+
+        async def get_keys(i: int) -> Any:
+            return await svc.get_keys("key1")
+
+        async def scan(i: int) -> Any:
+            return [item async for item in svc.iter_items(page_size=100)]
+
+        async def commit(i: int) -> Any:
+            async with svc.transaction() as tx:
+                tx.set(f"key{i % size}", f"new{i}")
+                tx.set(f"key{(i + 1) % size}", f"new{i}")
+                tx.remove(f"key{(i + 2) % size}")
+
+        async def clear(i: int) -> Any:
+            return await svc.clear()
+
+        benchmarks = {
+            "set": _measure(backend, set_, iterations),
+            "get": _measure(backend, get, iterations),
+            "contains_key": _measure(backend, contains_key, iterations),
+            "get_keys": _measure(backend, get_keys, scans),
+            "scan": _measure(
+                backend, scan, scans, before=lambda: _populate(backend, size)
+            ),
+            "commit": _measure(backend, commit, iterations),
+            "clear": _measure(
+                backend, clear, scans, before=lambda: _populate(backend, size)
+            ),
+        }
+        for name, benchmark in benchmarks.items():
+            results[f"{name}@{size}"] = await benchmark
+            print(_format(f"{name}@{size}", results[f"{name}@{size}"]), flush=True)
+    return results
+
+
+def _format(name: str, result: dict[str, float]) -> str:
+    return (
+        f"{name:<22} {result['ops_per_sec']:>12.1f} ops/s"
+        f"  p50 {result['p50_ms']:>9.3f} ms  p95 {result['p95_ms']:>9.3f} ms"
+        f"  calls/op {result['calls_per_op']:>7.2f}"
+    )
+
+
+def compare(
+    baseline: dict[str, dict[str, float]],
+    current: dict[str, dict[str, float]],
+    tolerance: float,
+) -> list[str]:
+    """
+    Returns a message for every benchmark that got worse than the baseline by
+    more than `tolerance` (0.25 = 25%), or makes more calls to the client.
+    """
+    regressions = []
+    for name, base in baseline.items():
+        result = current.get(name)
+        if result is None:
+            continue
+        if result["ops_per_sec"] < base["ops_per_sec"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: throughput {result['ops_per_sec']:.1f} ops/s is below "
+                f"the baseline of {base['ops_per_sec']:.1f} ops/s"
+            )
+        if result["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: p95 latency {result['p95_ms']:.3f} ms is above "
+                f"the baseline of {base['p95_ms']:.3f} ms"
+            )
+        if "calls_per_op" in base and result["calls_per_op"] > base["calls_per_op"]:
+            regressions.append(
+                f"{name}: {result['calls_per_op']:.2f} calls per operation is above "
+                f"the baseline of {base['calls_per_op']:.2f}"
+            )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--sizes",
+        type=lambda value: tuple(int(size) for size in value.split(",")),
+        default=SIZES,
+        help="Comma separated store sizes (default: %(default)s)",
+    )
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument(
+        "--latency", type=float, default=LATENCY, help="Seconds per client call"
+    )
+    parser.add_argument(
+        "--jitter", type=float, default=0.0, help="Extra random seconds per call"
+    )
+    parser.add_argument("--cache", action="store_true", help="Enable the value cache")
+    parser.add_argument("--save", type=Path, help="Write the results to a JSON file")
+    parser.add_argument("--compare", type=Path, help="Baseline JSON to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    settings = {
+        "latency": args.latency,
+        "jitter": args.jitter,
+        "cache": args.cache,
+        "iterations": args.iterations,
+    }
+    results = asyncio.run(
+        run(args.sizes, args.iterations, args.latency, args.jitter, args.cache)
+    )
+
+    if args.save is not None:
+        args.save.write_text(
+            json.dumps(
+                {
+                    "python": platform.python_version(),
+                    "settings": settings,
+                    "results": results,
+                },
+                indent=2,
+            )
+            + "\n"
+        )
+
+    if args.compare is not None:
+        baseline = json.loads(args.compare.read_text())
+        if baseline.get("settings") != settings:
+            print(
+                f"warning: baseline settings {baseline.get('settings')} differ "
+                f"from {settings}",
+                file=sys.stderr,
+            )
+        regressions = compare(baseline["results"], results, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.tolerance:.0%} of {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+import asyncio
+import random
+from typing import Any, Optional
+
+# Methods that do not change the storage, so a scan in progress is kept
+_READS = {
+    "get",
+    "get_many",
+    "contains_key",
+    "contains_many",
+    "get_keys",
+    "list_keys",
+    "count",
+    "scan",
+    "items",
+}
+
+__all__ = ["LatencyBackend"]
+
+
+class LatencyBackend:
+    """
+    In-memory stand-in for the Dart `SecureStorageService._invokeMethod` that
+    waits a configurable time on every call, like a round trip to the client.
+
+    Args:
+        latency (float): Seconds added to every call.
+        jitter (float): Up to this many extra seconds, picked at random per call.
+        seed (int): Seed of the jitter, so runs can be repeated.
+    """
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, seed: int = 0):
+        if latency < 0 or jitter < 0:
+            raise ValueError("latency and jitter cannot be negative.")
+        self.latency = latency
+        self.jitter = jitter
+        self.storage: dict[str, str] = {}
+        self.calls = 0
+        self._random = random.Random(seed)
+        # The prefix, cursor and sorted keys of the scan in progress, so its
+        # next page does not sort the store again (as the Dart client does)
+        self._scan: Optional[tuple[Optional[str], str, list[str]]] = None
+
+    async def _wait(self) -> None:
+        delay = self.latency
+        if self.jitter:
+            delay += self._random.uniform(0, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _items(self, prefix: Optional[str]) -> dict[str, str]:
+        if not prefix:
+            return dict(self.storage)
+        return {
+            key: value for key, value in self.storage.items() if key.startswith(prefix)
+        }
+
+    def _scan_page(self, args: dict[str, Any]) -> dict[str, Any]:
+        prefix = args.get("prefix")
+        start_after = args.get("start_after")
+        limit = args.get("limit") or 100
+        if (
+            self._scan is not None
+            and start_after is not None
+            and self._scan[:2] == (prefix, start_after)
+        ):
+            keys = self._scan[2]
+        else:
+            keys = sorted(
+                key
+                for key in self._items(prefix)
+                if start_after is None or key > start_after
+            )
+        page = keys[:limit]
+        rest = keys[limit:]
+        self._scan = (prefix, page[-1], rest) if page and rest else None
+        return {
+            "keys": page,
+            "items": (
+                {key: self.storage[key] for key in page} if args.get("values") else {}
+            ),
+            "cursor": page[-1] if rest else None,
+        }
+
+    async def invoke(
+        self,
+        name: str,
+        args: Optional[dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        self.calls += 1
+        await self._wait()
+        args = args or {}
+        if name not in _READS:
+            # Like the client, any call that may change the storage ends a scan
+            self._scan = None
+        if name == "set":
+            self.storage[args["key"]] = args["value"]
+            return True
+        if name == "get":
+            return self.storage.get(args["key"])
+        if name == "contains_key":
+            return args["key"] in self.storage
+        if name == "remove":
+            self.storage.pop(args["key"], None)
+            return True
+        if name in ("get_keys", "items"):
+            return self._items(args.get("prefix"))
+        if name == "list_keys":
+            return list(self._items(args.get("prefix")))
+        if name == "count":
+            return len(self._items(args.get("prefix")))
+        if name == "scan":
+            return self._scan_page(args)
+        if name == "commit":
+            self.storage.update(args["writes"])
+            for key in args["removes"]:
+                self.storage.pop(key, None)
+            return {"committed": True, "applied": True}
+        if name == "clear":
+            self.storage.clear()
+            return True
+        if name == "clear_prefix":
+            keys = list(self._items(args["prefix"]))
+            for key in keys:
+                del self.storage[key]
+            return len(keys)
+        if name == "set_many":
+            self.storage.update(args["values"])
+            return {key: True for key in args["values"]}
+        if name == "get_many":
+            return {key: self.storage.get(key) for key in args["keys"]}
+        if name == "contains_many":
+            return {key: key in self.storage for key in args["keys"]}
+        if name == "remove_many":
+            for key in args["keys"]:
+                self.storage.pop(key, None)
+            return {key: True for key in args["keys"]}
+        raise ValueError(f"Unknown method: {name}")
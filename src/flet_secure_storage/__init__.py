@@ -1,15 +1,44 @@
-from .options.android_options import (
-    AndroidOptions,
-    KeyCipherAlgorithm,
-    StorageCipherAlgorithm,
-)
-from .options.apple_options import AccessControlFlag, KeychainAccessibility
-from .options.ios_options import IOSOptions
-from .options.linux_options import LinuxOptions
-from .options.macos_options import MacOsOptions
-from .options.web_options import WebOptions
-from .options.windows_options import WindowsOptions
-from .secure_storage import SecureStorage
+from typing import TYPE_CHECKING
+
+from ._helpers import lazy_exports
+
+if TYPE_CHECKING:
+    from .backends import (
+        EncryptedFileBackend,
+        FlutterBackend,
+        MemoryBackend,
+        StorageBackend,
+    )
+    from .cache import CacheManager, CacheOptions, CacheStats
+    from .compression import CompressionOptions
+    from .events import SecureStorageChangeEvent
+    from .hashed_keys import HashedKeyOptions
+    from .metrics import CallRecord, StorageMetrics
+    from .namespace import SecureStorageNamespace
+    from .options.android_options import (
+        AndroidOptions,
+        KeyCipherAlgorithm,
+        StorageCipherAlgorithm,
+    )
+    from .options.apple_options import AccessControlFlag, KeychainAccessibility
+    from .options.frozen_options import FrozenOptions
+    from .options.ios_options import IOSOptions
+    from .options.linux_options import LinuxOptions
+    from .options.macos_options import MacOsOptions
+    from .options.web_options import WebOptions
+    from .options.windows_options import WindowsOptions
+    from .secure_storage import (
+        ScanPage,
+        SecureStorage,
+        SecureStorageBlobError,
+        SecureStorageFlushError,
+        SecureStorageTimeoutError,
+        SecureStorageTransactionError,
+    )
+    from .snapshot import SecureStorageSnapshotError
+    from .transaction import SecureStorageTransaction
+    from .value_codecs import CodecRegistry, ValueCodec
+    from .write_behind import WriteBehindOptions
 
 __all__ = [
     "SecureStorage",
@@ -21,6 +50,72 @@ __all__ = [
     "MacOsOptions",
     "KeychainAccessibility",
     "AccessControlFlag",
+    "FrozenOptions",
     "KeyCipherAlgorithm",
     "StorageCipherAlgorithm",
+    "CacheOptions",
+    "CacheStats",
+    "CacheManager",
+    "WriteBehindOptions",
+    "SecureStorageFlushError",
+    "SecureStorageTimeoutError",
+    "SecureStorageTransaction",
+    "SecureStorageTransactionError",
+    "SecureStorageSnapshotError",
+    "ScanPage",
+    "CodecRegistry",
+    "ValueCodec",
+    "CompressionOptions",
+    "HashedKeyOptions",
+    "SecureStorageBlobError",
+    "SecureStorageNamespace",
+    "SecureStorageChangeEvent",
+    "StorageMetrics",
+    "CallRecord",
+    "StorageBackend",
+    "FlutterBackend",
+    "MemoryBackend",
+    "EncryptedFileBackend",
 ]
+
+# The submodule each public name lives in. They are imported on first use, so
+# importing the package does not load flet or every platform's options.
+_LAZY_IMPORTS = {
+    ".backends": (
+        "StorageBackend",
+        "FlutterBackend",
+        "MemoryBackend",
+        "EncryptedFileBackend",
+    ),
+    ".cache": ("CacheOptions", "CacheStats", "CacheManager"),
+    ".compression": ("CompressionOptions",),
+    ".events": ("SecureStorageChangeEvent",),
+    ".hashed_keys": ("HashedKeyOptions",),
+    ".metrics": ("StorageMetrics", "CallRecord"),
+    ".namespace": ("SecureStorageNamespace",),
+    ".options.android_options": (
+        "AndroidOptions",
+        "KeyCipherAlgorithm",
+        "StorageCipherAlgorithm",
+    ),
+    ".options.apple_options": ("KeychainAccessibility", "AccessControlFlag"),
+    ".options.frozen_options": ("FrozenOptions",),
+    ".options.ios_options": ("IOSOptions",),
+    ".options.linux_options": ("LinuxOptions",),
+    ".options.macos_options": ("MacOsOptions",),
+    ".options.web_options": ("WebOptions",),
+    ".options.windows_options": ("WindowsOptions",),
+    ".secure_storage": (
+        "SecureStorage",
+        "SecureStorageFlushError",
+        "SecureStorageTimeoutError",
+        "SecureStorageTransactionError",
+        "SecureStorageBlobError",
+        "ScanPage",
+    ),
+    ".snapshot": ("SecureStorageSnapshotError",),
+    ".transaction": ("SecureStorageTransaction",),
+    ".value_codecs": ("CodecRegistry", "ValueCodec"),
+    ".write_behind": ("WriteBehindOptions",),
+}
+__getattr__, __dir__ = lazy_exports(__name__, _LAZY_IMPORTS)
@@ -1,5 +1,11 @@
-from datetime import datetime
+import importlib
+import sys
+from collections.abc import Callable
+from dataclasses import fields, is_dataclass
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
 from enum import Enum
+from typing import Any
 
 __all__ = [
     "parse_str",
@@ -8,8 +14,26 @@ __all__ = [
     "parse_dt",
     "parse_int",
     "add_prefix",
+    "is_immutable",
+    "lazy_exports",
 ]
 
+# Types whose instances cannot be changed after they are created
+_IMMUTABLE_TYPES = (
+    str,
+    bytes,
+    int,
+    float,
+    complex,
+    Decimal,
+    date,
+    datetime,
+    time,
+    timedelta,
+    Enum,
+    type(None),
+)
+
 _TRUE_STRINGS = {"true", "t", "1", "y", "yes"}
 _FALSE_STRINGS = {"false", "f", "0", "n", "no"}
 
@@ -201,3 +225,57 @@ def add_prefix(prefix: str, separator: str, key: str) -> str:
         return key
 
     return f"{prefix}{separator}{key}"
+
+
+def is_immutable(value: Any) -> bool:
+    """
+    Checks whether a value, and everything it holds, cannot be changed.
+
+    Args:
+        value (Any): The value to check.
+
+    Returns:
+        bool: True for scalars, enums, and tuples, frozensets and frozen
+            dataclasses that hold only immutable values.
+    """
+    if isinstance(value, _IMMUTABLE_TYPES):
+        return True
+    if isinstance(value, (tuple, frozenset)):
+        return all(is_immutable(item) for item in value)
+    if is_dataclass(value) and not isinstance(value, type):
+        return value.__dataclass_params__.frozen and all(  # type: ignore[attr-defined]
+            is_immutable(getattr(value, field.name)) for field in fields(value)
+        )
+    return False
+
+
+def lazy_exports(
+    package: str, lazy_imports: dict[str, tuple[str, ...]]
+) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """
+    Builds the module `__getattr__` and `__dir__` of a package whose public
+    names are imported from their submodule the first time they are used.
+
+    Args:
+        package (str): The `__name__` of the package.
+        lazy_imports (dict[str, tuple[str, ...]]): The names exported from each
+            submodule, keyed by the submodule's name relative to the package.
+
+    Returns:
+        tuple: The `__getattr__` and `__dir__` functions for the package.
+    """
+    modules = {name: module for module, names in lazy_imports.items() for name in names}
+
+    def __getattr__(name: str) -> Any:
+        module = modules.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module, package), name)
+        # Later lookups find the name directly and skip __getattr__
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted({*vars(sys.modules[package]), *modules})
+
+    return __getattr__, __dir__
@@ -0,0 +1,23 @@
+from typing import TYPE_CHECKING
+
+from .._helpers import lazy_exports
+
+if TYPE_CHECKING:
+    from .base import FlutterBackend, StorageBackend
+    from .encrypted_file import EncryptedFileBackend
+    from .memory import MemoryBackend
+
+__all__ = [
+    "StorageBackend",
+    "FlutterBackend",
+    "MemoryBackend",
+    "EncryptedFileBackend",
+]
+
+# The file and memory backends are only imported by the apps that use them
+_LAZY_IMPORTS = {
+    ".base": ("StorageBackend", "FlutterBackend"),
+    ".memory": ("MemoryBackend",),
+    ".encrypted_file": ("EncryptedFileBackend",),
+}
+__getattr__, __dir__ = lazy_exports(__name__, _LAZY_IMPORTS)
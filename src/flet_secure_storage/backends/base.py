@@ -0,0 +1,46 @@
+from typing import TYPE_CHECKING, Any, Optional, Protocol, runtime_checkable
+
+if TYPE_CHECKING:
+    import flet as ft
+
+__all__ = ["StorageBackend", "FlutterBackend"]
+
+
+@runtime_checkable
+class StorageBackend(Protocol):
+    """
+    Runs the storage methods called by `SecureStorage`.
+
+    Methods and arguments are the ones handled by `SecureStorageService` in
+    `secure_storage.dart`, for example `invoke("get", {"key": "a"})`.
+    Failures to store a change are reported as the client reports them, with
+    False, a count of the keys changed, or a commit that was not stored,
+    rather than raised.
+    """
+
+    async def invoke(
+        self,
+        method: str,
+        args: Optional[dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> Any: ...
+
+
+class FlutterBackend:
+    """
+    Sends storage methods to the Flutter client, where they run with
+    flutter_secure_storage. This is the default backend of `SecureStorage`.
+    """
+
+    def __init__(self, service: "ft.Service"):
+        self.service = service
+
+    async def invoke(
+        self,
+        method: str,
+        args: Optional[dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        if timeout is None:
+            return await self.service._invoke_method(method, args)
+        return await self.service._invoke_method(method, args, timeout)
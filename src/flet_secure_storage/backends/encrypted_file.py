@@ -0,0 +1,426 @@
+import asyncio
+import contextlib
+import hashlib
+import json
+import os
+import secrets
+import zlib
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, BinaryIO, Optional, Union
+
+from .memory import MemoryBackend
+
+if TYPE_CHECKING:
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+__all__ = ["EncryptedFileBackend"]
+
+_MAGIC = b"FSSE"
+_VERSION = 3
+_SALT_SIZE = 16
+_NONCE_SIZE = 12
+_TAG_SIZE = 16
+# Magic, version, PBKDF2 iterations (0 for raw keys), salt and the tag that
+# checks the key
+_PREFIX_SIZE = len(_MAGIC) + 1 + 4 + _SALT_SIZE
+_HEADER_SIZE = _PREFIX_SIZE + _TAG_SIZE
+# Every record starts with the size of its body and the CRC-32 of that size,
+# so a damaged size is told apart from a record cut short by a crash
+_FRAME_SIZE = 8
+_MIN_BODY_SIZE = _NONCE_SIZE + _TAG_SIZE + 5
+# OWASP guidance for PBKDF2-HMAC-SHA256 (2023)
+_KDF_ITERATIONS = 600_000
+# Methods that only read the values kept in memory
+_READS = frozenset(
+    {
+        "get",
+        "contains_key",
+        "get_keys",
+        "items",
+        "list_keys",
+        "count",
+        "scan",
+        "get_many",
+        "contains_many",
+    }
+)
+
+_SET = 1
+_REMOVE = 2
+_CLEAR = 3
+_BATCH = 4
+
+
+def _aead(key: bytes) -> "AESGCM":
+    try:
+        from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+    except ImportError as exc:
+        raise ImportError(
+            "EncryptedFileBackend requires the cryptography package. "
+            "Install it with: pip install 'flet-secure-storage[file]'"
+        ) from exc
+    return AESGCM(key)
+
+
+def _frame(size: int) -> bytes:
+    raw = size.to_bytes(4, "big")
+    return raw + zlib.crc32(raw).to_bytes(4, "big")
+
+
+class EncryptedFileBackend(MemoryBackend):
+    """
+    Runs the storage methods in Python and keeps the values in an encrypted,
+    append-only file, for headless jobs, CLI tools and server-side tests.
+
+    Every change is appended as an encrypted record, and the values are kept in
+    memory, so reads never touch the file. Once the file holds `compact_ratio`
+    times more records than there are keys (and at least `compact_min_records`),
+    it is rewritten with one record per key. Changes are written from a worker
+    thread, one at a time, so the event loop is not blocked.
+
+    Records are encrypted and authenticated with AES-256-GCM from the
+    `cryptography` package, installed with the `file` extra. A record left
+    incomplete by a crash at the end of the file is dropped when the file is
+    opened; any other damage, or the wrong key, raises ValueError and leaves
+    the file untouched.
+
+    The file must only be used by one process at a time. Opening it reads the
+    whole file and, for a passphrase, runs PBKDF2; use `await
+    EncryptedFileBackend.open(...)` to do that in a worker thread.
+
+    Args:
+        path (str | Path): The file to store the values in. Created if missing,
+            readable only by the current user.
+        key (bytes | str): 32 or more random bytes, or a passphrase that is
+            stretched with PBKDF2-HMAC-SHA256.
+        compact_ratio (float): Records per key above which the file is compacted.
+        compact_min_records (int): The number of records below which the file
+            is never compacted.
+        sync (bool): Call fsync after every change, trading speed for durability
+            on power loss.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        key: Union[bytes, str],
+        compact_ratio: float = 2.0,
+        compact_min_records: int = 1024,
+        sync: bool = False,
+    ):
+        super().__init__()
+        if isinstance(key, str):
+            if key == "":
+                raise ValueError("key cannot be empty.")
+        elif not isinstance(key, bytes) or len(key) < 32:
+            raise ValueError("key must be a passphrase or at least 32 random bytes.")
+        if compact_ratio <= 1:
+            raise ValueError("compact_ratio must be greater than 1.")
+
+        self.path = Path(path)
+        self.compact_ratio = compact_ratio
+        self.compact_min_records = compact_min_records
+        self.sync = sync
+        self._key = key
+        self._records = 0
+        self._file: Optional[BinaryIO] = None
+        self._lock = asyncio.Lock()
+
+        if self.path.exists() and self.path.stat().st_size > 0:
+            self._load()
+        else:
+            self._salt = secrets.token_bytes(_SALT_SIZE)
+            self._iterations = _KDF_ITERATIONS if isinstance(key, str) else 0
+            self._derive_key()
+            self._rewrite({})
+
+    @classmethod
+    async def open(
+        cls,
+        path: Union[str, Path],
+        key: Union[bytes, str],
+        compact_ratio: float = 2.0,
+        compact_min_records: int = 1024,
+        sync: bool = False,
+    ) -> "EncryptedFileBackend":
+        """
+        Creates the backend in a worker thread, so reading the file and
+        deriving the key do not block the event loop.
+        """
+        return await asyncio.to_thread(
+            cls, path, key, compact_ratio, compact_min_records, sync
+        )
+
+    # Keys and records
+
+    def _derive_key(self) -> None:
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+        if isinstance(self._key, str):
+            master = hashlib.pbkdf2_hmac(
+                "sha256", self._key.encode(), self._salt, self._iterations
+            )
+        else:
+            master = self._key
+        self._aead = _aead(
+            HKDF(
+                algorithm=hashes.SHA256(),
+                length=32,
+                salt=self._salt,
+                info=b"flet-secure-storage file",
+            ).derive(master)
+        )
+
+    def _header_prefix(self) -> bytes:
+        return (
+            _MAGIC
+            + bytes([_VERSION])
+            + self._iterations.to_bytes(4, "big")
+            + self._salt
+        )
+
+    def _header(self) -> bytes:
+        prefix = self._header_prefix()
+        # The key is unique to the salt, so the fixed nonce is never reused
+        # for different data
+        return prefix + self._aead.encrypt(bytes(_NONCE_SIZE), b"", prefix)
+
+    def _seal(self, sequence: int, op: int, key: str, value: str = "") -> bytes:
+        raw_key = key.encode()
+        plain = bytes([op]) + len(raw_key).to_bytes(4, "big") + raw_key + value.encode()
+        nonce = secrets.token_bytes(_NONCE_SIZE)
+        body = nonce + self._aead.encrypt(nonce, plain, sequence.to_bytes(8, "big"))
+        return _frame(len(body)) + body
+
+    def _open(self, body: bytes, sequence: int) -> tuple[int, str, str]:
+        from cryptography.exceptions import InvalidTag
+
+        try:
+            plain = self._aead.decrypt(
+                body[:_NONCE_SIZE], body[_NONCE_SIZE:], sequence.to_bytes(8, "big")
+            )
+        except InvalidTag as exc:
+            raise ValueError(f"{self.path} is corrupted.") from exc
+        key_size = int.from_bytes(plain[1:5], "big")
+        key_end = 5 + key_size
+        return plain[0], plain[5:key_end].decode(), plain[key_end:].decode()
+
+    # File handling
+
+    def _load(self) -> None:
+        from cryptography.exceptions import InvalidTag
+
+        data = self.path.read_bytes()
+        if len(data) < len(_MAGIC) + 1 or not data.startswith(_MAGIC):
+            raise ValueError(f"{self.path} is not an encrypted storage file.")
+        version = data[len(_MAGIC)]
+        if version != _VERSION:
+            raise ValueError(f"Unsupported storage file version: {version}.")
+        if len(data) < _HEADER_SIZE:
+            raise ValueError(f"{self.path} is not an encrypted storage file.")
+        iterations_start = len(_MAGIC) + 1
+        salt_start = iterations_start + 4
+        self._iterations = int.from_bytes(data[iterations_start:salt_start], "big")
+        self._salt = data[salt_start:_PREFIX_SIZE]
+        if isinstance(self._key, str) != (self._iterations > 0):
+            raise ValueError(f"Wrong key for {self.path}.")
+        self._derive_key()
+        try:
+            self._aead.decrypt(
+                bytes(_NONCE_SIZE), data[_PREFIX_SIZE:_HEADER_SIZE], data[:_PREFIX_SIZE]
+            )
+        except InvalidTag as exc:
+            raise ValueError(f"Wrong key for {self.path}.") from exc
+
+        offset = _HEADER_SIZE
+        while offset < len(data):
+            size_end = offset + 4
+            start = offset + _FRAME_SIZE
+            if start > len(data):
+                break
+            size = int.from_bytes(data[offset:size_end], "big")
+            if data[offset:start] != _frame(size) or size < _MIN_BODY_SIZE:
+                raise ValueError(f"{self.path} is corrupted at byte {offset}.")
+            end = start + size
+            if end > len(data):
+                break
+            op, key, value = self._open(data[start:end], self._records)
+            if op == _SET:
+                self._data[key] = value
+            elif op == _REMOVE:
+                self._data.pop(key, None)
+            elif op == _CLEAR:
+                self._data.clear()
+            elif op == _BATCH:
+                batch = json.loads(value)
+                self._data.update(batch["writes"])
+                for removed in batch["removes"]:
+                    self._data.pop(removed, None)
+            self._records += 1
+            offset = end
+
+        if offset < len(data):
+            # Only the last record can be incomplete: drop what a crash left of it
+            with open(self.path, "r+b") as file:
+                file.truncate(offset)
+        self._file = self._append_handle(self.path)
+
+    def _append_handle(self, path: Path) -> BinaryIO:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+        # Unbuffered, so a failed write leaves nothing behind to be sent later
+        return os.fdopen(fd, "ab", buffering=0)
+
+    @staticmethod
+    def _write_all(file: BinaryIO, data: bytes) -> None:
+        view = memoryview(data)
+        while view:
+            written = file.write(view)
+            view = view[written:]
+
+    def _rewrite(self, values: dict[str, str]) -> None:
+        """
+        Writes a new file holding `values` and switches to it atomically.
+        """
+        records = [self._header()]
+        for sequence, (key, value) in enumerate(values.items()):
+            records.append(self._seal(sequence, _SET, key, value))
+
+        temp = self.path.with_name(f"{self.path.name}.tmp")
+        temp.unlink(missing_ok=True)
+        try:
+            with self._append_handle(temp) as file:
+                self._write_all(file, b"".join(records))
+                os.fsync(file.fileno())
+            if self._file is not None:
+                self._file.close()
+            try:
+                os.replace(temp, self.path)
+                self._records = len(values)
+            finally:
+                # The new file, or the old one if it could not be replaced
+                self._file = self._append_handle(self.path)
+        except OSError:
+            temp.unlink(missing_ok=True)
+            raise
+
+    def _append(self, op: int, key: str = "", value: str = "") -> None:
+        if self._file is None:
+            raise ValueError(f"{self.path} is closed.")
+        record = self._seal(self._records, op, key, value)
+        fd = self._file.fileno()
+        size = os.fstat(fd).st_size
+        try:
+            self._write_all(self._file, record)
+            if self.sync:
+                os.fsync(fd)
+        except OSError:
+            # Drop what was written of the record, so later ones stay readable
+            with contextlib.suppress(OSError):
+                os.ftruncate(fd, size)
+            raise
+        self._records += 1
+
+    def _maybe_compact(self) -> None:
+        if (
+            self._records >= self.compact_min_records
+            and self._records > self.compact_ratio * max(len(self._data), 1)
+        ):
+            # The change is already stored; compaction is tried again next time
+            with contextlib.suppress(OSError):
+                self.compact()
+
+    def compact(self) -> None:
+        """
+        Rewrites the file with one record per key, dropping overwritten and
+        removed values.
+        """
+        self._rewrite(self._data)
+
+    def close(self) -> None:
+        """
+        Closes the file. The backend cannot be used afterwards.
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    # Write failures (disk full, permissions) are reported like the client
+    # reports them, and leave the values in memory unchanged
+
+    def _run(self, method: str, args: dict[str, Any]) -> Any:
+        if method == "clear":
+            try:
+                self._clear()
+            except OSError:
+                return False
+            return True
+        return super()._run(method, args)
+
+    def _set(self, key: Any, value: Any) -> bool:
+        try:
+            return super()._set(key, value)
+        except OSError:
+            return False
+
+    def _remove(self, key: Any) -> bool:
+        try:
+            return super()._remove(key)
+        except OSError:
+            return False
+
+    def _commit(self, writes: Any, removes: Any) -> dict[str, bool]:
+        try:
+            return super()._commit(writes, removes)
+        except OSError:
+            return {"committed": False, "applied": False}
+
+    def _clear_prefix(self, prefix: Optional[str]) -> int:
+        removed = 0
+        for key in list(self._items(prefix)) if prefix else []:
+            try:
+                self._delete(key)
+            except OSError:
+                # Reports the keys deleted before the error
+                break
+            removed += 1
+        return removed
+
+    # MemoryBackend hooks: the record is written before the value changes in memory
+
+    def _write(self, key: str, value: str) -> None:
+        self._append(_SET, key, value)
+        super()._write(key, value)
+        self._maybe_compact()
+
+    def _delete(self, key: str) -> None:
+        self._append(_REMOVE, key)
+        super()._delete(key)
+        self._maybe_compact()
+
+    def _clear(self) -> None:
+        self._append(_CLEAR)
+        super()._clear()
+        self._maybe_compact()
+
+    def _apply(self, writes: dict[str, str], removes: list[str]) -> None:
+        # One record holds the whole transaction, so a crash keeps all or none of it
+        batch = json.dumps(
+            {"writes": writes, "removes": removes}, separators=(",", ":")
+        )
+        self._append(_BATCH, "", batch)
+        super()._apply(writes, removes)
+        self._maybe_compact()
+
+    async def invoke(
+        self,
+        method: str,
+        args: Optional[dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        # Changes run one at a time in a worker thread; reads wait for them so
+        # the values are never read while a thread updates them
+        async with self._lock:
+            if method in _READS:
+                return self._run(method, args or {})
+            return await asyncio.to_thread(self._run, method, args or {})
@@ -0,0 +1,127 @@
+from typing import Any, Optional
+
+__all__ = ["MemoryBackend"]
+
+
+class MemoryBackend:
+    """
+    Runs the storage methods in Python on a dictionary, for headless jobs and
+    tests that have no Flet client. Values are lost when the process exits.
+
+    Results match the Dart `SecureStorageService`: failures are reported as
+    False or None rather than raised.
+    """
+
+    def __init__(self) -> None:
+        self._data: dict[str, str] = {}
+
+    # Subclasses persist changes by overriding these four methods
+    def _write(self, key: str, value: str) -> None:
+        self._data[key] = value
+
+    def _delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    def _clear(self) -> None:
+        self._data.clear()
+
+    def _apply(self, writes: dict[str, str], removes: list[str]) -> None:
+        # Applies a transaction; subclasses must keep it all-or-nothing
+        for key, value in writes.items():
+            self._data[key] = value
+        for key in removes:
+            self._data.pop(key, None)
+
+    def _items(self, prefix: Optional[str]) -> dict[str, str]:
+        if not prefix:
+            return dict(self._data)
+        return {
+            key: value for key, value in self._data.items() if key.startswith(prefix)
+        }
+
+    def _set(self, key: Any, value: Any) -> bool:
+        if not isinstance(key, str) or not isinstance(value, str):
+            return False
+        self._write(key, value)
+        return True
+
+    def _remove(self, key: Any) -> bool:
+        if not isinstance(key, str):
+            return False
+        if key in self._data:
+            self._delete(key)
+        return True
+
+    def _scan(self, args: dict[str, Any]) -> dict[str, Any]:
+        items = self._items(args.get("prefix"))
+        start_after = args.get("start_after")
+        limit = args.get("limit") or 100
+        keys = sorted(key for key in items if start_after is None or key > start_after)
+        page = keys[:limit]
+        return {
+            "keys": page,
+            "items": {key: items[key] for key in page} if args.get("values") else {},
+            "cursor": page[-1] if len(keys) > limit else None,
+        }
+
+    def _commit(self, writes: Any, removes: Any) -> dict[str, bool]:
+        if not isinstance(writes, dict) or not isinstance(removes, list):
+            return {"committed": False, "applied": False}
+        if not all(
+            isinstance(key, str) and isinstance(value, str)
+            for key, value in writes.items()
+        ) or not all(isinstance(key, str) for key in removes):
+            return {"committed": False, "applied": False}
+        self._apply(writes, removes)
+        return {"committed": True, "applied": True}
+
+    def _clear_prefix(self, prefix: Optional[str]) -> int:
+        if not prefix:
+            return 0
+        keys = list(self._items(prefix))
+        for key in keys:
+            self._delete(key)
+        return len(keys)
+
+    async def invoke(
+        self,
+        method: str,
+        args: Optional[dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        return self._run(method, args or {})
+
+    def _run(self, method: str, args: dict[str, Any]) -> Any:
+        if method == "set":
+            return self._set(args.get("key"), args.get("value"))
+        if method == "get":
+            return self._data.get(args.get("key"))  # type: ignore[arg-type]
+        if method == "contains_key":
+            return args.get("key") in self._data
+        if method == "remove":
+            return self._remove(args.get("key"))
+        if method in ("get_keys", "items"):
+            return self._items(args.get("prefix"))
+        if method == "list_keys":
+            return list(self._items(args.get("prefix")))
+        if method == "count":
+            return len(self._items(args.get("prefix")))
+        if method == "scan":
+            return self._scan(args)
+        if method == "clear":
+            self._clear()
+            return True
+        if method == "clear_prefix":
+            return self._clear_prefix(args.get("prefix"))
+        if method == "set_many":
+            values = args.get("values") or {}
+            return {key: self._set(key, value) for key, value in values.items()}
+        if method == "get_many":
+            return {key: self._data.get(key) for key in args.get("keys") or []}
+        if method == "contains_many":
+            return {key: key in self._data for key in args.get("keys") or []}
+        if method == "remove_many":
+            return {key: self._remove(key) for key in args.get("keys") or []}
+        if method == "commit":
+            return self._commit(args.get("writes") or {}, args.get("removes") or [])
+        raise ValueError(f"Unknown SecureStorage method: {method}")
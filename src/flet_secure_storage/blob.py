@@ -0,0 +1,101 @@
+import json
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
+from dataclasses import asdict, dataclass
+from typing import Optional, Union
+
+__all__ = ["BlobManifest", "BlobData", "chunk_key", "rechunk"]
+
+BlobData = Union[bytes, bytearray, memoryview, Iterable[bytes], AsyncIterable[bytes]]
+
+# Marks the JSON stored under a blob key, so plain values are not read as blobs.
+_FORMAT = "fss-blob"
+_VERSION = 1
+
+
+@dataclass
+class BlobManifest:
+    """
+    Describes a blob stored across numbered chunk keys.
+
+    Attributes:
+        blob_id: Random id of this write. Chunk keys include it, so a blob being
+            written never overwrites the chunks of the blob it replaces.
+        size: The total size of the blob in bytes.
+        chunks: The number of chunk keys.
+        sha256: The hex digest of the blob, checked once it is read back.
+    """
+
+    blob_id: str
+    size: int
+    chunks: int
+    sha256: str
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {"format": _FORMAT, "version": _VERSION, **asdict(self)},
+            separators=(",", ":"),
+        )
+
+    @classmethod
+    def from_json(cls, raw: Optional[str]) -> Optional["BlobManifest"]:
+        """
+        Returns the manifest stored in `raw`, or None if `raw` is not a blob manifest.
+        """
+        if raw is None:
+            return None
+        try:
+            data = json.loads(raw)
+        except ValueError:
+            return None
+        if not isinstance(data, dict) or data.get("format") != _FORMAT:
+            return None
+        if data.get("version") != _VERSION:
+            raise ValueError(f"Unsupported blob version: {data.get('version')!r}.")
+        return cls(
+            blob_id=str(data["blob_id"]),
+            size=int(data["size"]),
+            chunks=int(data["chunks"]),
+            sha256=str(data["sha256"]),
+        )
+
+    def chunk_keys(self, key: str) -> list[str]:
+        return [chunk_key(key, self.blob_id, index) for index in range(self.chunks)]
+
+
+def chunk_key(key: str, blob_id: str, index: int) -> str:
+    """
+    Returns the key of chunk `index` of the blob stored under `key`.
+    """
+    return f"{key}~{blob_id}~{index}"
+
+
+async def rechunk(data: BlobData, chunk_size: int) -> AsyncIterator[bytes]:
+    """
+    Yields `data` in pieces of `chunk_size` bytes. Only the last piece may be shorter.
+    """
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        view = memoryview(data)
+        for start in range(0, len(view), chunk_size):
+            end = start + chunk_size
+            yield bytes(view[start:end])
+        return
+
+    buffer = bytearray()
+    if isinstance(data, AsyncIterable):
+        async for piece in data:
+            buffer += piece
+            while len(buffer) >= chunk_size:
+                yield bytes(buffer[:chunk_size])
+                del buffer[:chunk_size]
+    elif isinstance(data, Iterable):
+        for piece in data:
+            buffer += piece
+            while len(buffer) >= chunk_size:
+                yield bytes(buffer[:chunk_size])
+                del buffer[:chunk_size]
+    else:
+        raise TypeError(
+            f"data must be bytes or an iterable of bytes. Got {type(data)} instead."
+        )
+    if buffer:
+        yield bytes(buffer)
@@ -0,0 +1,430 @@
+import time
+import weakref
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional
+
+__all__ = ["CacheOptions", "CacheStats", "CacheState", "CacheManager", "ValueCache"]
+
+# Budget of the manager shared by caches that are not given one
+_DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+@dataclass
+class CacheOptions:
+    """
+    Configures the opt-in read-through value cache of `SecureStorage`.
+
+    Attributes:
+        max_entries: The maximum number of keys kept in the cache. The least
+            recently used entry is evicted first.
+
+        max_bytes: The maximum number of bytes (UTF-8 encoded keys and values)
+            kept in the cache. The least recently used entries are evicted first.
+
+        ttl: The number of seconds an entry is served without asking the client.
+
+        stale_ttl: The number of seconds after `ttl` expires during which the old
+            value is still returned while it is refreshed in the background.
+            Defaults to `0`, which disables stale-while-revalidate.
+
+        manager: The `CacheManager` that keeps the caches of many instances
+            within one byte budget. Defaults to `CacheManager.default()`,
+            shared by the whole process. Each cache still keeps its own limits.
+    """
+
+    max_entries: int = 256
+    max_bytes: int = 1024 * 1024
+    ttl: float = 30.0
+    stale_ttl: float = 0.0
+    manager: Optional["CacheManager"] = None
+
+    def __post_init__(self) -> None:
+        if self.max_entries < 1:
+            raise ValueError("max_entries must be at least 1.")
+        if self.max_bytes < 1:
+            raise ValueError("max_bytes must be at least 1.")
+        if self.ttl < 0 or self.stale_ttl < 0:
+            raise ValueError("ttl and stale_ttl cannot be negative.")
+        if self.manager is None:
+            self.manager = CacheManager.default()
+        elif not isinstance(self.manager, CacheManager):
+            raise TypeError("manager must be a CacheManager instance or None.")
+
+
+@dataclass
+class CacheStats:
+    """
+    Counters describing how well the value cache is sized.
+
+    Attributes:
+        hits: Lookups answered from a fresh entry.
+        stale_hits: Lookups answered from a stale entry while it was refreshed.
+        misses: Lookups that had to go to the client.
+        evictions: Entries dropped to stay within `max_entries` or `max_bytes`.
+        entries: The number of entries currently cached.
+        bytes: The number of bytes currently cached.
+    """
+
+    hits: int = 0
+    stale_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+    bytes: int = 0
+
+
+class CacheState(Enum):
+    """
+    The result of a cache lookup.
+    """
+
+    FRESH = "fresh"
+    STALE = "stale"
+    MISS = "miss"
+
+
+@dataclass
+class _CacheEntry:
+    exists: bool
+    value: Optional[str]
+    has_value: bool
+    size: int
+    stored_at: float
+
+
+class CacheManager:
+    """
+    Keeps the value caches of many `SecureStorage` instances, such as one per
+    session of a Flet web app, within one byte budget for the whole process.
+
+    When the cached bytes of all caches exceed `max_bytes`, the least recently
+    used entries are evicted, whichever cache they belong to. A cache releases
+    its entries when its `SecureStorage` is removed from the page or garbage
+    collected. Caches use `CacheManager.default()` unless given another one.
+
+    Only the value caches are counted. The objects reused by the typed
+    accessors stay within the entry and byte limits of their instance's
+    cache, the memo of hashed keys holds at most 4096 keys, and the key index
+    (`index_keys=True`) holds every key of its prefix by design.
+
+    Example:
+        ```python
+        CACHE = CacheOptions(manager=CacheManager(max_bytes=64 * 1024 * 1024))
+
+        async def main(page: ft.Page):
+            page.services.append(SecureStorage(cache=CACHE))
+        ```
+    """
+
+    _default: Optional["CacheManager"] = None
+
+    def __init__(self, max_bytes: int):
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be at least 1.")
+        self.max_bytes = max_bytes
+        # Every cached entry of every cache, least recently used first
+        self._entries: OrderedDict[tuple[int, str], int] = OrderedDict()
+        self._caches: dict[int, weakref.ref[ValueCache]] = {}
+        # The keys of each cache, so releasing one does not scan every entry
+        self._keys: dict[int, set[str]] = {}
+        self._bytes = 0
+
+    @classmethod
+    def default(cls) -> "CacheManager":
+        """
+        Returns the manager shared by every cache that is not given one, with
+        a budget of 64 MiB for the whole process.
+        """
+        if CacheManager._default is None:
+            CacheManager._default = cls(max_bytes=_DEFAULT_MAX_BYTES)
+        return CacheManager._default
+
+    @property
+    def bytes(self) -> int:
+        """
+        The number of bytes cached by all caches.
+        """
+        return self._bytes
+
+    def usage(self) -> dict[str, CacheStats]:
+        """
+        Returns the counters of every registered cache, keyed by its `name`:
+        the session id and control id of its `SecureStorage` once mounted.
+        """
+        usage = {}
+        for ref in list(self._caches.values()):
+            cache = ref()
+            if cache is not None:
+                usage[cache.name] = cache.stats
+        return usage
+
+    def register(self, cache: "ValueCache") -> None:
+        """
+        Adds a cache to the budget. Caches created with a `CacheOptions` that
+        has this manager are registered automatically.
+        """
+        cache_id = id(cache)
+        if cache_id in self._caches:
+            return
+        self._caches[cache_id] = weakref.ref(cache, lambda _: self._release(cache_id))
+        self._keys[cache_id] = set()
+        for key, entry in cache._entries.items():
+            self._added(cache, key, entry.size)
+
+    def unregister(self, cache: "ValueCache") -> None:
+        """
+        Removes a cache from the budget and drops its entries.
+        """
+        cache.clear()
+        self._release(id(cache))
+
+    def _release(self, cache_id: int) -> None:
+        if self._caches.pop(cache_id, None) is None:
+            return
+        for key in self._keys.pop(cache_id):
+            self._bytes -= self._entries.pop((cache_id, key))
+
+    def _added(self, cache: "ValueCache", key: str, size: int) -> None:
+        if id(cache) not in self._caches:
+            return
+        self._entries[(id(cache), key)] = size
+        self._keys[id(cache)].add(key)
+        self._bytes += size
+        while self._bytes > self.max_bytes and self._entries:
+            (cache_id, oldest), oldest_size = self._entries.popitem(last=False)
+            self._keys[cache_id].discard(oldest)
+            self._bytes -= oldest_size
+            owner = self._caches[cache_id]()
+            if owner is not None:
+                owner._evict(oldest)
+
+    def _removed(self, cache: "ValueCache", key: str) -> None:
+        size = self._entries.pop((id(cache), key), None)
+        if size is not None:
+            self._keys[id(cache)].discard(key)
+            self._bytes -= size
+
+    def _used(self, cache: "ValueCache", key: str) -> None:
+        entry = (id(cache), key)
+        if entry in self._entries:
+            self._entries.move_to_end(entry)
+
+
+class ValueCache:
+    """
+    LRU cache of client values keyed by the prefixed storage key.
+
+    Entries remember either a value (which may be None for a missing key) or
+    only whether the key exists, as returned by `contains_key`.
+
+    Writes racing a fetch are handled with tokens: `begin()` is taken before a
+    fetch is sent, and `store()` drops the result if the key was invalidated
+    after the token was taken.
+    """
+
+    def __init__(
+        self,
+        options: CacheOptions,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.options = options
+        self._clock = clock
+        self._entries: OrderedDict[str, _CacheEntry] = OrderedDict()
+        self._stats = CacheStats()
+        self._epoch = 0
+        self._clear_epoch = 0
+        self._key_epochs: dict[str, int] = {}
+        # Shown in CacheManager.usage(); SecureStorage names it after its session
+        self.name = f"cache-{id(self):x}"
+        self._manager = options.manager
+        if self._manager is not None:
+            self._manager.register(self)
+
+    @property
+    def stats(self) -> CacheStats:
+        """
+        A copy of the current counters.
+        """
+        return CacheStats(
+            hits=self._stats.hits,
+            stale_hits=self._stats.stale_hits,
+            misses=self._stats.misses,
+            evictions=self._stats.evictions,
+            entries=len(self._entries),
+            bytes=self._stats.bytes,
+        )
+
+    def _state(self, entry: _CacheEntry) -> CacheState:
+        age = self._clock() - entry.stored_at
+        if age < self.options.ttl:
+            return CacheState.FRESH
+        if age < self.options.ttl + self.options.stale_ttl:
+            return CacheState.STALE
+        return CacheState.MISS
+
+    def _lookup(
+        self, key: str, need_value: bool
+    ) -> tuple[CacheState, Optional[_CacheEntry]]:
+        entry = self._entries.get(key)
+        if entry is None or (need_value and entry.exists and not entry.has_value):
+            self._stats.misses += 1
+            return CacheState.MISS, None
+
+        state = self._state(entry)
+        if state is CacheState.MISS:
+            self._discard(key)
+            self._stats.misses += 1
+        else:
+            self._entries.move_to_end(key)
+            if self._manager is not None:
+                self._manager._used(self, key)
+            if state is CacheState.FRESH:
+                self._stats.hits += 1
+            else:
+                self._stats.stale_hits += 1
+        return state, entry
+
+    def lookup(self, key: str) -> tuple[CacheState, Optional[str]]:
+        """
+        Looks up the value for `key`.
+
+        Returns:
+            tuple[CacheState, Optional[str]]: The state of the entry and the cached
+                value. The value is only meaningful when the state is not MISS.
+        """
+        state, entry = self._lookup(key, need_value=True)
+        if state is CacheState.MISS or entry is None:
+            return CacheState.MISS, None
+        return state, entry.value
+
+    def lookup_exists(self, key: str) -> tuple[CacheState, bool]:
+        """
+        Looks up whether `key` exists.
+
+        Returns:
+            tuple[CacheState, bool]: The state of the entry and whether the key
+                exists. The flag is only meaningful when the state is not MISS.
+        """
+        state, entry = self._lookup(key, need_value=False)
+        if state is CacheState.MISS or entry is None:
+            return CacheState.MISS, False
+        return state, entry.exists
+
+    def begin(self) -> int:
+        """
+        Returns a token to pass to `store()` once a fetch completes.
+        """
+        return self._epoch
+
+    def _is_outdated(self, key: str, token: int) -> bool:
+        return self._clear_epoch > token or self._key_epochs.get(key, -1) > token
+
+    def store(self, key: str, value: Optional[str], token: int) -> None:
+        """
+        Stores a value fetched from the client, unless `key` was invalidated
+        after `token` was taken.
+        """
+        if self._is_outdated(key, token):
+            return
+        self._put(key, value is not None, value, has_value=True)
+
+    def store_exists(self, key: str, exists: bool, token: int) -> None:
+        """
+        Stores whether `key` exists, unless `key` was invalidated after `token`
+        was taken. A known value for the key is kept.
+        """
+        if self._is_outdated(key, token):
+            return
+        entry = self._entries.get(key)
+        if entry is not None and entry.has_value and entry.exists == exists:
+            entry.stored_at = self._clock()
+            return
+        self._put(key, exists, None, has_value=not exists)
+
+    def _put(
+        self, key: str, exists: bool, value: Optional[str], has_value: bool
+    ) -> None:
+        size = len(key.encode()) + (len(value.encode()) if value is not None else 0)
+        self._discard(key)
+        if size > self.options.max_bytes:
+            return
+        self._entries[key] = _CacheEntry(
+            exists=exists,
+            value=value,
+            has_value=has_value,
+            size=size,
+            stored_at=self._clock(),
+        )
+        self._stats.bytes += size
+        while (
+            len(self._entries) > self.options.max_entries
+            or self._stats.bytes > self.options.max_bytes
+        ):
+            oldest = next(iter(self._entries))
+            self._discard(oldest)
+            self._stats.evictions += 1
+        if self._manager is not None:
+            self._manager._added(self, key, size)
+
+    def _discard(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._stats.bytes -= entry.size
+            if self._manager is not None:
+                self._manager._removed(self, key)
+
+    def _evict(self, key: str) -> None:
+        """
+        Drops an entry evicted by the `CacheManager` to stay within its budget.
+        """
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._stats.bytes -= entry.size
+            self._stats.evictions += 1
+
+    def invalidate(self, key: str) -> None:
+        """
+        Drops `key` and prevents fetches already in flight from caching it.
+        """
+        self._epoch += 1
+        self._discard(key)
+        if len(self._key_epochs) >= self.options.max_entries * 4:
+            # Forget per-key epochs; in-flight fetches of any key are then dropped.
+            self._key_epochs.clear()
+            self._clear_epoch = self._epoch
+        else:
+            self._key_epochs[key] = self._epoch
+
+    def clear(self, prefix: str = "") -> None:
+        """
+        Drops every entry, or every entry whose key starts with `prefix`, and
+        prevents fetches already in flight from caching.
+        """
+        self._epoch += 1
+        self._clear_epoch = self._epoch
+        self._key_epochs.clear()
+        if prefix or self._manager is not None:
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                self._discard(key)
+            return
+        self._entries.clear()
+        self._stats.bytes = 0
+
+    def close(self) -> None:
+        """
+        Drops every entry and leaves the `CacheManager`, if any.
+        """
+        if self._manager is not None:
+            self._manager.unregister(self)
+        else:
+            self.clear()
+
+    def reopen(self) -> None:
+        """
+        Joins the `CacheManager` again after `close()`.
+        """
+        if self._manager is not None:
+            self._manager.register(self)
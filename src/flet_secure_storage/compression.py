@@ -0,0 +1,100 @@
+import base64
+import zlib
+from dataclasses import dataclass
+from typing import Any, Optional
+
+__all__ = ["CompressionOptions", "encode_value", "decode_value"]
+
+# Stored values that start with this header carry a format tag after it.
+# Values written before compression was enabled have no header and are
+# returned unchanged.
+HEADER = "fss1:"
+_ZLIB = "z:"
+_LZMA = "x:"
+_PLAIN = "p:"
+
+
+@dataclass
+class CompressionOptions:
+    """
+    Configures the opt-in compression of large string values in `SecureStorage`.
+
+    Values are compressed with a stdlib codec, base64 encoded and stored with a
+    small header, so compressed and plain values can be read side by side.
+
+    Attributes:
+        threshold: The size in bytes (UTF-8) from which values are compressed.
+            Smaller values are stored unchanged.
+
+        algorithm: `zlib` (default) or `lzma`.
+
+        level: The compression level passed to the codec.
+    """
+
+    threshold: int = 4096
+    algorithm: str = "zlib"
+    level: int = 6
+
+    def __post_init__(self) -> None:
+        if self.threshold < 0:
+            raise ValueError("threshold cannot be negative.")
+        if self.algorithm not in ("zlib", "lzma"):
+            raise ValueError(
+                f"Invalid algorithm: {self.algorithm!r}. Expected 'zlib' or 'lzma'."
+            )
+
+
+def _compress(data: bytes, options: CompressionOptions) -> tuple[str, bytes]:
+    if options.algorithm == "lzma":
+        import lzma
+
+        return _LZMA, lzma.compress(data, preset=options.level)
+    return _ZLIB, zlib.compress(data, options.level)
+
+
+def encode_value(value: Any, options: Optional[CompressionOptions]) -> Any:
+    """
+    Returns the value to send to the client for `value`.
+
+    Strings at or above the threshold are compressed when that makes them
+    smaller. Plain strings that happen to start with the header are tagged so
+    they read back unchanged. Other values are returned as they are.
+    """
+    if not isinstance(value, str):
+        return value
+    if options is not None:
+        data = value.encode()
+        if len(data) >= options.threshold:
+            tag, compressed = _compress(data, options)
+            encoded = f"{HEADER}{tag}{base64.b64encode(compressed).decode('ascii')}"
+            if len(encoded) < len(value):
+                return encoded
+    if value.startswith(HEADER):
+        return f"{HEADER}{_PLAIN}{value}"
+    return value
+
+
+def decode_value(raw: Optional[str]) -> Optional[str]:
+    """
+    Returns the original string for a value read from the client.
+    Values without a known header are returned unchanged.
+    """
+    if not isinstance(raw, str) or not raw.startswith(HEADER):
+        return raw
+    body = raw.removeprefix(HEADER)
+    tag, payload = body[:2], body[2:]
+    if tag == _PLAIN:
+        return payload
+    if tag == _ZLIB:
+        try:
+            return zlib.decompress(base64.b64decode(payload)).decode()
+        except (ValueError, zlib.error):
+            return raw
+    if tag == _LZMA:
+        import lzma
+
+        try:
+            return lzma.decompress(base64.b64decode(payload)).decode()
+        except (ValueError, lzma.LZMAError):
+            return raw
+    return raw
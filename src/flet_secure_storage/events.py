@@ -0,0 +1,25 @@
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+import flet as ft
+
+if TYPE_CHECKING:
+    from .secure_storage import SecureStorage  # noqa: F401
+
+__all__ = ["SecureStorageChangeEvent"]
+
+
+@dataclass
+class SecureStorageChangeEvent(ft.Event["SecureStorage"]):
+    """
+    Sent by the client after keys were written, removed or cleared, by this
+    instance or any other part of the app.
+
+    Attributes:
+        kind: `"set"` when the keys were written, `"remove"` when they were
+            deleted, or `"clear"` when every key was deleted (`keys` is empty).
+        keys: The changed keys as stored on the client, with their prefix.
+    """
+
+    kind: str
+    keys: list[str] = field(default_factory=list)
@@ -0,0 +1,314 @@
+import base64
+import hashlib
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from .backends import StorageBackend
+
+__all__ = ["HashedKeyOptions", "HashedKeyBackend"]
+
+# A hashed key is the instance prefix, this mark and the base64url digest of
+# the rest of the key
+MARK = "#"
+# Values of hashed keys start with this header, the length of the logical key
+# (0 without a reverse mapping), a colon and the logical key
+HEADER = "fssk:"
+# Hashes kept to skip hashing again and to name the keys of change events
+_MEMO_SIZE = 4096
+
+
+@dataclass
+class HashedKeyOptions:
+    """
+    Configures the opt-in hashing of keys in `SecureStorage`.
+
+    Each key is stored on the client as the instance `prefix` followed by a
+    short, stable hash of the rest of the key, so long keys such as URLs do
+    not make every lookup and listing on the platform slower.
+
+    Attributes:
+        digest_size: The size of the hash in bytes. Keys are stored with
+            4/3 as many characters (16 for the default of 12 bytes).
+
+        reverse_mapping: Store each logical key next to its value, so
+            listings such as `get_keys`, `items` and `scan` return the keys
+            that were set and can filter them by prefix. Without it,
+            listings return the hashed keys.
+
+        read_plain_keys: Also look up the unhashed key when reading, checking
+            or removing a key, so values stored before hashing was enabled
+            stay readable. Each single-key call is then sent as a two-key call.
+    """
+
+    digest_size: int = 12
+    reverse_mapping: bool = True
+    read_plain_keys: bool = True
+
+    def __post_init__(self) -> None:
+        if not 8 <= self.digest_size <= 32:
+            raise ValueError("digest_size must be between 8 and 32 bytes.")
+
+
+class HashedKeyBackend:
+    """
+    Runs the storage methods of another backend with hashed keys.
+
+    `SecureStorage` wraps its backend in this class when `hashed_keys` is
+    set, so the rest of the instance keeps working with the logical keys.
+    Listings read the values of every key below the instance prefix to
+    recover the logical keys, and are filtered and paged in Python.
+    """
+
+    def __init__(self, backend: StorageBackend, options: HashedKeyOptions, prefix: str):
+        self.backend = backend
+        self.options = options
+        # The instance prefix and separator, which stay readable on the client
+        self._prefix = prefix
+        self._hashed: dict[str, str] = {}
+        self._logical: dict[str, str] = {}
+
+    def hash_key(self, key: str) -> str:
+        """
+        Returns the key stored on the client for a prefixed logical key.
+        """
+        hashed = self._hashed.get(key)
+        if hashed is not None:
+            return hashed
+        if not key.startswith(self._prefix):
+            return key
+        digest = hashlib.blake2b(
+            key.removeprefix(self._prefix).encode(),
+            digest_size=self.options.digest_size,
+            person=b"fss-key",
+        ).digest()
+        hashed = (
+            f"{self._prefix}{MARK}"
+            f"{base64.urlsafe_b64encode(digest).rstrip(b'=').decode()}"
+        )
+        self._remember(key, hashed)
+        return hashed
+
+    def logical_key(self, stored: str) -> Optional[str]:
+        """
+        Returns the logical key of a key stored on the client, or None for a
+        hashed key this instance has not seen.
+        """
+        if not stored.startswith(f"{self._prefix}{MARK}"):
+            return stored
+        return self._logical.get(stored)
+
+    def _remember(self, key: str, hashed: str) -> None:
+        if len(self._hashed) >= _MEMO_SIZE:
+            self._hashed.clear()
+            self._logical.clear()
+        self._hashed[key] = hashed
+        self._logical[hashed] = key
+
+    def _wrap(self, key: str, value: Any) -> Any:
+        if not isinstance(value, str):
+            return value
+        name = key.removeprefix(self._prefix) if self.options.reverse_mapping else ""
+        return f"{HEADER}{len(name)}:{name}{value}"
+
+    def _unwrap(self, stored: str, value: Any) -> Optional[tuple[str, Any]]:
+        """
+        Returns the logical key and value of a hashed key read from the
+        client, or None if it is not a hashed key.
+        """
+        if (
+            not isinstance(value, str)
+            or not value.startswith(HEADER)
+            or not stored.startswith(f"{self._prefix}{MARK}")
+        ):
+            return None
+        size, separator, rest = value.removeprefix(HEADER).partition(":")
+        if not separator or not size.isdigit() or int(size) > len(rest):
+            return None
+        length = int(size)
+        if length == 0:
+            return stored, rest
+        key = f"{self._prefix}{rest[:length]}"
+        self._remember(key, stored)
+        return key, rest[length:]
+
+    def _value(self, stored: str, value: Any) -> Any:
+        unwrapped = self._unwrap(stored, value)
+        return value if unwrapped is None else unwrapped[1]
+
+    async def _listing(
+        self, prefix: str, timeout: Optional[float]
+    ) -> dict[str, tuple[list[str], str]]:
+        """
+        Returns the logical keys starting with `prefix`, each with the keys
+        it is stored under on the client and its value.
+        """
+        # Hashed keys only keep the instance prefix, so narrower prefixes are
+        # filtered here once the logical keys are known
+        root = self._prefix if prefix.startswith(self._prefix) else prefix
+        stored = await self.backend.invoke("items", {"prefix": root}, timeout) or {}
+        plain: dict[str, tuple[list[str], str]] = {}
+        hashed: dict[str, tuple[list[str], str]] = {}
+        for key, value in stored.items():
+            unwrapped = self._unwrap(key, value)
+            if unwrapped is None:
+                if key.startswith(prefix):
+                    plain[key] = ([key], value)
+            elif unwrapped[0].startswith(prefix):
+                hashed[unwrapped[0]] = ([key], unwrapped[1])
+        for key, (keys, value) in hashed.items():
+            # A hashed key replaces the plain key it was written over
+            if key in plain:
+                keys.extend(plain.pop(key)[0])
+        return {**plain, **hashed}
+
+    async def _scan(
+        self, args: dict[str, Any], timeout: Optional[float]
+    ) -> dict[str, Any]:
+        listing = await self._listing(args.get("prefix") or "", timeout)
+        start_after = args.get("start_after")
+        limit = args.get("limit") or 100
+        keys = sorted(
+            key for key in listing if start_after is None or key > start_after
+        )
+        page = keys[:limit]
+        return {
+            "keys": page,
+            "items": (
+                {key: listing[key][1] for key in page} if args.get("values") else {}
+            ),
+            "cursor": page[-1] if len(keys) > limit else None,
+        }
+
+    async def _clear_prefix(self, prefix: str, timeout: Optional[float]) -> int:
+        if self._prefix.startswith(prefix):
+            # Every hashed key of this instance is below the prefix
+            return int(
+                await self.backend.invoke("clear_prefix", {"prefix": prefix}, timeout)
+            )
+        listing = await self._listing(prefix, timeout)
+        keys = [key for stored, _ in listing.values() for key in stored]
+        if keys:
+            await self.backend.invoke("remove_many", {"keys": keys}, timeout)
+        return len(listing)
+
+    async def _read_many(
+        self, method: str, keys: list[str], timeout: Optional[float]
+    ) -> dict[str, Any]:
+        """
+        Runs `get_many` or `contains_many` on the hashed keys, and on the plain
+        keys when `read_plain_keys` is set. Hashed keys take precedence.
+        """
+        hashed = {key: self.hash_key(key) for key in keys}
+        response = (
+            await self.backend.invoke(
+                method, {"keys": self._with_plain_keys(hashed)}, timeout
+            )
+            or {}
+        )
+        result: dict[str, Any] = {}
+        for key, stored in hashed.items():
+            value = response.get(stored)
+            if method == "get_many":
+                value = self._value(stored, value)
+            if value in (None, False) and self.options.read_plain_keys:
+                value = response.get(key, value)
+            result[key] = value
+        return result
+
+    def _with_plain_keys(self, hashed: dict[str, str]) -> list[str]:
+        """
+        Returns the hashed keys, followed by the plain keys when
+        `read_plain_keys` is set.
+        """
+        keys = list(hashed.values())
+        if self.options.read_plain_keys:
+            keys.extend(key for key, stored in hashed.items() if key != stored)
+        return keys
+
+    async def _remove_many(
+        self, keys: list[str], timeout: Optional[float]
+    ) -> dict[str, bool]:
+        hashed = {key: self.hash_key(key) for key in keys}
+        response = (
+            await self.backend.invoke(
+                "remove_many", {"keys": self._with_plain_keys(hashed)}, timeout
+            )
+            or {}
+        )
+        return {
+            key: bool(response.get(stored)) and bool(response.get(key, True))
+            for key, stored in hashed.items()
+        }
+
+    async def invoke(
+        self,
+        method: str,
+        args: Optional[dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        args = args or {}
+        if method == "set":
+            key = args.get("key")
+            if not isinstance(key, str):
+                return await self.backend.invoke(method, args, timeout)
+            return await self.backend.invoke(
+                "set",
+                {
+                    "key": self.hash_key(key),
+                    "value": self._wrap(key, args.get("value")),
+                },
+                timeout,
+            )
+        if method in ("get", "contains_key", "remove"):
+            key = args.get("key")
+            if not isinstance(key, str):
+                return await self.backend.invoke(method, args, timeout)
+            if method == "remove":
+                return (await self._remove_many([key], timeout))[key]
+            many = "get_many" if method == "get" else "contains_many"
+            return (await self._read_many(many, [key], timeout))[key]
+        if method in ("get_many", "contains_many"):
+            return await self._read_many(method, list(args.get("keys") or []), timeout)
+        if method == "remove_many":
+            return await self._remove_many(list(args.get("keys") or []), timeout)
+        if method == "set_many":
+            values = args.get("values") or {}
+            hashed = {key: self.hash_key(key) for key in values}
+            response = await self.backend.invoke(
+                "set_many",
+                {
+                    "values": {
+                        hashed[key]: self._wrap(key, value)
+                        for key, value in values.items()
+                    }
+                },
+                timeout,
+            )
+            response = response or {}
+            return {key: response.get(stored, False) for key, stored in hashed.items()}
+        if method == "commit":
+            writes = args.get("writes") or {}
+            removes = {key: self.hash_key(key) for key in args.get("removes") or []}
+            return await self.backend.invoke(
+                "commit",
+                {
+                    "writes": {
+                        self.hash_key(key): self._wrap(key, value)
+                        for key, value in writes.items()
+                    },
+                    "removes": self._with_plain_keys(removes),
+                },
+                timeout,
+            )
+        if method in ("get_keys", "items"):
+            listing = await self._listing(args.get("prefix") or "", timeout)
+            return {key: value for key, (_, value) in listing.items()}
+        if method == "list_keys":
+            return list(await self._listing(args.get("prefix") or "", timeout))
+        if method == "count":
+            return len(await self._listing(args.get("prefix") or "", timeout))
+        if method == "scan":
+            return await self._scan(args, timeout)
+        if method == "clear_prefix":
+            return await self._clear_prefix(args.get("prefix") or "", timeout)
+        return await self.backend.invoke(method, args, timeout)
@@ -0,0 +1,151 @@
+from collections.abc import Iterable, Iterator
+from typing import Optional
+
+__all__ = ["KeyIndex"]
+
+
+class _Node:
+    __slots__ = ("children", "terminal", "count")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _Node] = {}
+        self.terminal = False
+        # Number of keys stored in this node and below it
+        self.count = 0
+
+
+class KeyIndex:
+    """
+    In-memory trie of storage keys, split into segments by a separator.
+
+    Prefix queries follow the same rules as `SecureStorage.get_keys`: a key
+    matches when it starts with the prefix, even if the prefix ends part way
+    through a segment.
+    """
+
+    def __init__(self, separator: str, keys: Iterable[str] = ()):
+        if not separator:
+            raise ValueError("separator cannot be empty.")
+        self.separator = separator
+        self._root = _Node()
+        for key in keys:
+            self.add(key)
+
+    def __len__(self) -> int:
+        return self._root.count
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self.contains(key)
+
+    def _find(self, segments: list[str]) -> Optional[_Node]:
+        node = self._root
+        for segment in segments:
+            child = node.children.get(segment)
+            if child is None:
+                return None
+            node = child
+        return node
+
+    def add(self, key: str) -> bool:
+        """
+        Adds a key.
+
+        Returns:
+            bool: True if the key was not in the index before.
+        """
+        if self.contains(key):
+            return False
+        node = self._root
+        node.count += 1
+        for segment in key.split(self.separator):
+            node = node.children.setdefault(segment, _Node())
+            node.count += 1
+        node.terminal = True
+        return True
+
+    def remove(self, key: str) -> bool:
+        """
+        Removes a key and prunes the branches left empty.
+
+        Returns:
+            bool: True if the key was in the index.
+        """
+        if not self.contains(key):
+            return False
+        path = [self._root]
+        for segment in key.split(self.separator):
+            path.append(path[-1].children[segment])
+        path[-1].terminal = False
+        for node in path:
+            node.count -= 1
+        for parent, segment in zip(
+            reversed(path[:-1]), reversed(key.split(self.separator))
+        ):
+            if parent.children[segment].count == 0:
+                del parent.children[segment]
+        return True
+
+    def contains(self, key: str) -> bool:
+        """
+        Returns whether the key is in the index.
+        """
+        node = self._find(key.split(self.separator))
+        return node is not None and node.terminal
+
+    def clear(self, prefix: str = "") -> None:
+        """
+        Removes every key, or every key that starts with `prefix`.
+        """
+        if prefix == "":
+            self._root = _Node()
+            return
+        for key in list(self.keys(prefix)):
+            self.remove(key)
+
+    def _matches(self, prefix: str) -> Iterator[tuple[str, _Node]]:
+        """
+        Yields the nodes whose subtrees hold the keys starting with `prefix`,
+        with the key of each node.
+        """
+        *parents, last = prefix.split(self.separator)
+        node = self._find(parents)
+        if node is None:
+            return
+        base = "".join(f"{segment}{self.separator}" for segment in parents)
+        for segment, child in node.children.items():
+            if segment.startswith(last):
+                yield f"{base}{segment}", child
+
+    def _walk(self, key: str, node: _Node) -> Iterator[str]:
+        if node.terminal:
+            yield key
+        for segment, child in node.children.items():
+            yield from self._walk(f"{key}{self.separator}{segment}", child)
+
+    def keys(self, prefix: str = "") -> Iterator[str]:
+        """
+        Yields every key that starts with `prefix`.
+        """
+        for key, node in self._matches(prefix):
+            yield from self._walk(key, node)
+
+    def count(self, prefix: str = "") -> int:
+        """
+        Returns the number of keys that start with `prefix`.
+        """
+        if prefix == "":
+            return self._root.count
+        return sum(node.count for _, node in self._matches(prefix))
+
+    def children(self, path: str = "") -> list[str]:
+        """
+        Returns the sorted segments directly below `path`, like a directory listing.
+
+        Args:
+            path (str): Whole segments joined by the separator, or an empty string
+                for the top level.
+        """
+        node = self._find(path.split(self.separator) if path else [])
+        if node is None:
+            return []
+        return sorted(node.children)
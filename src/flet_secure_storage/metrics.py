@@ -0,0 +1,202 @@
+import asyncio
+import json
+import math
+import warnings
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any, Optional
+
+__all__ = ["CallRecord", "LatencyHistogram", "StorageMetrics", "payload_size"]
+
+
+def _bucket_bounds() -> tuple[float, ...]:
+    # Upper bounds in seconds, 25% apart, from 50 microseconds to 2 minutes
+    bounds = []
+    bound = 0.00005
+    while bound < 120:
+        bounds.append(bound)
+        bound *= 1.25
+    return tuple(bounds)
+
+
+_BOUNDS = _bucket_bounds()
+
+
+def payload_size(payload: Any) -> int:
+    """
+    Returns the approximate size in bytes of a call's arguments or result,
+    measured as compact JSON.
+    """
+    if payload is None:
+        return 0
+    if isinstance(payload, str):
+        return len(payload.encode())
+    return len(json.dumps(payload, separators=(",", ":"), default=str).encode())
+
+
+@dataclass(frozen=True)
+class CallRecord:
+    """
+    One call from `SecureStorage` to the client, passed to metrics listeners.
+
+    Attributes:
+        method: The name of the client method.
+        duration: The time the call took, in seconds.
+        error: The exception raised by the call, or None if it succeeded.
+        request_bytes: The approximate size of the arguments.
+        response_bytes: The approximate size of the result.
+    """
+
+    method: str
+    duration: float
+    error: Optional[BaseException]
+    request_bytes: int
+    response_bytes: int
+
+
+class LatencyHistogram:
+    """
+    Counts durations in fixed buckets that grow by 25%, so percentiles are
+    accurate to within one bucket and recording takes constant memory.
+    """
+
+    def __init__(self) -> None:
+        self._counts = [0] * (len(_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        # Buckets grow geometrically, so the index is a logarithm
+        if seconds <= _BOUNDS[0]:
+            index = 0
+        else:
+            index = min(math.ceil(math.log(seconds / _BOUNDS[0], 1.25)), len(_BOUNDS))
+            if index < len(_BOUNDS) and seconds > _BOUNDS[index]:
+                index += 1
+        self._counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, q: float) -> float:
+        """
+        Returns the upper bound of the bucket holding the `q` quantile (0 to 1),
+        capped at the largest recorded duration.
+        """
+        if self.count == 0:
+            return 0.0
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for index, bucket in enumerate(self._counts):
+            seen += bucket
+            if seen >= rank:
+                bound = _BOUNDS[index] if index < len(_BOUNDS) else self.max
+                return min(bound, self.max)
+        return self.max
+
+
+class _MethodMetrics:
+    __slots__ = (
+        "count",
+        "errors",
+        "timeouts",
+        "cancelled",
+        "latency",
+        "request_bytes",
+        "response_bytes",
+    )
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.cancelled = 0
+        self.latency = LatencyHistogram()
+        self.request_bytes = 0
+        self.response_bytes = 0
+
+    def snapshot(self) -> dict[str, Any]:
+        latency = self.latency
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "cancelled": self.cancelled,
+            "latency_mean": latency.total / latency.count if latency.count else 0.0,
+            "latency_p50": latency.percentile(0.50),
+            "latency_p95": latency.percentile(0.95),
+            "latency_p99": latency.percentile(0.99),
+            "latency_max": latency.max,
+            "request_bytes": self.request_bytes,
+            "response_bytes": self.response_bytes,
+        }
+
+
+class StorageMetrics:
+    """
+    Per-method counters of the calls from `SecureStorage` to the client.
+
+    Enabled with `SecureStorage(metrics=True)` and available as
+    `SecureStorage.metrics`.
+    """
+
+    def __init__(self) -> None:
+        self._methods: dict[str, _MethodMetrics] = {}
+        self._listeners: list[Callable[[CallRecord], None]] = []
+
+    def record(self, call: CallRecord) -> None:
+        """
+        Adds a call to the counters and passes it to every listener.
+        """
+        method = self._methods.get(call.method)
+        if method is None:
+            method = self._methods[call.method] = _MethodMetrics()
+        method.count += 1
+        if isinstance(call.error, TimeoutError):
+            method.timeouts += 1
+        elif isinstance(call.error, asyncio.CancelledError):
+            method.cancelled += 1
+        elif call.error is not None:
+            method.errors += 1
+        method.latency.record(call.duration)
+        method.request_bytes += call.request_bytes
+        method.response_bytes += call.response_bytes
+
+        for listener in self._listeners:
+            try:
+                listener(call)
+            except Exception as exc:
+                warnings.warn(
+                    f"SecureStorage metrics listener {listener!r} failed: {exc!r}",
+                    RuntimeWarning,
+                    stacklevel=2,
+                )
+
+    def add_listener(self, listener: Callable[[CallRecord], None]) -> None:
+        """
+        Calls `listener` with a `CallRecord` after every call to the client.
+        """
+        if not callable(listener):
+            raise TypeError("listener must be callable.")
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[CallRecord], None]) -> None:
+        """
+        Stops calling a listener added with `add_listener`.
+        """
+        self._listeners.remove(listener)
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """
+        Returns the counters of each method: `count`, `errors`, `timeouts` and
+        `cancelled` calls (errors exclude the other two), latency mean, p50, p95,
+        p99 and max in seconds, and total request and response bytes.
+        """
+        return {name: method.snapshot() for name, method in self._methods.items()}
+
+    def reset(self) -> None:
+        """
+        Sets every counter back to zero. Listeners are kept.
+        """
+        self._methods.clear()
@@ -0,0 +1,186 @@
+from collections.abc import Iterable, Mapping
+from typing import TYPE_CHECKING, Any, Optional
+
+from ._helpers import add_prefix
+from .transaction import SecureStorageTransaction
+
+if TYPE_CHECKING:
+    from .secure_storage import SecureStorage
+
+__all__ = ["SecureStorageNamespace"]
+
+
+class SecureStorageNamespace:
+    """
+    A view of `SecureStorage` that scopes every key by a namespace prefix.
+    Methods take the same optional `timeout` as their `SecureStorage` counterpart.
+
+    Views are created with `SecureStorage.namespace()` and share the service,
+    its options, cache, write-behind buffer and key index. They are not added
+    to `page.services`. Keys are joined to the namespace with the parent's
+    `prefix_separator` (or `.` when it is empty), and the parent's `prefix`
+    is added on top.
+    """
+
+    def __init__(self, storage: "SecureStorage", name: str):
+        if not isinstance(name, str) or name.strip() == "":
+            raise ValueError("Namespace cannot be empty or whitespace.")
+        self._storage = storage
+        self.name = name
+        self.separator = storage._hierarchy_separator
+
+    def __repr__(self) -> str:
+        return f"SecureStorageNamespace({self.name!r})"
+
+    def _key(self, key: str) -> str:
+        if not isinstance(key, str):
+            raise ValueError(f"Key must be a string. Got {type(key)} instead.")
+        return add_prefix(self.name, self.separator, key)
+
+    def _keys(self, keys: Iterable[str]) -> dict[str, str]:
+        if isinstance(keys, str) or not isinstance(keys, Iterable):
+            raise ValueError(
+                f"Keys must be a collection of strings. Got {type(keys)} instead."
+            )
+        return {self._key(key): key for key in keys}
+
+    def _key_prefix(self, key_prefix: str) -> str:
+        if key_prefix is None or key_prefix.strip() == "":
+            return f"{self.name}{self.separator}"
+        return self._key(key_prefix)
+
+    def namespace(self, name: str) -> "SecureStorageNamespace":
+        """
+        Returns a view nested below this namespace.
+        """
+        return SecureStorageNamespace(self._storage, self._key(name))
+
+    def transaction(self, timeout: Optional[float] = None) -> SecureStorageTransaction:
+        """
+        Returns a transaction whose keys are scoped by the namespace.
+        See `SecureStorage.transaction`.
+        """
+        return SecureStorageTransaction(self._storage, timeout, self._key)
+
+    async def set(self, key: str, value: Any, timeout: Optional[float] = None) -> bool:
+        """
+        Sets a value in the namespace. See `SecureStorage.set`.
+        """
+        return await self._storage.set(self._key(key), value, timeout)
+
+    async def get(self, key: str, timeout: Optional[float] = None) -> Optional[str]:
+        """
+        Retrieves a value from the namespace. See `SecureStorage.get`.
+        """
+        return await self._storage.get(self._key(key), timeout)
+
+    async def contains_key(self, key: str, timeout: Optional[float] = None) -> bool:
+        """
+        Checks if a key exists in the namespace. See `SecureStorage.contains_key`.
+        """
+        return await self._storage.contains_key(self._key(key), timeout)
+
+    async def remove(self, key: str, timeout: Optional[float] = None) -> bool:
+        """
+        Deletes a key from the namespace. See `SecureStorage.remove`.
+        """
+        return await self._storage.remove(self._key(key), timeout)
+
+    async def get_keys(
+        self, key_prefix: str = "", timeout: Optional[float] = None
+    ) -> list[str]:
+        """
+        Gets the `<key>:<value>` entries of the namespace that start with a prefix.
+        See `SecureStorage.get_keys`.
+        """
+        return await self._storage.get_keys(self._key_prefix(key_prefix), timeout)
+
+    async def list_keys(
+        self, key_prefix: str = "", timeout: Optional[float] = None
+    ) -> list[str]:
+        """
+        Retrieves the keys of the namespace that start with a prefix.
+        See `SecureStorage.list_keys`.
+        """
+        return await self._storage.list_keys(self._key_prefix(key_prefix), timeout)
+
+    async def count(self, key_prefix: str = "", timeout: Optional[float] = None) -> int:
+        """
+        Counts the keys of the namespace that start with a prefix.
+        See `SecureStorage.count`.
+        """
+        return await self._storage.count(self._key_prefix(key_prefix), timeout)
+
+    async def items(
+        self, key_prefix: str = "", timeout: Optional[float] = None
+    ) -> dict[str, str]:
+        """
+        Retrieves the keys of the namespace that start with a prefix, and their values.
+        See `SecureStorage.items`.
+        """
+        return await self._storage.items(self._key_prefix(key_prefix), timeout)
+
+    async def clear(self, timeout: Optional[float] = None) -> bool:
+        """
+        Deletes every key in the namespace in a single call to the client.
+        Keys outside of it are kept.
+
+        Returns:
+            bool: True once the namespace is cleared.
+        """
+        await self._storage.clear_prefix(self._key_prefix(""), timeout)
+        return True
+
+    async def clear_prefix(
+        self, key_prefix: str, timeout: Optional[float] = None
+    ) -> int:
+        """
+        Deletes the keys of the namespace that start with a prefix.
+        See `SecureStorage.clear_prefix`.
+        """
+        return await self._storage.clear_prefix(self._key_prefix(key_prefix), timeout)
+
+    async def set_many(
+        self, values: Mapping[str, Any], timeout: Optional[float] = None
+    ) -> dict[str, bool]:
+        """
+        Sets multiple values in the namespace. See `SecureStorage.set_many`.
+        """
+        if not isinstance(values, Mapping):
+            raise ValueError(f"Values must be a mapping. Got {type(values)} instead.")
+        keys = self._keys(values)
+        response = await self._storage.set_many(
+            {key: values[orig] for key, orig in keys.items()}, timeout
+        )
+        return {orig: response[key] for key, orig in keys.items()}
+
+    async def get_many(
+        self, keys: Iterable[str], timeout: Optional[float] = None
+    ) -> dict[str, Optional[str]]:
+        """
+        Retrieves multiple values from the namespace. See `SecureStorage.get_many`.
+        """
+        scoped = self._keys(keys)
+        response = await self._storage.get_many(scoped, timeout)
+        return {orig: response[key] for key, orig in scoped.items()}
+
+    async def contains_many(
+        self, keys: Iterable[str], timeout: Optional[float] = None
+    ) -> dict[str, bool]:
+        """
+        Checks if multiple keys exist in the namespace.
+        See `SecureStorage.contains_many`.
+        """
+        scoped = self._keys(keys)
+        response = await self._storage.contains_many(scoped, timeout)
+        return {orig: response[key] for key, orig in scoped.items()}
+
+    async def remove_many(
+        self, keys: Iterable[str], timeout: Optional[float] = None
+    ) -> dict[str, bool]:
+        """
+        Deletes multiple keys from the namespace. See `SecureStorage.remove_many`.
+        """
+        scoped = self._keys(keys)
+        response = await self._storage.remove_many(scoped, timeout)
+        return {orig: response[key] for key, orig in scoped.items()}
@@ -1,10 +1,20 @@
-from .android_options import AndroidOptions, KeyCipherAlgorithm, StorageCipherAlgorithm
-from .apple_options import AccessControlFlag, KeychainAccessibility
-from .ios_options import IOSOptions
-from .linux_options import LinuxOptions
-from .macos_options import MacOsOptions
-from .web_options import WebOptions
-from .windows_options import WindowsOptions
+from typing import TYPE_CHECKING
+
+from .._helpers import lazy_exports
+
+if TYPE_CHECKING:
+    from .android_options import (
+        AndroidOptions,
+        KeyCipherAlgorithm,
+        StorageCipherAlgorithm,
+    )
+    from .apple_options import AccessControlFlag, KeychainAccessibility
+    from .frozen_options import FrozenOptions
+    from .ios_options import IOSOptions
+    from .linux_options import LinuxOptions
+    from .macos_options import MacOsOptions
+    from .web_options import WebOptions
+    from .windows_options import WindowsOptions
 
 __all__ = [
     "IOSOptions",
@@ -17,4 +27,22 @@ __all__ = [
     "MacOsOptions",
     "KeychainAccessibility",
     "AccessControlFlag",
+    "FrozenOptions",
 ]
+
+# Each platform's module is imported the first time one of its names is used
+_LAZY_IMPORTS = {
+    ".android_options": (
+        "AndroidOptions",
+        "KeyCipherAlgorithm",
+        "StorageCipherAlgorithm",
+    ),
+    ".apple_options": ("KeychainAccessibility", "AccessControlFlag"),
+    ".frozen_options": ("FrozenOptions",),
+    ".ios_options": ("IOSOptions",),
+    ".linux_options": ("LinuxOptions",),
+    ".macos_options": ("MacOsOptions",),
+    ".web_options": ("WebOptions",),
+    ".windows_options": ("WindowsOptions",),
+}
+__getattr__, __dir__ = lazy_exports(__name__, _LAZY_IMPORTS)
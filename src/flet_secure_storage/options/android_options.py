@@ -4,6 +4,8 @@ from enum import Enum, unique
 
 from flet_secure_storage._helpers import parse_bool, parse_enum, parse_str
 
+from .frozen_options import FreezableOptions
+
 __all__ = ["AndroidOptions", "KeyCipherAlgorithm", "StorageCipherAlgorithm"]
 
 
@@ -44,7 +46,7 @@ class StorageCipherAlgorithm(Enum):
 
 
 @dataclass
-class AndroidOptions:
+class AndroidOptions(FreezableOptions):
     """
     Creates Android-specific options for secure storage.
     [Reference - android_options.dart](https://github.com/juliansteenbakker/flutter_secure_storage/blob/05b1c4be30a1c7142dfba6db41b32aa8e6a38c58/flutter_secure_storage/lib/options/android_options.dart)  # noqa: E501
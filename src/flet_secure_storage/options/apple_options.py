@@ -11,6 +11,8 @@ from flet_secure_storage._helpers import (
     parse_str,
 )
 
+from .frozen_options import FreezableOptions
+
 
 @unique
 class KeychainAccessibility(Enum):
@@ -86,7 +88,7 @@ class AccessControlFlag(Enum):
 
 
 @dataclass
-class AppleOptions(ABC):
+class AppleOptions(FreezableOptions, ABC):
     """
     Creates Apple specific options for secure storage. This is the main class
         inherited by iOSOptions and MacOsOptions.
@@ -0,0 +1,123 @@
+import copy
+from collections.abc import Mapping
+from dataclasses import FrozenInstanceError
+from types import MappingProxyType
+from typing import Any, Generic, Protocol, TypeVar
+
+__all__ = ["FrozenOptions", "FreezableOptions"]
+
+
+class _Serializable(Protocol):
+    def options(self) -> Mapping[str, Any]: ...
+
+
+_O = TypeVar("_O", bound=_Serializable)
+
+
+def _hashable(value: Any) -> Any:
+    # accessControlFlags is the only list in the serialized options
+    return tuple(value) if isinstance(value, list) else value
+
+
+class FrozenOptions(Generic[_O]):
+    """
+    A read-only copy of platform options whose `options()` mapping is built
+    once, when the copy is made.
+
+    Created with the `freeze()` method of any options class, and accepted
+    wherever `SecureStorage` takes that class. Fields are read as on the
+    original options, but cannot be assigned; use `thaw()` to get an editable
+    copy.
+
+    Example:
+        ```python
+        ANDROID = AndroidOptions(reset_on_error=False).freeze()
+        storage = SecureStorage(a_options=ANDROID)
+        ```
+    """
+
+    __slots__ = ("_source", "_options", "_hash")
+
+    def __init__(self, options: _O):
+        if isinstance(options, FrozenOptions):
+            options = options._source
+        source = copy.deepcopy(options)
+        serialized = source.options()
+        if not isinstance(serialized, Mapping):
+            raise TypeError(
+                f"{type(source).__name__}.options() must return a dictionary-like object."
+            )
+        object.__setattr__(self, "_source", source)
+        object.__setattr__(self, "_options", MappingProxyType(dict(serialized)))
+        object.__setattr__(self, "_hash", None)
+
+    @property
+    def options_type(self) -> type[_O]:
+        """
+        The class of the frozen options.
+        """
+        return type(self._source)
+
+    def options(self) -> Mapping[str, Any]:
+        """
+        Returns the serialized options, computed when they were frozen.
+        """
+        return self._options
+
+    def thaw(self) -> _O:
+        """
+        Returns an editable copy of the options.
+        """
+        return copy.deepcopy(self._source)
+
+    def __getattr__(self, name: str) -> Any:
+        if name in FrozenOptions.__slots__:
+            raise AttributeError(name)
+        # A copy, so mutable fields such as lists cannot change the frozen options
+        return copy.deepcopy(getattr(self._source, name))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise FrozenInstanceError(f"cannot assign to field {name!r}")
+
+    def __delattr__(self, name: str) -> None:
+        raise FrozenInstanceError(f"cannot delete field {name!r}")
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, FrozenOptions):
+            return NotImplemented
+        return (
+            self.options_type is other.options_type and self._options == other._options
+        )
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            items = tuple((k, _hashable(v)) for k, v in self._options.items())
+            object.__setattr__(self, "_hash", hash((self.options_type, items)))
+        return self._hash
+
+    def __repr__(self) -> str:
+        return f"FrozenOptions({self._source!r})"
+
+    def __copy__(self) -> "FrozenOptions[_O]":
+        return self
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> "FrozenOptions[_O]":
+        return self
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (FrozenOptions, (self._source,))
+
+
+class FreezableOptions:
+    """
+    Adds `freeze()` to the options classes.
+    """
+
+    __slots__ = ()
+
+    def freeze(self: _O) -> FrozenOptions[_O]:
+        """
+        Returns a read-only copy of these options whose serialized mapping is
+        computed once and reused on every update of `SecureStorage`.
+        """
+        return FrozenOptions(self)
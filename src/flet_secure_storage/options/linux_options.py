@@ -1,8 +1,10 @@
 from dataclasses import dataclass
 
+from .frozen_options import FreezableOptions
+
 
 @dataclass
-class LinuxOptions:
+class LinuxOptions(FreezableOptions):
     """
     Creates Linux-specific options for secure storage.
 
@@ -1,8 +1,10 @@
 from dataclasses import dataclass
 
+from .frozen_options import FreezableOptions
+
 
 @dataclass
-class WebOptions:
+class WebOptions(FreezableOptions):
     """
     Creates Web-specific options for secure storage.
 
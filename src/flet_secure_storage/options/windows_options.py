@@ -1,8 +1,10 @@
 from dataclasses import dataclass
 
+from .frozen_options import FreezableOptions
+
 
 @dataclass
-class WindowsOptions:
+class WindowsOptions(FreezableOptions):
     """
     Creates Windows-specific options for secure storage.
 
@@ -0,0 +1,242 @@
+import asyncio
+import heapq
+import itertools
+from collections.abc import Awaitable, Callable, Collection
+from typing import Any, Optional, TypeVar
+
+__all__ = ["OperationScheduler"]
+
+_T = TypeVar("_T")
+
+_READS = frozenset(
+    {
+        "get",
+        "contains_key",
+        "get_many",
+        "contains_many",
+        "get_keys",
+        "list_keys",
+        "count",
+        "items",
+        "scan",
+    }
+)
+_PREFIXED = frozenset(
+    {"get_keys", "list_keys", "count", "items", "scan", "clear_prefix"}
+)
+
+# Lower runs first when every slot is taken
+_READ = 0
+_WRITE = 1
+_BACKGROUND = 2
+
+
+class _Operation:
+    __slots__ = ("keys", "prefix", "write", "background", "deps", "finished", "_done")
+
+    def __init__(
+        self,
+        keys: Optional[Collection[str]],
+        prefix: str,
+        write: bool,
+        background: bool,
+    ):
+        self.keys = keys
+        self.prefix = prefix
+        self.write = write
+        self.background = background
+        self.deps: list[asyncio.Future[None]] = []
+        self.finished = False
+        self._done: Optional[asyncio.Future[None]] = None
+
+    def done(self) -> asyncio.Future[None]:
+        """
+        Returns a future completed when the operation leaves the scheduler.
+        Created on demand, as most operations have nothing waiting for them.
+        """
+        if self._done is None:
+            self._done = asyncio.get_running_loop().create_future()
+            if self.finished:
+                self._done.set_result(None)
+        return self._done
+
+    @property
+    def priority(self) -> int:
+        if not self.write:
+            return _READ
+        return _BACKGROUND if self.background else _WRITE
+
+    def must_follow(self, other: "_Operation") -> bool:
+        """
+        Whether this operation has to wait for an earlier one on the same keys.
+        """
+        if not (self.write or other.write):
+            return False
+        # Reads of keys with a background write are answered by the write-behind
+        # buffer, so they do not wait for the write to reach the client
+        return self.write or not other.background
+
+
+def _scope(
+    method: str, args: Optional[dict[str, Any]]
+) -> tuple[Optional[Collection[str]], str]:
+    """
+    Returns the keys a client method touches, or None and the prefix of the
+    keys when it touches a range. Unknown methods cover every key.
+    """
+    args = args or {}
+    if method in ("get", "contains_key", "set", "remove"):
+        return (args["key"],), ""
+    if method in ("get_many", "contains_many", "remove_many"):
+        return frozenset(args["keys"]), ""
+    if method == "set_many":
+        return frozenset(args["values"]), ""
+    if method == "commit":
+        return frozenset(args["writes"]).union(args["removes"]), ""
+    if method in _PREFIXED:
+        return None, args.get("prefix") or ""
+    return None, ""
+
+
+class OperationScheduler:
+    """
+    Orders the calls of one `SecureStorage` to the client.
+
+    Calls that touch the same key run in the order they were made, unless both
+    only read it. Calls on different keys run in parallel, at most
+    `max_concurrency` at a time; when every slot is taken, waiting reads go
+    first, then writes, then background write-behind flushes.
+    """
+
+    def __init__(self, max_concurrency: int):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1.")
+        self.max_concurrency = max_concurrency
+        self._running = 0
+        self._waiting: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._sequence = itertools.count()
+        self._keyed: dict[str, list[_Operation]] = {}
+        self._ranged: list[_Operation] = []
+
+    def enter(
+        self, method: str, args: Optional[dict[str, Any]], background: bool = False
+    ) -> _Operation:
+        """
+        Registers a call before it runs, so later calls on its keys wait for it.
+        Every call to `enter` must be matched by a call to `leave`.
+        """
+        keys, prefix = _scope(method, args)
+        op = _Operation(keys, prefix, method not in _READS, background)
+        earlier: list[_Operation] = []
+        if keys is not None:
+            keyed = self._keyed
+            for key in keys:
+                ops = keyed.get(key)
+                if ops:
+                    earlier.extend(ops)
+                    ops.append(op)
+                else:
+                    keyed[key] = [op]
+            if self._ranged:
+                earlier.extend(
+                    other
+                    for other in self._ranged
+                    if any(key.startswith(other.prefix) for key in keys)
+                )
+        else:
+            for key, ops in self._keyed.items():
+                if key.startswith(prefix):
+                    earlier.extend(ops)
+            earlier.extend(
+                other
+                for other in self._ranged
+                if other.prefix.startswith(prefix) or prefix.startswith(other.prefix)
+            )
+            self._ranged.append(op)
+        if earlier:
+            op.deps = [
+                other.done()
+                for other in {id(other): other for other in earlier}.values()
+                if op.must_follow(other)
+            ]
+        return op
+
+    def start(self, op: _Operation) -> bool:
+        """
+        Takes a slot for `op` without waiting, when no earlier call on its
+        keys is unfinished and a slot is free. The caller then awaits the call
+        itself and must call `release` once it is done; otherwise it uses `run`.
+        """
+        if self._running >= self.max_concurrency or self._waiting:
+            return False
+        if op.deps:
+            if not all(dep.done() for dep in op.deps):
+                return False
+            op.deps = []
+        self._running += 1
+        return True
+
+    def leave(self, op: _Operation) -> None:
+        """
+        Unregisters a call once it finished, failed or was cancelled, and lets
+        the calls waiting for it run.
+        """
+        if op.finished:
+            return
+        op.finished = True
+        if op._done is not None:
+            op._done.set_result(None)
+        if op.keys is None:
+            self._ranged.remove(op)
+            return
+        for key in op.keys:
+            ops = self._keyed[key]
+            if len(ops) == 1:
+                del self._keyed[key]
+            else:
+                ops.remove(op)
+
+    async def run(self, op: _Operation, factory: Callable[[], Awaitable[_T]]) -> _T:
+        """
+        Waits for the earlier calls on the same keys and for a free slot,
+        then awaits `factory()`.
+        """
+        deps = [dep for dep in op.deps if not dep.done()]
+        op.deps = []
+        if deps:
+            # asyncio.wait does not cancel the futures when this call is cancelled
+            await asyncio.wait(deps)
+        await self._acquire(op.priority)
+        try:
+            return await factory()
+        finally:
+            self._release()
+
+    async def _acquire(self, priority: int) -> None:
+        if self._running < self.max_concurrency and not self._waiting:
+            self._running += 1
+            return
+        slot: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiting, (priority, next(self._sequence), slot))
+        try:
+            await slot
+        except asyncio.CancelledError:
+            if slot.done() and not slot.cancelled():
+                # The slot was handed over just before the cancellation
+                self._release()
+            raise
+
+    def release(self) -> None:
+        """
+        Frees the slot taken by `start`.
+        """
+        self._release()
+
+    def _release(self) -> None:
+        # Hand the slot to the next waiting call instead of freeing it
+        while self._waiting:
+            _, _, slot = heapq.heappop(self._waiting)
+            if not slot.done():
+                slot.set_result(None)
+                return
+        self._running -= 1
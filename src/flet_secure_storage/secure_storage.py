@@ -1,10 +1,36 @@
-from collections.abc import Mapping
-from dataclasses import is_dataclass
-from typing import Any, Optional, Protocol, cast, runtime_checkable
+import asyncio
+import base64
+import contextlib
+import hashlib
+import json
+import secrets
+import time
+import warnings
+from collections import OrderedDict
+from collections.abc import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Iterator,
+    Mapping,
+)
+from dataclasses import dataclass, field, is_dataclass
+from datetime import datetime
+from typing import Any, Optional, Protocol, TypeVar, cast, runtime_checkable
 
 import flet as ft
 
-from ._helpers import add_prefix
+from ._helpers import add_prefix, is_immutable
+from .backends import FlutterBackend, StorageBackend
+from .blob import BlobData, BlobManifest, chunk_key, rechunk
+from .cache import CacheOptions, CacheState, CacheStats, ValueCache
+from .compression import CompressionOptions, decode_value, encode_value
+from .events import SecureStorageChangeEvent
+from .hashed_keys import HashedKeyBackend, HashedKeyOptions
+from .key_index import KeyIndex
+from .metrics import CallRecord, StorageMetrics, payload_size
+from .namespace import SecureStorageNamespace
 from .options import (
     AndroidOptions,
     IOSOptions,
@@ -14,6 +40,20 @@ from .options import (
     WindowsOptions,
 )
 from .options.android_options import KeyCipherAlgorithm, StorageCipherAlgorithm
+from .options.frozen_options import FrozenOptions
+from .scheduler import OperationScheduler
+from .snapshot import decode_snapshot, encode_snapshot
+from .transaction import JOURNAL_KEY, SecureStorageTransaction
+from .value_codecs import (
+    BoolCodec,
+    CodecRegistry,
+    DateTimeCodec,
+    FloatCodec,
+    IntCodec,
+    JsonCodec,
+    ValueCodec,
+)
+from .write_behind import REMOVED, WriteBehindOptions, WriteBuffer
 
 __all__ = [
     "SecureStorage",
@@ -27,6 +67,31 @@ __all__ = [
     "StorageCipherAlgorithm",
 ]
 
+_T = TypeVar("_T")
+
+
+_JSON_CODEC = JsonCodec()
+_INT_CODEC = IntCodec()
+_FLOAT_CODEC = FloatCodec()
+_BOOL_CODEC = BoolCodec()
+_DATETIME_CODEC = DateTimeCodec()
+
+# Defaults of write_blob/read_blob: bytes per chunk key, and chunks per window.
+# 1536 bytes are 2048 characters in base64, below the 2560-byte limit of a
+# Windows Credential Manager entry, the smallest of the supported platforms.
+_BLOB_CHUNK_SIZE = 1536
+_BLOB_WINDOW = 4
+
+# Largest transaction the client can store as one journal value on Windows,
+# below the 2560-byte Windows Credential Manager entry limit
+_WINDOWS_JOURNAL_BYTES = 2048
+# Room left per value for the headers added by compression and hashed keys
+_JOURNAL_VALUE_OVERHEAD = 64
+
+# Limits of the objects reused by the typed accessors without a value cache
+_DECODED_MAX_ENTRIES = 128
+_DECODED_MAX_BYTES = 256 * 1024
+
 
 class SecureStorageKeyError(ValueError):
     """
@@ -34,11 +99,129 @@ class SecureStorageKeyError(ValueError):
     """
 
 
+class SecureStorageFlushError(RuntimeError):
+    """
+    Raised when buffered writes or removes could not be flushed to the client.
+
+    Attributes:
+        failed_writes: The prefixed keys and values that were not written.
+        failed_removes: The prefixed keys that were not removed.
+    """
+
+    def __init__(
+        self,
+        message: str,
+        failed_writes: Mapping[str, Any] | None = None,
+        failed_removes: Iterable[str] | None = None,
+    ):
+        super().__init__(message)
+        self.failed_writes = dict(failed_writes or {})
+        self.failed_removes = list(failed_removes or [])
+
+
+class SecureStorageBlobError(RuntimeError):
+    """
+    Raised when a blob could not be written, or a chunk of a blob is missing or corrupted.
+    """
+
+
+class SecureStorageTransactionError(RuntimeError):
+    """
+    Raised when the client did not apply a transaction.
+    """
+
+
+class SecureStorageTimeoutError(TimeoutError):
+    """
+    Raised when the client does not answer a storage method within its timeout.
+
+    Attributes:
+        method: The name of the client method.
+        timeout: The timeout in seconds.
+    """
+
+    def __init__(self, method: str, timeout: float):
+        super().__init__(f"SecureStorage {method!r} timed out after {timeout}s.")
+        self.method = method
+        self.timeout = timeout
+
+
+@dataclass
+class ScanPage:
+    """
+    One page of keys returned by `SecureStorage.scan`.
+
+    Attributes:
+        keys: The matching keys of this page, in sorted order.
+        items: The keys of this page mapped to their values. Empty unless
+            values were requested.
+        cursor: The key to pass as `start_after` to fetch the next page,
+            or None if this is the last page.
+    """
+
+    keys: list[str] = field(default_factory=list)
+    items: dict[str, str] = field(default_factory=dict)
+    cursor: Optional[str] = None
+
+
+def _watching(e: SecureStorageChangeEvent) -> None:
+    """
+    The `on_change` handler set while `watch()` is iterated without one.
+    """
+
+
 @runtime_checkable
 class HasOptions(Protocol):
     def options(self) -> Mapping[str, object]: ...
 
 
+# The attributes holding each platform's options, and their key on the client
+_PLATFORM_OPTIONS = {
+    "i_options": "iOptions",
+    "a_options": "aOptions",
+    "l_options": "lOptions",
+    "w_options": "wOptions",
+    "web_options": "webOptions",
+    "m_options": "mOptions",
+}
+
+# The options attribute used by each platform a native session reports
+_NATIVE_PLATFORMS = {
+    ft.PagePlatform.IOS: "i_options",
+    ft.PagePlatform.ANDROID: "a_options",
+    ft.PagePlatform.ANDROID_TV: "a_options",
+    ft.PagePlatform.MACOS: "m_options",
+    ft.PagePlatform.WINDOWS: "w_options",
+    ft.PagePlatform.LINUX: "l_options",
+}
+
+
+def _options_state(opt: object) -> object:
+    """
+    Returns the values that decide whether platform options must be
+    serialized again, or None when the object itself is enough.
+    """
+    if type(opt) is FrozenOptions:
+        return None
+    fields = getattr(opt, "__dict__", None)
+    if fields is not None:
+        # Lists are copied so changing one in place is noticed
+        return [tuple(v) if type(v) is list else v for v in fields.values()]
+    return dict(opt) if isinstance(opt, Mapping) else None
+
+
+def _journal_size(key: str, value: Any) -> int:
+    """
+    Returns the approximate number of bytes a change adds to the journal
+    the client stores for a transaction.
+    """
+    size = len(json.dumps(key, ensure_ascii=False).encode())
+    if value is not REMOVED:
+        size += len(json.dumps(value, ensure_ascii=False).encode())
+        size += _JOURNAL_VALUE_OVERHEAD
+    return size
+
+
 @ft.control("SecureStorage")  # type: ignore[arg-type]
 class SecureStorage(ft.Service):
     """
@@ -49,16 +232,43 @@ class SecureStorage(ft.Service):
     The functions used are to mirror the Flet [client_storage](https://docs.flet.dev/cookbook/client-storage/) calls
     """
 
+    on_change: Optional[ft.EventHandler[SecureStorageChangeEvent]] = None
+    """
+    Called after keys were written, removed or cleared on the client, by this
+    instance or any other part of the app. The client only sends these events
+    while a handler is set or `watch()` is iterated.
+    """
+
+    options: Optional[dict[str, Any]] = None
+    """
+    The serialized platform options the client creates its storage with,
+    keyed by platform. Built from the `*_options` attributes on every update;
+    platforms left at their defaults are omitted and use the plugin defaults.
+    """
+
     def __init__(
         self,
         prefix: str | None = None,
         prefix_separator: str | None = ".",
-        i_options: IOSOptions | None = None,
-        a_options: AndroidOptions | None = None,
-        l_options: LinuxOptions | None = None,
-        w_options: WindowsOptions | None = None,
-        web_options: WebOptions | None = None,
-        m_options: MacOsOptions | None = None,
+        i_options: IOSOptions | FrozenOptions[IOSOptions] | None = None,
+        a_options: AndroidOptions | FrozenOptions[AndroidOptions] | None = None,
+        l_options: LinuxOptions | FrozenOptions[LinuxOptions] | None = None,
+        w_options: WindowsOptions | FrozenOptions[WindowsOptions] | None = None,
+        web_options: WebOptions | FrozenOptions[WebOptions] | None = None,
+        m_options: MacOsOptions | FrozenOptions[MacOsOptions] | None = None,
+        cache: CacheOptions | None = None,
+        write_behind: WriteBehindOptions | None = None,
+        index_keys: bool = False,
+        codecs: CodecRegistry | None = None,
+        compression: CompressionOptions | None = None,
+        metrics: bool = False,
+        backend: StorageBackend | None = None,
+        default_timeout: float | None = None,
+        max_concurrency: int = 16,
+        on_change: Optional[ft.EventHandler[SecureStorageChangeEvent]] = None,
+        active_platform_only: bool = False,
+        hashed_keys: HashedKeyOptions | None = None,
+        blob_chunk_size: int = _BLOB_CHUNK_SIZE,
     ):
         # Normalize and validate prefix
         if prefix is None:
@@ -88,157 +298,2191 @@ class SecureStorage(ft.Service):
         self.web_options = web_options if web_options is not None else WebOptions()
         self.m_options = m_options if m_options is not None else MacOsOptions()
 
+        # The serialized options of each platform, and the object and field
+        # values each was built from, so unchanged options are not rebuilt
+        self._platform_options: dict[str, Mapping[str, object]] = {}
+        self._options_sources: dict[str, tuple[object, object]] = {}
+        # Options created here are not sent until they are changed, so the
+        # client keeps the plugin defaults its data was stored with
+        self._default_options: dict[str, tuple[object, object]] = {
+            name: (getattr(self, name), _options_state(getattr(self, name)))
+            for name, opt in (
+                ("i_options", i_options),
+                ("a_options", a_options),
+                ("l_options", l_options),
+                ("w_options", w_options),
+                ("web_options", web_options),
+                ("m_options", m_options),
+            )
+            if opt is None
+        }
+
+        # Send only the options of the platform the session runs on
+        self.active_platform_only = active_platform_only
+        self._options_platform: str | None = None
+
+        # Opt-in read-through cache, keyed by the prefixed key
+        if cache is not None and not isinstance(cache, CacheOptions):
+            raise TypeError("cache must be a CacheOptions instance or None.")
+        self._cache = ValueCache(cache) if cache is not None else None
+        self._refresh_tasks: dict[str, asyncio.Task[None]] = {}
+
+        # Opt-in local trie of keys, built on first use from one listing
+        self._index: KeyIndex | None = (
+            KeyIndex(self._hierarchy_separator) if index_keys else None
+        )
+        self._index_loaded = False
+        self._index_generation = 0
+        self._index_journal: dict[str, bool] | None = None
+
+        # Where the storage methods run; the Flutter client unless replaced
+        if backend is not None and not isinstance(backend, StorageBackend):
+            raise TypeError("backend must implement invoke() or be None.")
+        self._backend = backend if backend is not None else FlutterBackend(self)
+
+        # Opt-in hashing of the keys below the prefix on the client
+        if hashed_keys is not None and not isinstance(hashed_keys, HashedKeyOptions):
+            raise TypeError("hashed_keys must be a HashedKeyOptions instance or None.")
+        if hashed_keys is not None:
+            self._backend = HashedKeyBackend(
+                self._backend, hashed_keys, self._own_prefix()
+            )
+
+        # Deadline of each call to the client when a method is not given one
+        if default_timeout is not None and default_timeout <= 0:
+            raise ValueError("default_timeout must be positive or None.")
+        self.default_timeout = default_timeout
+
+        # Bytes per chunk key of write_blob when a call is not given a size
+        self._validate_positive("blob_chunk_size", blob_chunk_size)
+        self.blob_chunk_size = blob_chunk_size
+
+        # Orders calls per key and limits how many reach the client at once
+        self._scheduler = OperationScheduler(max_concurrency)
+
+        # Opt-in counters of the calls to the client
+        self._metrics = StorageMetrics() if metrics else None
+
+        # Opt-in compression of large values
+        if compression is not None and not isinstance(compression, CompressionOptions):
+            raise TypeError(
+                "compression must be a CompressionOptions instance or None."
+            )
+        self._compression = compression
+
+        # Codecs used by the typed accessors, and the objects they last decoded
+        if codecs is not None and not isinstance(codecs, CodecRegistry):
+            raise TypeError("codecs must be a CodecRegistry instance or None.")
+        self.codecs = codecs if codecs is not None else CodecRegistry.default()
+        self._decoded: OrderedDict[str, tuple[str, ValueCodec[Any], Any]] = (
+            OrderedDict()
+        )
+        self._decoded_bytes = 0
+
+        # Reads in flight, shared by concurrent callers with the same arguments
+        self._flights: dict[tuple[str, str], asyncio.Future[Any]] = {}
+
+        # Opt-in write-behind buffer, keyed by the prefixed key
+        if write_behind is not None and not isinstance(
+            write_behind, WriteBehindOptions
+        ):
+            raise TypeError(
+                "write_behind must be a WriteBehindOptions instance or None."
+            )
+        self._write_behind = write_behind
+        self._write_buffer = WriteBuffer() if write_behind is not None else None
+        self._flush_lock = asyncio.Lock()
+        self._flush_timer: asyncio.TimerHandle | None = None
+        self._flush_tasks: set[asyncio.Task[None]] = set()
+        # Set while the control is removed from the page, so failed background
+        # flushes are reported as warnings instead of to the next call
+        self._unmounted = False
+        self._flush_error: SecureStorageFlushError | None = None
+
+        # Change events from the client, and the watch() queues they are sent to
+        self._initial_on_change = on_change
+        self._watchers: list[tuple[str, asyncio.Queue[SecureStorageChangeEvent]]] = []
+
         super().__init__()
 
+    @property
+    def _hierarchy_separator(self) -> str:
+        """
+        The separator between key segments, used by the key index.
+        """
+        return self.prefix_separator or "."
+
+    @property
+    def cache_stats(self) -> CacheStats | None:
+        """
+        Hit, miss and size counters of the value cache, or None if the
+        cache is not enabled.
+        """
+        return self._cache.stats if self._cache is not None else None
+
+    @property
+    def metrics(self) -> StorageMetrics | None:
+        """
+        Per-method call counts, errors, latency percentiles and payload sizes,
+        or None if metrics are not enabled.
+        """
+        return self._metrics
+
     def before_update(self) -> None:
         """
         Overrides the parent method. This is where we ensure the option
         dictionaries are correctly formatted for the client.
 
-        Sets each platform options attribute to a dictionary, or raises TypeError
-        if the attribute is not a dataclass with an options() method.
+        Serializes each platform options attribute that was replaced or changed
+        since the last update, or raises SecureStorageKeyError if the attribute
+        is not a dataclass with an options() method. Frozen options are
+        serialized once. Options that were not passed to the constructor are
+        only sent once they are replaced or changed.
         """
         # super().before_update is not typed in flet; silence mypy for this call
         super().before_update()  # type: ignore[no-untyped-call]
-        for platform_options in (
-            "i_options",
-            "a_options",
-            "l_options",
-            "w_options",
-            "web_options",
-            "m_options",
-        ):
+        changed = False
+        for platform_options in _PLATFORM_OPTIONS:
             opt = getattr(self, platform_options, None)
-            if opt is None or isinstance(opt, Mapping):
+            state = _options_state(opt) if opt is not None else None
+            default = self._default_options.get(platform_options)
+            if default is not None and default[0] is opt and default[1] == state:
+                opt = None
+            if opt is None:
+                if self._platform_options.pop(platform_options, None) is not None:
+                    changed = True
+                self._options_sources.pop(platform_options, None)
                 continue
 
-            if not is_dataclass(opt) or isinstance(opt, type):
-                raise SecureStorageKeyError(
-                    f"{platform_options!r} must be a dataclass instance with an options() method."
-                )
+            source = self._options_sources.get(platform_options)
+            if source is not None and source[0] is opt and source[1] == state:
+                continue
 
-            if not isinstance(opt, HasOptions):
-                raise SecureStorageKeyError(
-                    f"{platform_options!r} must implement options() -> Mapping."
-                )
+            self._platform_options[platform_options] = self._serialize_options(
+                platform_options, opt
+            )
+            # options() may fill in defaults, so the state is read again
+            self._options_sources[platform_options] = (opt, _options_state(opt))
+            changed = True
+
+        platform = self._active_platform() if self.active_platform_only else None
+        if changed or platform != self._options_platform or self.options is None:
+            self._options_platform = platform
+            self.options = {
+                _PLATFORM_OPTIONS[name]: dict(mapping)
+                for name, mapping in self._platform_options.items()
+                if platform is None or name == platform
+            }
+
+    def _active_platform(self) -> str | None:
+        """
+        Returns the options attribute of the platform the session runs on, or
+        None while the control is not on a page or the platform is unknown.
+        """
+        try:
+            page = self.page
+        except RuntimeError:
+            return None
+        if page.web:
+            return "web_options"
+        return _NATIVE_PLATFORMS.get(page.platform) if page.platform else None
+
+    @staticmethod
+    def _serialize_options(platform_options: str, opt: object) -> Mapping[str, object]:
+        """
+        Returns the serialized options of one platform.
+        """
+        if isinstance(opt, Mapping):
+            return opt
+        if isinstance(opt, FrozenOptions):
+            return opt.options()
 
-            options_dict = opt.options()
+        if not is_dataclass(opt) or isinstance(opt, type):
+            raise SecureStorageKeyError(
+                f"{platform_options!r} must be a dataclass instance with an options() method."
+            )
 
-            if not isinstance(options_dict, Mapping):
-                raise SecureStorageKeyError(
-                    f"{platform_options!r}.options() must return a dictionary-like object."
+        if not isinstance(opt, HasOptions):
+            raise SecureStorageKeyError(
+                f"{platform_options!r} must implement options() -> Mapping."
+            )
+
+        options_dict = opt.options()
+
+        if not isinstance(options_dict, Mapping):
+            raise SecureStorageKeyError(
+                f"{platform_options!r}.options() must return a dictionary-like object."
+            )
+
+        return options_dict
+
+    def init(self) -> None:
+        """
+        Overrides the parent method. Fields can only be set once the control
+        is initialized, so `on_change` is assigned here.
+        """
+        super().init()  # type: ignore[no-untyped-call]
+        self.on_change = self._initial_on_change
+
+    def did_mount(self) -> None:
+        """
+        Overrides the parent method. Names the value cache after the session,
+        so `CacheManager.usage()` reports memory use per session, and joins the
+        manager again if the control was unmounted before.
+        """
+        super().did_mount()  # type: ignore[no-untyped-call]
+        self._unmounted = False
+        if self._cache is not None:
+            self._cache.name = f"{self.page.session.id}:{self._i}"
+            self._cache.reopen()
+
+    def will_unmount(self) -> None:
+        """
+        Overrides the parent method. Flushes changes buffered in write-behind
+        mode when the backend runs in Python, or warns that they cannot reach
+        the client, then drops the cached values, releasing their share of the
+        `CacheManager` budget.
+        """
+        self._unmounted = True
+        self._flush_on_unmount()
+        if self._cache is not None:
+            self._cache.close()
+        super().will_unmount()  # type: ignore[no-untyped-call]
+
+    def _flush_on_unmount(self) -> None:
+        if self._write_buffer is None:
+            return
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        error, self._flush_error = self._flush_error, None
+        if error is not None:
+            self._warn_unflushed(error.failed_writes, error.failed_removes)
+        if not len(self._write_buffer):
+            return
+        backend = self._backend
+        if isinstance(backend, HashedKeyBackend):
+            backend = backend.backend
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            running = False
+        else:
+            running = True
+        if isinstance(backend, FlutterBackend) or not running:
+            # Flet removed the service from the client before calling
+            # will_unmount, so the buffered changes can no longer be sent. They
+            # stay buffered in case the service is added to a page again.
+            changes = self._write_buffer.changes()
+            self._warn_unflushed(
+                {key: value for key, value in changes.items() if value is not REMOVED},
+                [key for key, value in changes.items() if value is REMOVED],
+            )
+            return
+        self._start_background_flush()
+
+    def _warn_unflushed(
+        self, writes: Mapping[str, Any], removes: Iterable[str]
+    ) -> None:
+        keys = [*writes, *removes]
+        warnings.warn(
+            f"SecureStorage was removed from the page before {len(keys)} buffered "
+            f"change(s) reached the client: {', '.join(keys)}. Await close() or "
+            "flush() before removing it.",
+            RuntimeWarning,
+            stacklevel=3,
+        )
+
+    async def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Sends every change buffered in write-behind mode, like `flush()`.
+        Await it before removing the service from the page: Flet removes the
+        service from the client before `will_unmount` runs, so changes still
+        buffered then are lost.
+
+        Args:
+            timeout (Optional[float]): Seconds to wait for the client. Uses
+                `default_timeout` when None.
+
+        Raises:
+            SecureStorageFlushError: If the buffered changes could not be written.
+        """
+        await self.flush(timeout)
+
+    def before_event(self, e: ft.ControlEvent) -> bool:
+        """
+        Overrides the parent method. Change events from the client drop the
+        changed keys from the caches and are passed to `watch()` iterators
+        before `on_change` is called.
+        """
+        if isinstance(e, SecureStorageChangeEvent):
+            self._changed(e)
+        return cast(bool, super().before_event(e))
+
+    def _changed(self, e: SecureStorageChangeEvent) -> None:
+        """
+        Applies a change made on the client to the local caches, and queues
+        it for every watcher of the changed keys.
+        """
+        if isinstance(self._backend, HashedKeyBackend) and e.keys:
+            logical = [self._backend.logical_key(key) for key in e.keys]
+            if None in logical:
+                # Hashed by another instance, so the changed key is not known
+                self._clear_local()
+                self.reset_index()
+            e.keys = [
+                key if key is not None else stored
+                for key, stored in zip(logical, e.keys)
+            ]
+
+        if e.kind == "clear":
+            self._clear_local()
+        else:
+            self._invalidate(*e.keys)
+            self._index_changed(
+                {
+                    key: e.kind == "set"
+                    for key in e.keys
+                    if key.startswith(self._own_prefix())
+                }
+            )
+
+        for prefix, queue in self._watchers:
+            if e.kind == "clear":
+                queue.put_nowait(e)
+                continue
+            keys = [key for key in e.keys if key.startswith(prefix)]
+            if keys:
+                queue.put_nowait(
+                    SecureStorageChangeEvent(
+                        name=e.name, control=e.control, kind=e.kind, keys=keys
+                    )
                 )
 
-            setattr(self, platform_options, options_dict)
+    def _sync_change_events(self) -> None:
+        """
+        Keeps `on_change` set while `watch()` is iterated, as the client only
+        sends change events when it is.
+        """
+        if self._watchers and self.on_change is None:
+            self.on_change = _watching
+        elif not self._watchers and self.on_change is _watching:
+            self.on_change = None
+        else:
+            return
+        # Services that are not on a page yet send the handler when added
+        with contextlib.suppress(RuntimeError):
+            self.update()
+
+    async def watch(
+        self, key_prefix: str = ""
+    ) -> AsyncIterator[SecureStorageChangeEvent]:
+        """
+        Yields a change event every time keys that start with a prefix are
+        written, removed or cleared on the client.
+
+        Args:
+            key_prefix (str): The prefix of the keys to watch. Uses the `prefix=`
+                option when empty.
+
+        Yields:
+            SecureStorageChangeEvent: The change, with only the watched keys.
+                Clearing the whole store is always yielded.
+
+        Example:
+            ```python
+            async for event in storage.watch("session"):
+                print(event.kind, event.keys)
+            ```
+        """
+        key_prefix = self._resolve_key_prefix(key_prefix)
+        queue: asyncio.Queue[SecureStorageChangeEvent] = asyncio.Queue()
+        watcher = (key_prefix, queue)
+        self._watchers.append(watcher)
+        self._sync_change_events()
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self._watchers.remove(watcher)
+            self._sync_change_events()
 
     def _validate_key(self, key: str) -> None:
         if not isinstance(key, str):
             raise ValueError(f"Key must be a string. Got {type(key)} instead.")
         if key.strip() == "":
             raise ValueError("Key cannot be empty or whitespace.")
+        if key == JOURNAL_KEY and not self.prefix:
+            raise ValueError(f"{JOURNAL_KEY!r} is reserved for transactions.")
 
-    async def set(self, key: str, value: Any) -> bool:
+    def _storage_key(self, key: str) -> str:
         """
-        Sets a value in secure storage.
-        From flutter_secure_storage: storage.write
+        Validates a user supplied key and returns the key used on the client.
+        """
+        self._validate_key(key)
+        return add_prefix(self.prefix, self.prefix_separator, key)
 
-        Args:
-            key (str): key name, used to retrieve the value
-            value (Any): value to store
+    def _storage_keys(self, keys: Iterable[str]) -> dict[str, str]:
+        """
+        Validates a collection of user supplied keys and maps each client key
+        back to the key it was created from.
+        """
+        if isinstance(keys, str) or not isinstance(keys, Iterable):
+            raise ValueError(
+                f"Keys must be a collection of strings. Got {type(keys)} instead."
+            )
+        return {self._storage_key(key): key for key in keys}
 
-        Returns:
-            bool: True if the value was stored successfully, False otherwise
+    def _pack(self, value: Any) -> Any:
         """
-        self._validate_key(key)
-        key = add_prefix(self.prefix, self.prefix_separator, key)
-        return cast(
-            bool, await self._invoke_method("set", {"key": key, "value": value})
-        )
+        Returns the value sent to the client, compressed if enabled and large enough.
+        """
+        return encode_value(value, self._compression)
 
-    async def get(self, key: str) -> Optional[str]:
+    def _unpack(self, raw: Any) -> Optional[str]:
         """
-        Retrieves a value from secure storage.
-        From flutter_secure_storage: storage.read
+        Returns the original value for a value read from the client.
+        """
+        return decode_value(cast(Optional[str], raw))
 
-        Args:
-            key (str): The key to retrieve the value for.
+    def _unpack_items(self, items: Mapping[str, str]) -> dict[str, str]:
+        return {key: cast(str, decode_value(value)) for key, value in items.items()}
 
-        Returns:
-            Optional[str]: The value associated with the key as a string, or None if not found.
+    def _invalidate(self, *keys: str) -> None:
+        if self._cache is not None:
+            for key in keys:
+                self._cache.invalidate(key)
+        for key in keys:
+            self._forget_decoded(key)
+        if self._flights:
+            self._end_flights(keys)
+
+    def _clear_local(self, prefix: str = "") -> None:
         """
-        self._validate_key(key)
-        key = add_prefix(self.prefix, self.prefix_separator, key)
-        return cast(Optional[str], await self._invoke_method("get", {"key": key}))
+        Forgets every cached value and shared read after the store, or the keys
+        starting with `prefix`, are cleared.
+        """
+        if self._cache is not None:
+            self._cache.clear(prefix)
+        for key in [key for key in self._decoded if key.startswith(prefix)]:
+            self._forget_decoded(key)
+        self._end_flights()
+        if self._index is None:
+            return
+        if prefix:
+            # clear_prefix loads the index first, so no listing is in flight
+            self._index.clear(prefix)
+            return
+        self._index.clear()
+        self._index_generation += 1
+        self._index_journal = None
 
-    async def contains_key(self, key: str) -> bool:
+    def _index_changed(self, changes: Mapping[str, bool]) -> None:
         """
-        Checks if a key exists in secure storage.
-        From flutter_secure_storage: storage.containsKey
+        Records prefixed keys that were added (True) or removed (False)
+        in the key index.
+        """
+        if self._index is None:
+            return
+        if self._index_journal is not None:
+            # A listing is in flight; replay these changes once it returns
+            self._index_journal.update(changes)
+        if self._index_loaded:
+            for key, present in changes.items():
+                if present:
+                    self._index.add(key)
+                else:
+                    self._index.remove(key)
 
-        Args:
-            key (str): The key to check for existence.
+    async def _loaded_index(self, timeout: Optional[float] = None) -> KeyIndex:
+        """
+        Returns the key index, listing the keys of this instance's prefix
+        from the client the first time it is used.
+        """
+        if self._index is None:
+            raise RuntimeError("The key index is not enabled.")
+        if not self._index_loaded:
+            await self._single_flight(
+                "index", self._own_prefix(), lambda: self._load_index(timeout), timeout
+            )
+        return self._index
 
-        Returns:
-            bool: True if the key exists, False otherwise.
+    async def _load_index(self, timeout: Optional[float] = None) -> None:
+        generation = self._index_generation
+        self._index_journal = {}
+        try:
+            keys = cast(
+                list[str],
+                await self._call("list_keys", {"prefix": self._own_prefix()}, timeout),
+            )
+            journal = self._index_journal or {}
+        finally:
+            self._index_journal = None
+        if generation != self._index_generation:
+            # Cleared while listing; the listing is outdated and the store is empty
+            self._index_loaded = True
+            return
+
+        index = KeyIndex(self._hierarchy_separator, keys)
+        changes = dict(journal)
+        if self._write_buffer is not None:
+            changes.update(
+                {
+                    key: value is not REMOVED
+                    for key, value in self._write_buffer.changes().items()
+                }
+            )
+        for key, present in changes.items():
+            if present:
+                index.add(key)
+            else:
+                index.remove(key)
+        self._index = index
+        self._index_loaded = True
+
+    def reset_index(self) -> None:
         """
-        self._validate_key(key)
-        key = add_prefix(self.prefix, self.prefix_separator, key)
-        return cast(bool, await self._invoke_method("contains_key", {"key": key}))
+        Drops the key index so it is listed from the client again on next use.
+        Use this after keys were changed outside of this instance.
+        """
+        if self._index is not None:
+            self._index = KeyIndex(self._hierarchy_separator)
+            self._index_loaded = False
+            self._index_generation += 1
 
-    async def remove(self, key: str) -> bool:
+    def _end_flights(self, keys: Iterable[str] | None = None) -> None:
         """
-        Deletes a key from the secure storage.
-        From flutter_secure_storage: storage.delete
+        Stops sharing the reads in flight that a write to `keys` (or to every
+        key when None) may have made outdated. Callers already waiting keep
+        their result; later callers start a new read.
+        """
+        if keys is None:
+            self._flights.clear()
+            return
+        keys = set(keys)
+        for flight in list(self._flights):
+            method, arg = flight
+            if method == "get_keys":
+                outdated = any(key.startswith(arg) for key in keys)
+            else:
+                outdated = arg in keys
+            if outdated:
+                del self._flights[flight]
 
-        Args:
-            key (str): The key to delete.
+    async def _single_flight(
+        self,
+        method: str,
+        arg: str,
+        factory: Callable[[], Awaitable[_T]],
+        timeout: Optional[float] = None,
+    ) -> _T:
+        """
+        Runs `factory` once for concurrent calls of `method` with the same
+        argument and gives every caller its result.
 
-        Returns:
-            bool: True if the key was deleted successfully, False otherwise.
+        The shared read is shielded, so cancelling one caller does not cancel
+        it for the others. A caller that joins a read already in flight waits
+        at most its own `timeout` (`default_timeout` when None), even when the
+        read was started with a longer one.
         """
-        self._validate_key(key)
-        key = add_prefix(self.prefix, self.prefix_separator, key)
-        return cast(bool, await self._invoke_method("remove", {"key": key}))
+        if timeout is not None and timeout <= 0:
+            raise ValueError("timeout must be positive or None.")
+        flight = (method, arg)
+        future = self._flights.get(flight)
+        joined = future is not None
+        if future is None:
+            future = asyncio.ensure_future(factory())
+            self._flights[flight] = future
+
+            def _done(done: asyncio.Future[Any]) -> None:
+                if self._flights.get(flight) is done:
+                    del self._flights[flight]
+                if not done.cancelled():
+                    # Mark the exception as retrieved if every caller was cancelled
+                    done.exception()
 
-    async def get_keys(self, key_prefix: str = "") -> list[str]:
+            future.add_done_callback(_done)
+        if joined and timeout is None:
+            timeout = self.default_timeout
+        if not joined or timeout is None:
+            # The caller that started the read is bound by the timeout of its call
+            return cast(_T, await asyncio.shield(future))
+        try:
+            return cast(_T, await asyncio.wait_for(asyncio.shield(future), timeout))
+        except (asyncio.TimeoutError, TimeoutError) as exc:
+            if isinstance(exc, SecureStorageTimeoutError):
+                raise
+            raise SecureStorageTimeoutError(method, timeout) from exc
+
+    async def _call(
+        self,
+        name: str,
+        args: dict[str, Any] | None = None,
+        timeout: Optional[float] = None,
+        background: bool = False,
+    ) -> Any:
         """
-        Retrieves all keys from secure storage.
-        From flutter_secure_storage: storage.readAll
+        Calls a method on the backend, recording it when metrics are enabled.
+        Background calls give way to reads when the client is busy.
+        """
+        if timeout is None:
+            timeout = self.default_timeout
+        if self._metrics is None:
+            return await self._invoke_backend(name, args, timeout, background)
 
-        Args:
-            key_prefix (str): The prefix to filter keys by.
+        start = time.perf_counter()
+        error: Optional[BaseException] = None
+        result: Any = None
+        try:
+            result = await self._invoke_backend(name, args, timeout, background)
+            return result
+        except BaseException as exc:
+            error = exc
+            raise
+        finally:
+            self._metrics.record(
+                CallRecord(
+                    method=name,
+                    duration=time.perf_counter() - start,
+                    error=error,
+                    request_bytes=payload_size(args),
+                    response_bytes=payload_size(result),
+                )
+            )
 
-        Returns:
-            list[str]: Returns a list of keys [<key_prefix>:<value>] of the values
-                       that match the key_prefix or all keys if the user enters and
-                       empty string or None
+    async def _invoke_backend(
+        self,
+        name: str,
+        args: dict[str, Any] | None,
+        timeout: Optional[float],
+        background: bool = False,
+    ) -> Any:
+        if timeout is not None and timeout <= 0:
+            raise ValueError("timeout must be positive or None.")
+        # Registered before the first await, so calls keep the order they were made in
+        operation = self._scheduler.enter(name, args, background)
+        try:
+            if self._scheduler.start(operation):
+                # Nothing to wait for: call the backend without the scheduler
+                try:
+                    if timeout is None:
+                        return await self._backend.invoke(name, args)
+                    try:
+                        return await asyncio.wait_for(
+                            self._backend.invoke(name, args, timeout), timeout
+                        )
+                    except (asyncio.TimeoutError, TimeoutError) as exc:
+                        raise SecureStorageTimeoutError(name, timeout) from exc
+                finally:
+                    self._scheduler.release()
+            if timeout is None:
+                return await self._scheduler.run(
+                    operation, lambda: self._backend.invoke(name, args)
+                )
+            # The deadline includes the time spent waiting for earlier calls
+            try:
+                return await asyncio.wait_for(
+                    self._scheduler.run(
+                        operation, lambda: self._backend.invoke(name, args, timeout)
+                    ),
+                    timeout,
+                )
+            except (asyncio.TimeoutError, TimeoutError) as exc:
+                raise SecureStorageTimeoutError(name, timeout) from exc
+        finally:
+            self._scheduler.leave(operation)
+
+    async def _fetch(self, key: str, timeout: Optional[float] = None) -> Optional[str]:
         """
-        if key_prefix is None or key_prefix.strip() == "":
-            key_prefix = self.prefix
-        elif (
-            key_prefix == self.prefix
-            or key_prefix == f"{self.prefix}{self.prefix_separator}"
-        ):
-            key_prefix = self.prefix
-        else:
-            key_prefix = add_prefix(self.prefix, self.prefix_separator, key_prefix)
+        Reads a prefixed key from the client and stores it in the cache.
+        """
+        token = self._cache.begin() if self._cache is not None else 0
+        value = self._unpack(await self._call("get", {"key": key}, timeout))
+        if self._cache is not None:
+            self._cache.store(key, value, token)
+        return value
+
+    async def _fetch_exists(self, key: str, timeout: Optional[float] = None) -> bool:
+        """
+        Checks a prefixed key on the client and stores the result in the cache.
+        """
+        token = self._cache.begin() if self._cache is not None else 0
+        result = cast(bool, await self._call("contains_key", {"key": key}, timeout))
+        if self._cache is not None:
+            self._cache.store_exists(key, result, token)
+        return result
+
+    def _schedule_refresh(self, key: str) -> None:
+        """
+        Refreshes a stale cache entry in the background.
+        """
+        if key in self._refresh_tasks:
+            return
+        task = asyncio.create_task(self._refresh(key))
+        self._refresh_tasks[key] = task
+        task.add_done_callback(lambda _: self._refresh_tasks.pop(key, None))
+
+    async def _refresh(self, key: str) -> None:
+        try:
+            await self._single_flight("get", key, lambda: self._fetch(key))
+        except Exception:
+            # The stale value was already served; drop it so the next read
+            # goes to the client and reports the error to its caller.
+            self._invalidate(key)
+
+    async def _write_many(
+        self,
+        values: dict[str, Any],
+        timeout: Optional[float] = None,
+        background: bool = False,
+    ) -> dict[str, bool]:
+        """
+        Writes prefixed keys to the client in one call.
+        """
+        self._invalidate(*values)
+        try:
+            response = cast(
+                dict[str, bool],
+                await self._call(
+                    "set_many",
+                    {"values": {key: self._pack(v) for key, v in values.items()}},
+                    timeout,
+                    background,
+                ),
+            )
+        finally:
+            self._invalidate(*values)
+        self._index_changed({key: True for key in values if response.get(key)})
+        return response
+
+    async def _delete_many(
+        self,
+        keys: list[str],
+        timeout: Optional[float] = None,
+        background: bool = False,
+    ) -> dict[str, bool]:
+        """
+        Removes prefixed keys from the client in one call.
+        """
+        self._invalidate(*keys)
+        try:
+            response = cast(
+                dict[str, bool],
+                await self._call("remove_many", {"keys": keys}, timeout, background),
+            )
+        finally:
+            self._invalidate(*keys)
+        self._index_changed({key: False for key in keys if response.get(key)})
+        return response
+
+    def _buffered(self, key: str) -> tuple[bool, Any]:
+        """
+        Returns whether a write-behind change to a prefixed key is pending,
+        and the pending value (None for a pending remove).
+        """
+        if self._write_buffer is None:
+            return False, None
+        found, value = self._write_buffer.lookup(key)
+        return found, None if value is REMOVED else value
 
-        response: dict[str, str] = cast(
-            dict[str, str], await self._invoke_method("get_keys")
+    async def _buffer(self, changes: dict[str, Any]) -> None:
+        """
+        Adds changes to the write-behind buffer and flushes it once full.
+        """
+        assert self._write_buffer is not None and self._write_behind is not None
+        self._raise_flush_error()
+        for key, value in changes.items():
+            self._write_buffer.put(key, value)
+        self._invalidate(*changes)
+        self._index_changed(
+            {key: value is not REMOVED for key, value in changes.items()}
         )
 
-        return [
-            f"{key}:{value}"
-            for key, value in response.items()
-            if key.startswith(key_prefix)
-        ]
+        if len(self._write_buffer) >= self._write_behind.max_pending:
+            await self.flush()
+        elif self._flush_timer is None:
+            self._flush_timer = asyncio.get_running_loop().call_later(
+                self._write_behind.flush_interval, self._start_background_flush
+            )
+
+    def _start_background_flush(self) -> None:
+        self._flush_timer = None
+        task = asyncio.create_task(self._background_flush())
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def _background_flush(self) -> None:
+        try:
+            await self._flush()
+        except SecureStorageFlushError as exc:
+            if self._unmounted:
+                # There may be no next call to report it to
+                self._warn_unflushed(exc.failed_writes, exc.failed_removes)
+            else:
+                # Reported by the next set/remove/flush call
+                self._flush_error = exc
+
+    def _raise_flush_error(self) -> None:
+        error, self._flush_error = self._flush_error, None
+        if error is not None:
+            raise error
+
+    async def _flush(self, timeout: Optional[float] = None) -> None:
+        if self._write_buffer is None:
+            return
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+
+        async with self._flush_lock:
+            writes, removes = self._write_buffer.drain()
+            try:
+                written = (
+                    await self._write_many(writes, timeout, background=True)
+                    if writes
+                    else {}
+                )
+                removed = (
+                    await self._delete_many(removes, timeout, background=True)
+                    if removes
+                    else {}
+                )
+            except asyncio.CancelledError:
+                # The changes may not have reached the client; keep them for
+                # the next flush instead of dropping them.
+                self._write_buffer.restore()
+                raise
+            except Exception as exc:
+                self.reset_index()
+                raise SecureStorageFlushError(
+                    f"Failed to flush buffered changes: {exc}", writes, removes
+                ) from exc
+            finally:
+                self._write_buffer.done()
 
-    async def clear(self) -> bool:
+        failed_writes = {key: writes[key] for key in writes if not written.get(key)}
+        failed_removes = [key for key in removes if not removed.get(key)]
+        if failed_writes or failed_removes:
+            self.reset_index()
+            raise SecureStorageFlushError(
+                "The client rejected buffered changes for keys: "
+                f"{', '.join([*failed_writes, *failed_removes])}",
+                failed_writes,
+                failed_removes,
+            )
+
+    async def flush(self, timeout: Optional[float] = None) -> None:
         """
-        Clears all data from secure storage.
-        From flutter_secure_storage: storage.deleteAll
+        Sends every change buffered in write-behind mode to the client.
+        Does nothing when write-behind mode is not enabled.
+
+        Args:
+            timeout (Optional[float]): Seconds to wait for the client. Uses
+                `default_timeout` when None.
+
+        Raises:
+            SecureStorageFlushError: If the buffered changes, or a previous
+                background flush, could not be written or timed out.
+        """
+        await self._flush(timeout)
+        self._raise_flush_error()
+
+    def transaction(self, timeout: Optional[float] = None) -> SecureStorageTransaction:
+        """
+        Returns a transaction that stages writes and removes and commits them
+        together, in one call to the client, when its `async with` block exits.
+
+        Args:
+            timeout (Optional[float]): Seconds to wait for the client when
+                committing. Uses `default_timeout` when None.
 
         Returns:
-            bool: True if the storage was cleared successfully, False otherwise.
+            SecureStorageTransaction: The transaction, to use with `async with`.
+
+        Example:
+            ```python
+            async with storage.transaction() as tx:
+                tx.set("access_token", access)
+                tx.set("refresh_token", refresh)
+                tx.remove("expired_at")
+            ```
+        """
+        return SecureStorageTransaction(self, timeout)
+
+    def _journal_limit(self) -> Optional[int]:
+        """
+        Returns the largest transaction, in bytes, the client can store as one
+        journal value, or None when it has no lower limit than the store.
+        """
+        backend = self._backend
+        if isinstance(backend, HashedKeyBackend):
+            backend = backend.backend
+        if isinstance(backend, FlutterBackend) and self._active_platform() == (
+            "w_options"
+        ):
+            return _WINDOWS_JOURNAL_BYTES
+        return None
+
+    async def _commit(
+        self, writes: dict[str, Any], removes: list[str], timeout: Optional[float]
+    ) -> None:
+        """
+        Applies the prefixed keys of a transaction in one call to the client.
+        """
+        limit = self._journal_limit()
+        if limit is not None:
+            size = sum(_journal_size(key, value) for key, value in writes.items())
+            size += sum(_journal_size(key, REMOVED) for key in removes)
+            if size > limit:
+                raise SecureStorageTransactionError(
+                    f"The transaction is about {size} bytes, more than the "
+                    f"{limit} bytes the client can store on this platform; "
+                    "nothing was changed."
+                )
+        if self._write_buffer is not None:
+            # Buffered changes must not overwrite the transaction when flushed later
+            await self._flush(timeout)
+        keys = [*writes, *removes]
+        self._invalidate(*keys)
+        try:
+            response = cast(
+                Optional[dict[str, bool]],
+                await self._call(
+                    "commit",
+                    {
+                        "writes": {key: self._pack(v) for key, v in writes.items()},
+                        "removes": removes,
+                    },
+                    timeout,
+                ),
+            )
+        finally:
+            self._invalidate(*keys)
+        response = response or {}
+        if not response.get("committed"):
+            raise SecureStorageTransactionError(
+                "The client could not store the transaction; nothing was changed."
+            )
+        if not response.get("applied"):
+            self.reset_index()
+            raise SecureStorageTransactionError(
+                "The transaction was stored but not fully applied; the client "
+                "completes it the next time it starts."
+            )
+        self._index_changed(
+            {**{key: True for key in writes}, **{key: False for key in removes}}
+        )
+
+    async def export_snapshot(
+        self,
+        key_prefix: Optional[str] = None,
+        progress: Optional[Callable[[int, int], None]] = None,
+        page_size: int = 1000,
+        timeout: Optional[float] = None,
+    ) -> bytes:
+        """
+        Exports the keys that start with a prefix, and their values, as one
+        compressed snapshot for `import_snapshot`.
+
+        Without `progress` the values are read in a single call to the client.
+        With it, they are read `page_size` keys at a time and `progress(done,
+        total)` is called after every page.
+
+        Args:
+            key_prefix (Optional[str]): The prefix of the keys to export. Uses the
+                `prefix=` option when empty.
+            progress (Optional[Callable[[int, int], None]]): Called with the
+                number of keys exported so far and the total.
+            page_size (int): The number of keys read per call when reporting progress.
+            timeout (Optional[float]): Seconds to wait for each call to the
+                client. Uses `default_timeout` when None.
+
+        Returns:
+            bytes: The snapshot. It holds the values unencrypted, so store it
+                somewhere safe.
+        """
+        self._validate_positive("page_size", page_size)
+        prefix = self._resolve_key_prefix(key_prefix)
+        # Buffered changes are part of the snapshot
+        await self.flush(timeout)
+        if progress is None:
+            items = self._unpack_items(
+                await self._call("items", {"prefix": prefix}, timeout)
+            )
+            return encode_snapshot(prefix, items)
+
+        total = cast(int, await self._call("count", {"prefix": prefix}, timeout))
+        items = {}
+        cursor: Optional[str] = None
+        progress(0, total)
+        while True:
+            page = await self.scan(
+                prefix, cursor, page_size, include_values=True, timeout=timeout
+            )
+            items.update(page.items)
+            progress(len(items), max(total, len(items)))
+            if page.cursor is None:
+                break
+            cursor = page.cursor
+        return encode_snapshot(prefix, items)
+
+    async def import_snapshot(
+        self,
+        data: bytes,
+        mode: str = "merge",
+        progress: Optional[Callable[[int, int], None]] = None,
+        batch_size: int = 500,
+        timeout: Optional[float] = None,
+        batch_bytes: Optional[int] = None,
+        replace_all: bool = False,
+    ) -> int:
+        """
+        Writes the keys and values of a snapshot made by `export_snapshot`.
+
+        The changes are sent as transactions of at most `batch_size` keys (see
+        `transaction`), so a snapshot that fits in one batch is applied in a
+        single call and either fully or not at all. The client stores each
+        batch as one value while applying it, so on Windows, where that value
+        is limited to 2560 bytes, batches are also kept to about 2048 bytes.
+
+        Args:
+            data (bytes): The snapshot.
+            mode (str): `merge` keeps keys that are not in the snapshot; `replace`
+                removes the keys under the snapshot's prefix that are not in it.
+            progress (Optional[Callable[[int, int], None]]): Called with the
+                number of keys applied so far and the total after every batch.
+            batch_size (int): The maximum number of keys written or removed per
+                call.
+            timeout (Optional[float]): Seconds to wait for each call to the
+                client. Uses `default_timeout` when None.
+            batch_bytes (Optional[int]): The approximate maximum size of a
+                batch, in bytes of JSON. A value larger than that is sent in a
+                batch of its own. Uses the limit of the client's platform when
+                None, which is no limit except on Windows.
+            replace_all (bool): Must be True to `replace` with a snapshot that
+                has no prefix, which removes every key of the store that is not
+                in the snapshot.
+
+        Returns:
+            int: The number of keys written.
+
+        Raises:
+            SecureStorageSnapshotError: If `data` is not a valid snapshot.
+            SecureStorageTransactionError: If the client did not apply a batch.
+                Earlier batches are kept.
+            ValueError: If `mode` is `replace`, the snapshot has no prefix and
+                `replace_all` is False.
+        """
+        if mode not in ("merge", "replace"):
+            raise ValueError(f"Invalid mode: {mode!r}. Expected 'merge' or 'replace'.")
+        self._validate_positive("batch_size", batch_size)
+        if batch_bytes is None:
+            batch_bytes = self._journal_limit()
+        else:
+            self._validate_positive("batch_bytes", batch_bytes)
+        prefix, items = decode_snapshot(data)
+        if prefix and prefix == self.prefix:
+            # Snapshots of older versions hold the prefix without its separator
+            prefix = self._own_prefix()
+        if mode == "replace" and not prefix and not replace_all:
+            raise ValueError(
+                "The snapshot has no prefix, so 'replace' would remove every key "
+                "that is not in it. Pass replace_all=True to do so."
+            )
+        await self.flush(timeout)
+
+        changes: list[tuple[str, Any]] = list(items.items())
+        if mode == "replace":
+            existing = cast(
+                list[str], await self._call("list_keys", {"prefix": prefix}, timeout)
+            )
+            changes.extend((key, REMOVED) for key in existing if key not in items)
+
+        total = len(changes)
+        done = 0
+        for batch in self._snapshot_batches(changes, batch_size, batch_bytes):
+            await self._commit(
+                {key: value for key, value in batch if value is not REMOVED},
+                [key for key, value in batch if value is REMOVED],
+                timeout,
+            )
+            done += len(batch)
+            if progress is not None:
+                progress(done, total)
+        return len(items)
+
+    @staticmethod
+    def _snapshot_batches(
+        changes: list[tuple[str, Any]], batch_size: int, batch_bytes: Optional[int]
+    ) -> Iterator[list[tuple[str, Any]]]:
+        """
+        Splits the changes of an import into batches of at most `batch_size`
+        keys and, when `batch_bytes` is set and unless a single change is
+        larger, about `batch_bytes` bytes of the journal the client stores.
+        """
+        batch: list[tuple[str, Any]] = []
+        size = 0
+        for key, value in changes:
+            change = _journal_size(key, value) if batch_bytes is not None else 0
+            full = batch_bytes is not None and size + change > batch_bytes
+            if batch and (len(batch) == batch_size or full):
+                yield batch
+                batch, size = [], 0
+            batch.append((key, value))
+            size += change
+        if batch:
+            yield batch
+
+    def namespace(self, name: str) -> SecureStorageNamespace:
+        """
+        Returns a view that scopes keys by `name`, sharing this service instead
+        of adding another `SecureStorage` to `page.services`.
+
+        Args:
+            name (str): The namespace, joined to keys with `prefix_separator`.
+                Call `namespace()` on the view to nest namespaces.
+
+        Returns:
+            SecureStorageNamespace: The view of the namespace.
+
+        Example:
+            `storage.namespace("billing").set("card", ...)` stores `billing.card`.
+        """
+        return SecureStorageNamespace(self, name)
+
+    async def set(self, key: str, value: Any, timeout: Optional[float] = None) -> bool:
+        """
+        Sets a value in secure storage.
+        From flutter_secure_storage: storage.write
+
+        Args:
+            key (str): key name, used to retrieve the value
+            value (Any): value to store
+            timeout (Optional[float]): Seconds to wait for the client. Uses
+                `default_timeout` when None.
+
+        Returns:
+            bool: True if the value was stored successfully, False otherwise
+        """
+        key = self._storage_key(key)
+        if self._write_buffer is not None:
+            await self._buffer({key: value})
+            return True
+        self._invalidate(key)
+        try:
+            result = cast(
+                bool,
+                await self._call(
+                    "set", {"key": key, "value": self._pack(value)}, timeout
+                ),
+            )
+        finally:
+            self._invalidate(key)
+        if result:
+            self._index_changed({key: True})
+        return result
+
+    async def get(self, key: str, timeout: Optional[float] = None) -> Optional[str]:
+        """
+        Retrieves a value from secure storage.
+        From flutter_secure_storage: storage.read
+
+        Args:
+            key (str): The key to retrieve the value for.
+            timeout (Optional[float]): Seconds to wait for the client. Uses
+                `default_timeout` when None.
+
+        Returns:
+            Optional[str]: The value associated with the key as a string, or None if not found.
+        """
+        return await self._get_prefixed(self._storage_key(key), timeout)
+
+    async def _get_prefixed(
+        self, key: str, timeout: Optional[float] = None
+    ) -> Optional[str]:
+        found, pending = self._buffered(key)
+        if found:
+            return cast(Optional[str], pending)
+        if self._cache is not None:
+            state, value = self._cache.lookup(key)
+            if state is CacheState.FRESH:
+                return value
+            if state is CacheState.STALE:
+                self._schedule_refresh(key)
+                return value
+        return await self._single_flight(
+            "get", key, lambda: self._fetch(key, timeout), timeout
+        )
+
+    async def contains_key(self, key: str, timeout: Optional[float] = None) -> bool:
+        """
+        Checks if a key exists in secure storage.
+        From flutter_secure_storage: storage.containsKey
+
+        Args:
+            key (str): The key to check for existence.
+            timeout (Optional[float]): Seconds to wait for the client. Uses
+                `default_timeout` when None.
+
+        Returns:
+            bool: True if the key exists, False otherwise.
+        """
+        key = self._storage_key(key)
+        found, pending = self._buffered(key)
+        if found:
+            return pending is not None
+        if self._index is not None:
+            return (await self._loaded_index(timeout)).contains(key)
+        if self._cache is not None:
+            state, exists = self._cache.lookup_exists(key)
+            if state is CacheState.FRESH:
+                return exists
+            if state is CacheState.STALE:
+                self._schedule_refresh(key)
+                return exists
+        return await self._single_flight(
+            "contains_key", key, lambda: self._fetch_exists(key, timeout), timeout
+        )
+
+    async def remove(self, key: str, timeout: Optional[float] = None) -> bool:
+        """
+        Deletes a key from the secure storage.
+        From flutter_secure_storage: storage.delete
+
+        Args:
+            key (str): The key to delete.
+            timeout (Optional[float]): Seconds to wait for the client. Uses
+                `default_timeout` when None.
+
+        Returns:
+            bool: True if the key was deleted successfully, False otherwise.
+        """
+        key = self._storage_key(key)
+        if self._write_buffer is not None:
+            await self._buffer({key: REMOVED})
+            return True
+        self._invalidate(key)
+        try:
+            result = cast(bool, await self._call("remove", {"key": key}, timeout))
+        finally:
+            self._invalidate(key)
+        if result:
+            self._index_changed({key: False})
+        return result
+
+    async def get_keys(
+        self, key_prefix: str = "", timeout: Optional[float] = None
+    ) -> list[str]:
+        """
+        Retrieves all keys from secure storage.
+        From flutter_secure_storage: storage.readAll
+
+        Args:
+            key_prefix (str): The prefix to filter keys by.
+            timeout (Optional[float]): Seconds to wait for the client. Uses
+                `default_timeout` when None.
+
+        Returns:
+            list[str]: Returns a list of keys [<key_prefix>:<value>] of the values
+                       that match the key_prefix or all keys if the user enters and
+                       empty string or None
+        """
+        key_prefix = self._resolve_key_prefix(key_prefix)
+        response = await self._single_flight(
+            "get_keys",
+            key_prefix,
+            lambda: cast(
+                Awaitable[dict[str, str]],
+                self._call("get_keys", {"prefix": key_prefix}, timeout),
+            ),
+            timeout,
+        )
+        response = self._unpack_items(response)
+        response = self._overlay_items(response, key_prefix)
+
+        return [
+            f"{key}:{value}"
+            for key, value in response.items()
+            if key.startswith(key_prefix)
+        ]
+
+    async def list_keys(
+        self, key_prefix: str = "", timeout: Optional[float] = None
+    ) -> list[str]:
+        """
+        Retrieves the keys that start with a prefix, without their values.
+        The keys are filtered on the client, so only matching keys are sent back.
+
+        Args:
+            key_prefix (str): The prefix to filter keys by. Uses the `prefix=`
+                option when empty.
+            timeout (Optional[float]): Seconds to wait for the client. Uses
+                `default_timeout` when None.
+
+        Returns:
+            list[str]: The matching keys.
+        """
+        key_prefix = self._resolve_key_prefix(key_prefix)
+        if self._index is not None:
+            return list((await self._loaded_index(timeout)).keys(key_prefix))
+        keys = cast(
+            list[str],
+            await self._call("list_keys", {"prefix": key_prefix}, timeout),
+        )
+        if self._write_buffer is None:
+            return keys
+        pending = self._pending_changes(key_prefix)
+        listed = [key for key in keys if key not in pending]
+        listed.extend(key for key, value in pending.items() if value is not REMOVED)
+        return listed
+
+    async def count(self, key_prefix: str = "", timeout: Optional[float] = None) -> int:
+        """
+        Counts the keys that start with a prefix. Only the count is sent back
+        from the client.
+
+        Args:
+            key_prefix (str): The prefix to filter keys by. Uses the `prefix=`
+                option when empty.
+            timeout (Optional[float]): Seconds to wait for the client. Uses
+                `default_timeout` when None.
+
+        Returns:
+            int: The number of matching keys.
+        """
+        key_prefix = self._resolve_key_prefix(key_prefix)
+        if self._index is not None:
+            return (await self._loaded_index(timeout)).count(key_prefix)
+        if self._pending_changes(key_prefix):
+            # Buffered changes may or may not exist on the client already
+            return len(await self.list_keys(key_prefix, timeout))
+        return cast(int, await self._call("count", {"prefix": key_prefix}, timeout))
+
+    async def list_children(
+        self, path: str = "", timeout: Optional[float] = None
+    ) -> list[str]:
+        """
+        Lists the key segments directly below a path, like a directory listing.
+        Segments are split by `prefix_separator` (or `.` when there is no prefix).
+
+        Uses the key index when `index_keys=True`, otherwise lists the keys
+        below the path from the client.
+
+        Args:
+            path (str): Whole key segments joined by the separator. Uses the
+                `prefix=` option when empty.
+            timeout (Optional[float]): Seconds to wait for the client. Uses
+                `default_timeout` when None.
+
+        Returns:
+            list[str]: The sorted child segments.
+
+        Example:
+            With the keys `user.a.x`, `user.a.y` and `user.b`,
+            `list_children("user")` returns `["a", "b"]`.
+        """
+        path = self._resolve_key_prefix(path)
+        if path == self._own_prefix():
+            # Whole segments, so the instance prefix without its separator
+            path = self.prefix
+        if self._index is not None:
+            return (await self._loaded_index(timeout)).children(path)
+        keys = await self.list_keys(
+            f"{path}{self._hierarchy_separator}" if path else "", timeout
+        )
+        return KeyIndex(self._hierarchy_separator, keys).children(path)
+
+    async def items(
+        self, key_prefix: str = "", timeout: Optional[float] = None
+    ) -> dict[str, str]:
+        """
+        Retrieves the keys that start with a prefix, and their values.
+        The keys are filtered on the client, so only matching items are sent back.
+
+        Args:
+            key_prefix (str): The prefix to filter keys by. Uses the `prefix=`
+                option when empty.
+            timeout (Optional[float]): Seconds to wait for the client. Uses
+                `default_timeout` when None.
+
+        Returns:
+            dict[str, str]: The matching keys mapped to their values.
+        """
+        key_prefix = self._resolve_key_prefix(key_prefix)
+        response = cast(
+            dict[str, str],
+            await self._call("items", {"prefix": key_prefix}, timeout),
+        )
+        response = self._unpack_items(response)
+        return self._overlay_items(response, key_prefix)
+
+    async def scan(
+        self,
+        key_prefix: str = "",
+        start_after: Optional[str] = None,
+        limit: int = 100,
+        include_values: bool = False,
+        timeout: Optional[float] = None,
+    ) -> ScanPage:
+        """
+        Retrieves one page of the keys that start with a prefix, in sorted order.
+        Sorting and paging happen on the client, so only one page is sent back.
+
+        Args:
+            key_prefix (str): The prefix to filter keys by. Uses the `prefix=`
+                option when empty.
+            start_after (Optional[str]): The `cursor` of the previous page,
+                or None for the first page.
+            limit (int): The maximum number of keys in the page.
+            include_values (bool): Also return the values of the keys in `items`.
+            timeout (Optional[float]): Seconds to wait for the client. Uses
+                `default_timeout` when None.
+
+        Returns:
+            ScanPage: The keys of the page, their values if requested, and the
+                cursor of the next page.
+        """
+        if not isinstance(limit, int) or limit < 1:
+            raise ValueError("limit must be a positive integer.")
+        key_prefix = self._resolve_key_prefix(key_prefix)
+        response = cast(
+            dict[str, Any],
+            await self._call(
+                "scan",
+                {
+                    "prefix": key_prefix,
+                    "start_after": start_after,
+                    "limit": limit,
+                    "values": include_values,
+                },
+                timeout,
+            ),
+        )
+        page = ScanPage(
+            keys=list(response.get("keys") or []),
+            items=self._unpack_items(response.get("items") or {}),
+            cursor=response.get("cursor"),
+        )
+
+        pending = {
+            key: value
+            for key, value in self._pending_changes(key_prefix).items()
+            if (start_after is None or key > start_after)
+            and (page.cursor is None or key <= page.cursor)
+        }
+        if pending:
+            keys = set(page.keys)
+            for key, value in pending.items():
+                if value is REMOVED:
+                    keys.discard(key)
+                    page.items.pop(key, None)
+                else:
+                    keys.add(key)
+                    if include_values:
+                        page.items[key] = value
+            page.keys = sorted(keys)
+        return page
+
+    async def iter_items(
+        self,
+        key_prefix: str = "",
+        page_size: int = 100,
+        timeout: Optional[float] = None,
+    ) -> AsyncIterator[tuple[str, str]]:
+        """
+        Iterates over the keys that start with a prefix and their values,
+        fetching one page of `page_size` keys at a time.
+
+        Args:
+            key_prefix (str): The prefix to filter keys by. Uses the `prefix=`
+                option when empty.
+            page_size (int): The number of keys fetched per call to the client.
+            timeout (Optional[float]): Seconds to wait for each page. Uses
+                `default_timeout` when None.
+
+        Yields:
+            tuple[str, str]: Each matching key and its value, in sorted order.
+        """
+        cursor: Optional[str] = None
+        while True:
+            page = await self.scan(
+                key_prefix,
+                start_after=cursor,
+                limit=page_size,
+                include_values=True,
+                timeout=timeout,
+            )
+            for key in page.keys:
+                yield key, page.items[key]
+            if page.cursor is None:
+                return
+            cursor = page.cursor
+
+    def _resolve_key_prefix(self, key_prefix: str | None) -> str:
+        """
+        Returns the prefixed form of a key prefix used to filter listings.
+        """
+        if key_prefix is None or key_prefix.strip() == "":
+            return self._own_prefix()
+        if (
+            key_prefix == self.prefix
+            or key_prefix == f"{self.prefix}{self.prefix_separator}"
+        ):
+            return self._own_prefix()
+        return add_prefix(self.prefix, self.prefix_separator, key_prefix)
+
+    def _own_prefix(self) -> str:
+        """
+        Returns the prefix shared by the keys of this instance, ending with
+        the separator so that prefix "app" does not match the "apple" keys.
+        """
+        if self.prefix == "":
+            return ""
+        return f"{self.prefix}{self.prefix_separator}"
+
+    def _pending_changes(self, key_prefix: str) -> dict[str, Any]:
+        """
+        Returns the buffered write-behind changes to keys starting with `key_prefix`.
+        """
+        if self._write_buffer is None:
+            return {}
+        return {
+            key: value
+            for key, value in self._write_buffer.changes().items()
+            if key.startswith(key_prefix)
+        }
+
+    def _overlay_items(self, items: dict[str, str], key_prefix: str) -> dict[str, str]:
+        """
+        Applies buffered write-behind changes to items read from the client.
+        """
+        pending = self._pending_changes(key_prefix)
+        if not pending:
+            return items
+        items = dict(items)
+        for key, value in pending.items():
+            if value is REMOVED:
+                items.pop(key, None)
+            else:
+                items[key] = value
+        return items
+
+    async def clear(self, timeout: Optional[float] = None) -> bool:
+        """
+        Clears all data from secure storage, or only the keys of this instance
+        when a `prefix` is set (see `clear_prefix`).
+        From flutter_secure_storage: storage.deleteAll
+
+        Args:
+            timeout (Optional[float]): Seconds to wait for the client. Uses
+                `default_timeout` when None.
+
+        Returns:
+            bool: True if the storage was cleared successfully, False otherwise.
+        """
+        if self.prefix:
+            await self.clear_prefix("", timeout)
+            return True
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        async with self._flush_lock:
+            if self._write_buffer is not None:
+                self._write_buffer.clear()
+            self._clear_local()
+            try:
+                return cast(bool, await self._call("clear", None, timeout))
+            finally:
+                self._clear_local()
+
+    async def clear_prefix(
+        self, key_prefix: str, timeout: Optional[float] = None
+    ) -> int:
+        """
+        Deletes the keys that start with a prefix. The keys are deleted on the
+        client in a single call.
+
+        Args:
+            key_prefix (str): The prefix of the keys to delete. Deletes the keys
+                of this instance's `prefix=` option when empty.
+            timeout (Optional[float]): Seconds to wait for the client. Uses
+                `default_timeout` when None.
+
+        Raises:
+            ValueError: If `key_prefix` is empty and no `prefix=` option is set.
+                Use `clear` to delete every key.
+
+        Returns:
+            int: The number of keys deleted on the client.
+        """
+        if key_prefix is None or key_prefix.strip() == "":
+            if self.prefix == "":
+                raise ValueError(
+                    "key_prefix cannot be empty without a prefix. Use clear() instead."
+                )
+        key_prefix = self._resolve_key_prefix(key_prefix)
+
+        if self._index is not None:
+            await self._loaded_index(timeout)
+        async with self._flush_lock:
+            if self._write_buffer is not None:
+                self._write_buffer.clear(key_prefix)
+            self._clear_local(key_prefix)
+            try:
+                return cast(
+                    int,
+                    await self._call("clear_prefix", {"prefix": key_prefix}, timeout),
+                )
+            finally:
+                self._clear_local(key_prefix)
+
+    async def set_many(
+        self, values: Mapping[str, Any], timeout: Optional[float] = None
+    ) -> dict[str, bool]:
+        """
+        Sets multiple values in secure storage with a single call to the client.
+        From flutter_secure_storage: storage.write
+
+        Args:
+            values (Mapping[str, Any]): key names mapped to the values to store
+            timeout (Optional[float]): Seconds to wait for the client. Uses
+                `default_timeout` when None.
+
+        Returns:
+            dict[str, bool]: Each key mapped to True if its value was stored
+                successfully, False otherwise
+        """
+        if not isinstance(values, Mapping):
+            raise ValueError(f"Values must be a mapping. Got {type(values)} instead.")
+        keys = self._storage_keys(values)
+        storage_values = {key: values[orig] for key, orig in keys.items()}
+        if self._write_buffer is not None:
+            await self._buffer(storage_values)
+            return {orig: True for orig in keys.values()}
+        response = await self._write_many(storage_values, timeout)
+        return {orig: bool(response.get(key)) for key, orig in keys.items()}
+
+    async def get_many(
+        self, keys: Iterable[str], timeout: Optional[float] = None
+    ) -> dict[str, Optional[str]]:
+        """
+        Retrieves multiple values from secure storage with a single call to the client.
+        From flutter_secure_storage: storage.read
+
+        Args:
+            keys (Iterable[str]): The keys to retrieve the values for.
+            timeout (Optional[float]): Seconds to wait for the client. Uses
+                `default_timeout` when None.
+
+        Returns:
+            dict[str, Optional[str]]: Each key mapped to its value, or None if not found.
+        """
+        storage_keys = self._storage_keys(keys)
+        values: dict[str, Optional[str]] = {}
+        missing: list[str] = []
+        for key in storage_keys:
+            found, pending = self._buffered(key)
+            if found:
+                values[key] = pending
+                continue
+            if self._cache is not None:
+                state, value = self._cache.lookup(key)
+                if state is not CacheState.MISS:
+                    if state is CacheState.STALE:
+                        self._schedule_refresh(key)
+                    values[key] = value
+                    continue
+            missing.append(key)
+
+        if missing:
+            token = self._cache.begin() if self._cache is not None else 0
+            response = cast(
+                dict[str, Optional[str]],
+                await self._call("get_many", {"keys": missing}, timeout),
+            )
+            for key in missing:
+                values[key] = self._unpack(response.get(key))
+                if self._cache is not None:
+                    self._cache.store(key, values[key], token)
+        return {orig: values[key] for key, orig in storage_keys.items()}
+
+    async def contains_many(
+        self, keys: Iterable[str], timeout: Optional[float] = None
+    ) -> dict[str, bool]:
+        """
+        Checks if multiple keys exist in secure storage. Keys answered by the
+        key index or the cache are not sent; the rest go in a single call to
+        the client.
+        From flutter_secure_storage: storage.containsKey
+
+        Args:
+            keys (Iterable[str]): The keys to check for existence.
+            timeout (Optional[float]): Seconds to wait for the client. Uses
+                `default_timeout` when None.
+
+        Returns:
+            dict[str, bool]: Each key mapped to True if it exists, False otherwise.
+        """
+        storage_keys = self._storage_keys(keys)
+        exists: dict[str, bool] = {}
+        missing: list[str] = []
+        for key in storage_keys:
+            found, pending = self._buffered(key)
+            if found:
+                exists[key] = pending is not None
+                continue
+            if self._index is not None:
+                exists[key] = (await self._loaded_index(timeout)).contains(key)
+                continue
+            if self._cache is not None:
+                state, cached = self._cache.lookup_exists(key)
+                if state is not CacheState.MISS:
+                    if state is CacheState.STALE:
+                        self._schedule_refresh(key)
+                    exists[key] = cached
+                    continue
+            missing.append(key)
+
+        if missing:
+            token = self._cache.begin() if self._cache is not None else 0
+            response = cast(
+                dict[str, bool],
+                await self._call("contains_many", {"keys": missing}, timeout),
+            )
+            for key in missing:
+                exists[key] = bool(response.get(key))
+                if self._cache is not None:
+                    self._cache.store_exists(key, exists[key], token)
+        return {orig: exists[key] for key, orig in storage_keys.items()}
+
+    async def remove_many(
+        self, keys: Iterable[str], timeout: Optional[float] = None
+    ) -> dict[str, bool]:
+        """
+        Deletes multiple keys from secure storage with a single call to the client.
+        From flutter_secure_storage: storage.delete
+
+        Args:
+            keys (Iterable[str]): The keys to delete.
+            timeout (Optional[float]): Seconds to wait for the client. Uses
+                `default_timeout` when None.
+
+        Returns:
+            dict[str, bool]: Each key mapped to True if it was deleted successfully,
+                False otherwise.
+        """
+        storage_keys = self._storage_keys(keys)
+        if self._write_buffer is not None:
+            await self._buffer({key: REMOVED for key in storage_keys})
+            return {orig: True for orig in storage_keys.values()}
+        response = await self._delete_many(list(storage_keys), timeout)
+        return {orig: bool(response.get(key)) for key, orig in storage_keys.items()}
+
+    @staticmethod
+    def _validate_positive(name: str, value: int) -> None:
+        if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+            raise ValueError(f"{name} must be a positive integer.")
+
+    async def _read_manifest(
+        self, key: str, timeout: Optional[float] = None
+    ) -> Optional[BlobManifest]:
+        try:
+            return BlobManifest.from_json(await self.get(key, timeout))
+        except (KeyError, TypeError, ValueError) as exc:
+            raise SecureStorageBlobError(f"Invalid blob manifest for {key!r}.") from exc
+
+    async def _write_chunks(
+        self,
+        storage_key: str,
+        blob_id: str,
+        first: int,
+        pieces: list[bytes],
+        timeout: Optional[float] = None,
+    ) -> None:
+        """
+        Writes a window of chunks with one concurrent call per chunk.
+        """
+        results = await asyncio.gather(
+            *(
+                self._write_many(
+                    {
+                        chunk_key(storage_key, blob_id, first + offset): (
+                            base64.b64encode(piece).decode("ascii")
+                        )
+                    },
+                    timeout,
+                )
+                for offset, piece in enumerate(pieces)
+            )
+        )
+        failed = [key for result in results for key, ok in result.items() if not ok]
+        if failed:
+            raise SecureStorageBlobError(f"Could not write blob chunks: {failed}")
+
+    async def _delete_chunks(
+        self, keys: list[str], window: int, timeout: Optional[float] = None
+    ) -> None:
+        for start in range(0, len(keys), window):
+            end = start + window
+            await self._delete_many(keys[start:end], timeout)
+
+    async def write_blob(
+        self,
+        key: str,
+        data: BlobData,
+        chunk_size: Optional[int] = None,
+        window: int = _BLOB_WINDOW,
+        timeout: Optional[float] = None,
+    ) -> bool:
+        """
+        Stores a large binary value across numbered chunk keys, for platforms with
+        per-entry size limits and to avoid one large call to the client.
+
+        The data is read and written one window of chunks at a time. The manifest
+        stored under `key` is replaced only once every chunk is written, so
+        readers see either the old or the new blob.
+
+        Args:
+            key (str): key name, used to read the blob with `read_blob`
+            data (BlobData): bytes, or an iterable or async iterable of bytes
+            chunk_size (Optional[int]): The number of bytes stored per chunk key,
+                before base64 encoding. Uses `blob_chunk_size` when None. Keep
+                it below the per-entry limit of every platform the app runs on.
+            window (int): The number of chunks held in memory and written
+                concurrently.
+            timeout (Optional[float]): Seconds to wait for each call to the
+                client. Uses `default_timeout` when None.
+
+        Raises:
+            SecureStorageBlobError: If a chunk or the manifest could not be written.
+
+        Returns:
+            bool: True once the blob is stored.
+        """
+        if chunk_size is None:
+            chunk_size = self.blob_chunk_size
+        self._validate_positive("chunk_size", chunk_size)
+        self._validate_positive("window", window)
+        storage_key = self._storage_key(key)
+        previous = await self._read_manifest(key, timeout)
+        blob_id = secrets.token_hex(8)
+        digest = hashlib.sha256()
+        size = chunks = 0
+        pending: list[bytes] = []
+        try:
+            async for piece in rechunk(data, chunk_size):
+                digest.update(piece)
+                size += len(piece)
+                pending.append(piece)
+                if len(pending) == window:
+                    await self._write_chunks(
+                        storage_key, blob_id, chunks, pending, timeout
+                    )
+                    chunks += len(pending)
+                    pending = []
+            if pending:
+                await self._write_chunks(storage_key, blob_id, chunks, pending, timeout)
+                chunks += len(pending)
+                pending = []
+            manifest = BlobManifest(blob_id, size, chunks, digest.hexdigest())
+            if not await self.set(key, manifest.to_json(), timeout):
+                raise SecureStorageBlobError(f"Could not write blob manifest {key!r}.")
+            if self._write_buffer is not None:
+                await self.flush(timeout)
+        except Exception:
+            # Drop the chunks of the unfinished blob; the previous one is untouched.
+            written = BlobManifest(blob_id, size, chunks + len(pending), "")
+            with contextlib.suppress(Exception):
+                await self._delete_chunks(
+                    written.chunk_keys(storage_key), window, timeout
+                )
+            raise
+
+        if previous is not None:
+            await self._delete_chunks(previous.chunk_keys(storage_key), window, timeout)
+        return True
+
+    async def read_blob(
+        self, key: str, window: int = _BLOB_WINDOW, timeout: Optional[float] = None
+    ) -> AsyncIterator[bytes]:
+        """
+        Reads a blob stored with `write_blob`, one window of chunks at a time.
+
+        Args:
+            key (str): The key the blob was stored under.
+            window (int): The number of chunks fetched concurrently and held in memory.
+            timeout (Optional[float]): Seconds to wait for each call to the
+                client. Uses `default_timeout` when None.
+
+        Raises:
+            KeyError: If no blob is stored under `key`.
+            SecureStorageBlobError: If a chunk is missing or the blob does not
+                match its checksum.
+
+        Yields:
+            bytes: The chunks of the blob, in order.
+        """
+        self._validate_positive("window", window)
+        storage_key = self._storage_key(key)
+        manifest = await self._read_manifest(key, timeout)
+        if manifest is None:
+            raise KeyError(key)
+
+        digest = hashlib.sha256()
+        size = 0
+        keys = manifest.chunk_keys(storage_key)
+        for start in range(0, len(keys), window):
+            end = start + window
+            batch = keys[start:end]
+            values = await asyncio.gather(
+                *(self._call("get", {"key": chunk}, timeout) for chunk in batch)
+            )
+            for chunk, raw in zip(batch, values):
+                value = self._unpack(raw)
+                if value is None:
+                    raise SecureStorageBlobError(
+                        f"Chunk {chunk!r} of blob {key!r} is missing."
+                    )
+                piece = base64.b64decode(value)
+                digest.update(piece)
+                size += len(piece)
+                yield piece
+        if size != manifest.size or digest.hexdigest() != manifest.sha256:
+            raise SecureStorageBlobError(f"Blob {key!r} does not match its checksum.")
+
+    async def remove_blob(
+        self, key: str, window: int = _BLOB_WINDOW, timeout: Optional[float] = None
+    ) -> bool:
+        """
+        Deletes a blob stored with `write_blob` and its chunk keys.
+
+        Args:
+            key (str): The key the blob was stored under.
+            window (int): The number of chunk keys deleted per call to the client.
+            timeout (Optional[float]): Seconds to wait for each call to the
+                client. Uses `default_timeout` when None.
+
+        Returns:
+            bool: True if the blob was deleted successfully, False otherwise.
+        """
+        self._validate_positive("window", window)
+        manifest = await self._read_manifest(key, timeout)
+        result = await self.remove(key, timeout)
+        if self._write_buffer is not None:
+            await self.flush(timeout)
+        if result and manifest is not None:
+            await self._delete_chunks(
+                manifest.chunk_keys(self._storage_key(key)), window, timeout
+            )
+        return result
+
+    def _decode(self, key: str, raw: str, codec: ValueCodec[_T]) -> _T:
+        """
+        Decodes the raw value of a prefixed key, reusing the object decoded
+        last time if the raw value and codec did not change. Only immutable
+        objects are reused: callers may change the dicts, lists and other
+        objects they get, so those are decoded again on every read.
+        """
+        entry = self._decoded.get(key)
+        if entry is not None and entry[1] is codec and entry[0] == raw:
+            self._decoded.move_to_end(key)
+            return cast(_T, entry[2])
+
+        value = codec.decode(raw)
+        if not is_immutable(value):
+            self._forget_decoded(key)
+            return value
+        # Kept within the limits of the value cache, measured by the raw value
+        max_entries, max_bytes = _DECODED_MAX_ENTRIES, _DECODED_MAX_BYTES
+        if self._cache is not None:
+            max_entries = self._cache.options.max_entries
+            max_bytes = self._cache.options.max_bytes
+        size = len(key.encode()) + len(raw.encode())
+        self._forget_decoded(key)
+        if size > max_bytes:
+            return value
+        self._decoded[key] = (raw, codec, value)
+        self._decoded_bytes += size
+        while len(self._decoded) > max_entries or self._decoded_bytes > max_bytes:
+            self._forget_decoded(next(iter(self._decoded)))
+        return value
+
+    def _forget_decoded(self, key: str) -> None:
+        entry = self._decoded.pop(key, None)
+        if entry is not None:
+            self._decoded_bytes -= len(key.encode()) + len(entry[0].encode())
+
+    def _codec_for(self, value_type: type[_T] | ValueCodec[_T]) -> ValueCodec[_T]:
+        if isinstance(value_type, type):
+            return self.codecs.get(value_type)
+        if isinstance(value_type, ValueCodec):
+            return value_type
+        raise TypeError("Expected a type or a codec with encode() and decode().")
+
+    async def set_typed(
+        self,
+        key: str,
+        value: Any,
+        codec: ValueCodec[Any] | None = None,
+        timeout: Optional[float] = None,
+    ) -> bool:
+        """
+        Encodes a value with a codec and stores the result.
+
+        Args:
+            key (str): key name, used to retrieve the value
+            value (Any): value to store
+            codec (ValueCodec | None): The codec to encode with. Defaults to the
+                codec registered in `codecs` for the type of `value`.
+            timeout (Optional[float]): Seconds to wait for the client. Uses
+                `default_timeout` when None.
+
+        Returns:
+            bool: True if the value was stored successfully, False otherwise
+        """
+        codec = codec if codec is not None else self.codecs.get(type(value))
+        return await self.set(key, codec.encode(value), timeout)
+
+    async def get_typed(
+        self,
+        key: str,
+        value_type: type[_T] | ValueCodec[_T],
+        default: Optional[_T] = None,
+        timeout: Optional[float] = None,
+    ) -> Optional[_T]:
+        """
+        Retrieves a value and decodes it with a codec.
+
+        Immutable decoded objects, such as numbers, dates and frozen
+        dataclasses, are cached per key and reused while the stored string is
+        unchanged. Mutable objects are decoded on every call.
+
+        Args:
+            key (str): The key to retrieve the value for.
+            value_type (type | ValueCodec): The type registered in `codecs`,
+                or the codec to decode with.
+            default (Optional[Any]): Returned when the key is not found.
+            timeout (Optional[float]): Seconds to wait for the client. Uses
+                `default_timeout` when None.
+
+        Returns:
+            Optional[Any]: The decoded value, or `default` if not found.
+        """
+        codec = self._codec_for(value_type)
+        raw = await self.get(key, timeout)
+        if raw is None:
+            return default
+        return self._decode(self._storage_key(key), raw, codec)
+
+    async def set_json(
+        self, key: str, value: Any, timeout: Optional[float] = None
+    ) -> bool:
+        """
+        Stores a JSON serializable value.
+        """
+        return await self.set_typed(key, value, _JSON_CODEC, timeout)
+
+    async def get_json(
+        self,
+        key: str,
+        default: Any = None,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """
+        Retrieves a value stored with `set_json`, or `default` if not found.
+        """
+        return await self.get_typed(key, _JSON_CODEC, default, timeout)
+
+    async def set_int(
+        self, key: str, value: int, timeout: Optional[float] = None
+    ) -> bool:
+        """
+        Stores an `int`.
+        """
+        return await self.set_typed(key, value, _INT_CODEC, timeout)
+
+    async def get_int(
+        self,
+        key: str,
+        default: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> Optional[int]:
+        """
+        Retrieves an `int`, or `default` if not found.
+        """
+        return await self.get_typed(key, _INT_CODEC, default, timeout)
+
+    async def set_float(
+        self, key: str, value: float, timeout: Optional[float] = None
+    ) -> bool:
+        """
+        Stores a `float`.
+        """
+        return await self.set_typed(key, value, _FLOAT_CODEC, timeout)
+
+    async def get_float(
+        self, key: str, default: Optional[float] = None, timeout: Optional[float] = None
+    ) -> Optional[float]:
+        """
+        Retrieves a `float`, or `default` if not found.
+        """
+        return await self.get_typed(key, _FLOAT_CODEC, default, timeout)
+
+    async def set_bool(
+        self, key: str, value: bool, timeout: Optional[float] = None
+    ) -> bool:
+        """
+        Stores a `bool`.
+        """
+        return await self.set_typed(key, value, _BOOL_CODEC, timeout)
+
+    async def get_bool(
+        self, key: str, default: Optional[bool] = None, timeout: Optional[float] = None
+    ) -> Optional[bool]:
+        """
+        Retrieves a `bool`, or `default` if not found.
+        """
+        return await self.get_typed(key, _BOOL_CODEC, default, timeout)
+
+    async def set_datetime(
+        self, key: str, value: datetime, timeout: Optional[float] = None
+    ) -> bool:
+        """
+        Stores a `datetime` in ISO 8601 format.
+        """
+        return await self.set_typed(key, value, _DATETIME_CODEC, timeout)
+
+    async def get_datetime(
+        self,
+        key: str,
+        default: Optional[datetime] = None,
+        timeout: Optional[float] = None,
+    ) -> Optional[datetime]:
+        """
+        Retrieves a `datetime`, or `default` if not found.
+        """
+        return await self.get_typed(key, _DATETIME_CODEC, default, timeout)
+
+    async def set_dataclass(
+        self, key: str, value: Any, timeout: Optional[float] = None
+    ) -> bool:
+        """
+        Stores a dataclass instance as JSON.
+        """
+        if not is_dataclass(value) or isinstance(value, type):
+            raise TypeError("value must be a dataclass instance.")
+        return await self.set_typed(key, value, self.codecs.get(type(value)), timeout)
+
+    async def get_dataclass(
+        self,
+        key: str,
+        cls: type[_T],
+        default: Optional[_T] = None,
+        timeout: Optional[float] = None,
+    ) -> Optional[_T]:
+        """
+        Retrieves a dataclass instance of type `cls`, or `default` if not found.
         """
-        return cast(bool, await self._invoke_method("clear"))
+        if not (isinstance(cls, type) and is_dataclass(cls)):
+            raise TypeError("cls must be a dataclass type.")
+        return await self.get_typed(key, cls, default, timeout)
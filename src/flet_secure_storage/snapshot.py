@@ -0,0 +1,62 @@
+import json
+import zlib
+from typing import Any
+
+__all__ = ["SecureStorageSnapshotError", "encode_snapshot", "decode_snapshot"]
+
+# A snapshot is the magic, a version byte and the zlib compressed JSON of
+# {"prefix": ..., "items": {key: value}}. Keys are stored as on the client.
+MAGIC = b"FSSS"
+VERSION = 1
+_HEADER_SIZE = len(MAGIC) + 1
+
+
+class SecureStorageSnapshotError(ValueError):
+    """
+    Raised when data passed to `SecureStorage.import_snapshot` is not a snapshot,
+    is damaged, or was written by a newer version of flet-secure-storage.
+    """
+
+
+def encode_snapshot(prefix: str, items: dict[str, str], level: int = 6) -> bytes:
+    """
+    Returns the snapshot of the `items` exported from keys starting with `prefix`.
+    """
+    payload = json.dumps(
+        {"prefix": prefix, "items": items}, ensure_ascii=False, separators=(",", ":")
+    )
+    return MAGIC + bytes([VERSION]) + zlib.compress(payload.encode(), level)
+
+
+def decode_snapshot(data: bytes) -> tuple[str, dict[str, str]]:
+    """
+    Returns the prefix and items of a snapshot made by `encode_snapshot`.
+
+    Raises:
+        SecureStorageSnapshotError: If `data` is not a valid snapshot.
+    """
+    if not isinstance(data, (bytes, bytearray, memoryview)):
+        raise TypeError(f"Snapshot must be bytes. Got {type(data)} instead.")
+    data = bytes(data)
+    if len(data) < _HEADER_SIZE or not data.startswith(MAGIC):
+        raise SecureStorageSnapshotError("Data is not a SecureStorage snapshot.")
+    version = data[len(MAGIC)]
+    if version != VERSION:
+        raise SecureStorageSnapshotError(f"Unsupported snapshot version: {version}.")
+    try:
+        payload: Any = json.loads(zlib.decompress(data[_HEADER_SIZE:]))
+    except (zlib.error, ValueError) as exc:
+        raise SecureStorageSnapshotError(f"Snapshot is damaged: {exc}") from exc
+
+    prefix = payload.get("prefix") if isinstance(payload, dict) else None
+    items = payload.get("items") if isinstance(payload, dict) else None
+    if (
+        not isinstance(prefix, str)
+        or not isinstance(items, dict)
+        or not all(
+            isinstance(key, str) and isinstance(value, str)
+            for key, value in items.items()
+        )
+    ):
+        raise SecureStorageSnapshotError("Snapshot is damaged: unexpected content.")
+    return prefix, items
@@ -0,0 +1,118 @@
+from collections.abc import Callable
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, Optional
+
+from .write_behind import REMOVED
+
+if TYPE_CHECKING:
+    from .secure_storage import SecureStorage
+
+__all__ = ["SecureStorageTransaction", "JOURNAL_KEY"]
+
+JOURNAL_KEY = "__flet_secure_storage_journal__"
+"""The key the client keeps a transaction in until every change is applied."""
+
+
+class SecureStorageTransaction:
+    """
+    Writes and removes staged in Python and committed together.
+
+    Created with `SecureStorage.transaction()` and used as an async context
+    manager: the changes are committed in one call to the client when the
+    block exits, or discarded if it raises.
+
+    The client first stores the whole transaction under a journal key, then
+    applies it and deletes the journal. If the app stops in between, the
+    client applies the journal when it starts again, so either every change
+    is kept or none is.
+    """
+
+    def __init__(
+        self,
+        storage: "SecureStorage",
+        timeout: Optional[float] = None,
+        scope: Optional[Callable[[str], str]] = None,
+    ):
+        self._storage = storage
+        self._timeout = timeout
+        self._scope = scope
+        # Staged changes keyed by the prefixed key, in the order they were made
+        self._changes: dict[str, Any] = {}
+        self._closed = False
+
+    def __len__(self) -> int:
+        return len(self._changes)
+
+    def _check_open(self) -> None:
+        if self._closed:
+            raise RuntimeError("The transaction was already committed or discarded.")
+
+    def _key(self, key: str) -> str:
+        self._check_open()
+        if self._scope is not None:
+            key = self._scope(key)
+        return self._storage._storage_key(key)
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Stages a value, replacing any earlier change to the key.
+        """
+        if value is None:
+            raise ValueError("Value cannot be None. Use remove() instead.")
+        self._changes[self._key(key)] = value
+
+    def remove(self, key: str) -> None:
+        """
+        Stages the removal of a key, replacing any earlier change to it.
+        """
+        self._changes[self._key(key)] = REMOVED
+
+    async def get(self, key: str) -> Optional[str]:
+        """
+        Returns the value staged for a key, or the stored value if the key was
+        not changed in this transaction.
+        """
+        storage_key = self._key(key)
+        if storage_key in self._changes:
+            value = self._changes[storage_key]
+            return None if value is REMOVED else value
+        return await self._storage._get_prefixed(storage_key, self._timeout)
+
+    async def commit(self) -> None:
+        """
+        Sends the staged changes to the client in one call.
+
+        Raises:
+            SecureStorageTransactionError: If the client did not apply the
+                transaction, or it is too large for the client to store as
+                one value on Windows.
+        """
+        self._check_open()
+        self._closed = True
+        writes = {k: v for k, v in self._changes.items() if v is not REMOVED}
+        removes = [k for k, v in self._changes.items() if v is REMOVED]
+        if writes or removes:
+            await self._storage._commit(writes, removes, self._timeout)
+
+    def discard(self) -> None:
+        """
+        Drops the staged changes without sending them.
+        """
+        self._changes.clear()
+        self._closed = True
+
+    async def __aenter__(self) -> "SecureStorageTransaction":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        if self._closed:
+            return
+        if exc_type is not None:
+            self.discard()
+            return
+        await self.commit()
@@ -0,0 +1,245 @@
+import json
+import types
+from dataclasses import asdict, fields, is_dataclass
+from datetime import datetime
+from enum import Enum
+from typing import (
+    Any,
+    Generic,
+    Protocol,
+    TypeVar,
+    Union,
+    get_args,
+    get_origin,
+    get_type_hints,
+    runtime_checkable,
+)
+
+from ._helpers import parse_bool, parse_dt, parse_enum, parse_int
+
+__all__ = [
+    "ValueCodec",
+    "JsonCodec",
+    "IntCodec",
+    "FloatCodec",
+    "BoolCodec",
+    "DateTimeCodec",
+    "DataclassCodec",
+    "CodecRegistry",
+]
+
+_T = TypeVar("_T")
+
+
+@runtime_checkable
+class ValueCodec(Protocol[_T]):
+    """
+    Converts a typed value to and from the string stored on the client.
+    """
+
+    def encode(self, value: _T) -> str: ...
+
+    def decode(self, raw: str) -> _T: ...
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return parse_dt(value)
+    if isinstance(value, Enum):
+        return value.name
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class JsonCodec:
+    """
+    Stores any JSON serializable value. Datetimes are stored in ISO 8601
+    format and enums by name.
+    """
+
+    def encode(self, value: Any) -> str:
+        return json.dumps(value, separators=(",", ":"), default=_json_default)
+
+    def decode(self, raw: str) -> Any:
+        return json.loads(raw)
+
+
+class IntCodec:
+    """
+    Stores an `int` as its decimal string.
+    """
+
+    def encode(self, value: int) -> str:
+        if isinstance(value, bool) or not isinstance(value, int):
+            raise TypeError(f"Expected int, got {type(value).__name__}.")
+        return str(value)
+
+    def decode(self, raw: str) -> int:
+        return int(raw)
+
+
+class FloatCodec:
+    """
+    Stores a `float` using `repr`, so it reads back unchanged.
+    """
+
+    def encode(self, value: float) -> str:
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise TypeError(f"Expected float, got {type(value).__name__}.")
+        return repr(float(value))
+
+    def decode(self, raw: str) -> float:
+        return float(raw)
+
+
+class BoolCodec:
+    """
+    Stores a `bool` as `true` or `false`. Reads any string accepted by `parse_bool`.
+    """
+
+    def encode(self, value: bool) -> str:
+        if not isinstance(value, bool):
+            raise TypeError(f"Expected bool, got {type(value).__name__}.")
+        return "true" if value else "false"
+
+    def decode(self, raw: str) -> bool:
+        return bool(parse_bool(raw))
+
+
+class DateTimeCodec:
+    """
+    Stores a `datetime` in ISO 8601 format.
+    """
+
+    def encode(self, value: datetime) -> str:
+        if not isinstance(value, datetime):
+            raise TypeError(f"Expected datetime, got {type(value).__name__}.")
+        return value.isoformat()
+
+    def decode(self, raw: str) -> datetime:
+        return datetime.fromisoformat(raw)
+
+
+def _is_optional(hint: Any) -> tuple[bool, Any]:
+    """
+    Returns whether `hint` allows None, and the hint without None.
+    """
+    if get_origin(hint) in (Union, types.UnionType):
+        args = [arg for arg in get_args(hint) if arg is not type(None)]
+        if len(args) == 1:
+            return True, args[0]
+    return False, hint
+
+
+def _decode_field(hint: Any, value: Any) -> Any:
+    optional, hint = _is_optional(hint)
+    if value is None and optional:
+        return None
+    if hint is bool:
+        return parse_bool(value)
+    if hint is int:
+        return parse_int(value)
+    if hint is float:
+        return float(value)
+    if hint is datetime:
+        parsed = parse_dt(value)
+        return datetime.fromisoformat(parsed) if parsed is not None else None
+    if isinstance(hint, type) and issubclass(hint, Enum):
+        return hint[parse_enum(value, hint)]
+    if isinstance(hint, type) and is_dataclass(hint):
+        return _decode_dataclass(hint, value)
+    if get_origin(hint) is list and get_args(hint):
+        return [_decode_field(get_args(hint)[0], item) for item in value]
+    return value
+
+
+def _decode_dataclass(cls: type[_T], data: Any) -> _T:
+    if not isinstance(data, dict):
+        raise TypeError(f"Expected an object for {cls.__name__}, got {data!r}.")
+    hints = get_type_hints(cls)
+    kwargs = {
+        f.name: _decode_field(hints.get(f.name, Any), data[f.name])
+        for f in fields(cls)  # type: ignore[arg-type]
+        if f.init and f.name in data
+    }
+    return cls(**kwargs)
+
+
+class DataclassCodec(Generic[_T]):
+    """
+    Stores a dataclass instance as JSON and rebuilds it on read.
+
+    Fields are converted back with the `parse_*` helpers based on their type
+    hints: `bool`, `int`, `datetime`, enums (stored by name), nested dataclasses
+    and lists of those.
+    """
+
+    def __init__(self, cls: type[_T]):
+        if not (isinstance(cls, type) and is_dataclass(cls)):
+            raise TypeError("DataclassCodec requires a dataclass type.")
+        self.cls = cls
+
+    def encode(self, value: _T) -> str:
+        if not isinstance(value, self.cls):
+            raise TypeError(
+                f"Expected {self.cls.__name__}, got {type(value).__name__}."
+            )
+        return json.dumps(
+            asdict(value),  # type: ignore[call-overload]
+            separators=(",", ":"),
+            default=_json_default,
+        )
+
+    def decode(self, raw: str) -> _T:
+        return _decode_dataclass(self.cls, json.loads(raw))
+
+
+class CodecRegistry:
+    """
+    Maps value types to the codec used to store them.
+
+    Dataclass types without a registered codec use `DataclassCodec`.
+    """
+
+    def __init__(self) -> None:
+        self._codecs: dict[type, ValueCodec[Any]] = {}
+
+    @classmethod
+    def default(cls) -> "CodecRegistry":
+        """
+        Returns a registry with codecs for `int`, `float`, `bool`, `datetime`,
+        `dict` and `list`.
+        """
+        registry = cls()
+        registry.register(int, IntCodec())
+        registry.register(float, FloatCodec())
+        registry.register(bool, BoolCodec())
+        registry.register(datetime, DateTimeCodec())
+        registry.register(dict, JsonCodec())
+        registry.register(list, JsonCodec())
+        return registry
+
+    def register(self, value_type: type, codec: ValueCodec[Any]) -> None:
+        """
+        Uses `codec` for values of `value_type`.
+        """
+        if not isinstance(value_type, type):
+            raise TypeError("value_type must be a type.")
+        if not isinstance(codec, ValueCodec):
+            raise TypeError("codec must implement encode() and decode().")
+        self._codecs[value_type] = codec
+
+    def get(self, value_type: type) -> ValueCodec[Any]:
+        """
+        Returns the codec for `value_type`.
+
+        Raises:
+            KeyError: If no codec is registered for the type.
+        """
+        codec = self._codecs.get(value_type)
+        if codec is not None:
+            return codec
+        if is_dataclass(value_type):
+            codec = DataclassCodec(value_type)
+            self._codecs[value_type] = codec
+            return codec
+        raise KeyError(f"No codec registered for {value_type.__name__}.")
@@ -0,0 +1,126 @@
+from dataclasses import dataclass
+from typing import Any
+
+__all__ = ["WriteBehindOptions", "WriteBuffer"]
+
+
+@dataclass
+class WriteBehindOptions:
+    """
+    Configures the opt-in write-behind mode of `SecureStorage`.
+
+    In write-behind mode `set` and `remove` return as soon as the change is
+    buffered. Repeated writes to one key collapse to the last value, and the
+    buffer is sent to the client in one call once a threshold is reached or
+    `flush()` is awaited.
+
+    Attributes:
+        max_pending: The number of buffered keys that triggers a flush.
+
+        flush_interval: The number of seconds a change may stay buffered before
+            it is flushed in the background.
+    """
+
+    max_pending: int = 64
+    flush_interval: float = 0.5
+
+    def __post_init__(self) -> None:
+        if self.max_pending < 1:
+            raise ValueError("max_pending must be at least 1.")
+        if self.flush_interval < 0:
+            raise ValueError("flush_interval cannot be negative.")
+
+
+class _Removed:
+    def __repr__(self) -> str:
+        return "<removed>"
+
+
+REMOVED: Any = _Removed()
+"""Marks a buffered remove."""
+
+
+class WriteBuffer:
+    """
+    Pending writes and removes keyed by the prefixed storage key.
+
+    Entries taken by `drain()` stay visible to `lookup()` until `done()` is
+    called, so reads issued while a flush is in flight still see them.
+    """
+
+    def __init__(self) -> None:
+        self._pending: dict[str, Any] = {}
+        self._flushing: dict[str, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def put(self, key: str, value: Any) -> None:
+        """
+        Buffers a write, replacing any pending change to the same key.
+        """
+        self._pending.pop(key, None)
+        self._pending[key] = value
+
+    def remove(self, key: str) -> None:
+        """
+        Buffers a remove, replacing any pending change to the same key.
+        """
+        self.put(key, REMOVED)
+
+    def lookup(self, key: str) -> tuple[bool, Any]:
+        """
+        Returns whether a change to `key` is buffered and the buffered value,
+        which is `REMOVED` for a pending remove.
+        """
+        for changes in (self._pending, self._flushing):
+            if key in changes:
+                return True, changes[key]
+        return False, None
+
+    def changes(self) -> dict[str, Any]:
+        """
+        Returns every buffered change, including the ones being flushed.
+        """
+        return {**self._flushing, **self._pending}
+
+    def drain(self) -> tuple[dict[str, Any], list[str]]:
+        """
+        Takes the pending changes for a flush.
+
+        Returns:
+            tuple[dict[str, Any], list[str]]: The values to write and the keys to remove.
+        """
+        self._flushing = self._pending
+        self._pending = {}
+        writes = {
+            key: value for key, value in self._flushing.items() if value is not REMOVED
+        }
+        removes = [key for key, value in self._flushing.items() if value is REMOVED]
+        return writes, removes
+
+    def done(self) -> None:
+        """
+        Forgets the changes taken by the last `drain()`.
+        """
+        self._flushing = {}
+
+    def restore(self) -> None:
+        """
+        Puts the changes taken by the last `drain()` back, for a flush that did
+        not finish. Changes buffered since then take precedence.
+        """
+        self._pending = {**self._flushing, **self._pending}
+        self._flushing = {}
+
+    def clear(self, prefix: str = "") -> None:
+        """
+        Drops every buffered change, or the changes to keys starting with `prefix`.
+        """
+        if prefix == "":
+            self._pending = {}
+            self._flushing = {}
+            return
+        for changes in (self._pending, self._flushing):
+            for key in [key for key in changes if key.startswith(prefix)]:
+                del changes[key]
@@ -1,4 +1,7 @@
+import 'dart:convert';
+
 import 'package:flet/flet.dart';
+import 'package:flutter/foundation.dart';
 import 'package:flutter_secure_storage/flutter_secure_storage.dart';
 
 // Enum (AndroidOptions)
@@ -93,30 +96,124 @@ List<AccessControlFlag> _parseAccessControlFlags(dynamic value) {
       : <AccessControlFlag>[single];
 }
 
+// Holds a transaction until all of its changes are applied
+const _journalKey = "__flet_secure_storage_journal__";
+
+// Commits and recoveries of every SecureStorageService, run one at a time
+Future<void> _journalQueue = Future.value();
+
+Future<T> _serializeJournal<T>(Future<T> Function() action) {
+  final result = _journalQueue.then((_) => action());
+  _journalQueue = result.then((_) {}, onError: (_) {});
+  return result;
+}
+
+// Methods that do not change the storage; any other call ends open scans
+const _readMethods = {
+  "get",
+  "get_many",
+  "contains_key",
+  "contains_many",
+  "get_keys",
+  "list_keys",
+  "count",
+  "scan",
+  "items",
+};
+
+// Counts the calls that may have changed the storage, in every service
+int _storageGeneration = 0;
+
+// The sorted keys of the scan in progress, so that its next page does not
+// read and sort every key again. Values are read page by page and never
+// kept. Dropped after the last page, on any change and on dispose.
+_ScanCursor? _scanCursor;
+
+class _ScanCursor {
+  _ScanCursor(this.service, this.prefix, this.generation, this.keys);
+
+  final SecureStorageService service;
+  final String? prefix;
+  final int generation;
+  final List<String> keys;
+
+  // The key the next page starts after, and the index of the key after it
+  String? cursor;
+  int next = 0;
+
+  bool continues(SecureStorageService service, String? prefix, String? after) =>
+      after != null &&
+      cursor == after &&
+      this.service == service &&
+      this.prefix == prefix &&
+      generation == _storageGeneration;
+}
+
+// Every live service, so a change made through one is reported to all
+final _services = <SecureStorageService>{};
+
 class SecureStorageService extends FletService {
-  SecureStorageService({required super.control});
+  SecureStorageService({required super.control}) {
+    _services.add(this);
+  }
+
+  // Built from the "options" property, and again whenever it changes
+  late FlutterSecureStorage _storage;
 
-  // Initialize _storage from FlutterSecureStorage later
-  late final FlutterSecureStorage _storage;
+  // The options _storage was built from, to tell when they change
+  String? _optionsJson;
+
+  // Completes once a transaction left by a previous run is recovered
+  late final Future<void> _recovery;
 
   @override
   void init() {
     super.init(); // Calls FletService.init()
+    _buildStorage();
+    _recovery = _serializeJournal(_recoverJournal);
+    control.addInvokeMethodListener(_invokeMethod);
+  }
 
+  @override
+  void update() {
+    super.update();
+    // Options set after the service was created apply to later calls
+    _buildStorage();
+  }
+
+  void _buildStorage() {
     // Get options dictionary from control properties
     final options = control.properties["options"] as Map<String, dynamic>?;
+    final optionsJson = jsonEncode(options);
+    if (optionsJson == _optionsJson) {
+      return;
+    }
+    _optionsJson = optionsJson;
 
+    // Only the options of the platform the app runs on are used, so the
+    // others are left as defaults instead of being parsed
     _storage = FlutterSecureStorage(
-        iOptions: _getIOSOptions(options),
-        aOptions: _getAndroidOptions(options),
-        lOptions: _getLinuxOptions(options),
-        wOptions: _getWindowsOptions(options),
-        webOptions: _getWebOptions(options),
-        mOptions: _getMacOsOptions(options));
-
-    control.addInvokeMethodListener(_invokeMethod);
+        iOptions: _runsOn(TargetPlatform.iOS)
+            ? _getIOSOptions(options)
+            : const IOSOptions(),
+        aOptions: _runsOn(TargetPlatform.android)
+            ? _getAndroidOptions(options)
+            : const AndroidOptions(),
+        lOptions: _runsOn(TargetPlatform.linux)
+            ? _getLinuxOptions(options)
+            : const LinuxOptions(),
+        wOptions: _runsOn(TargetPlatform.windows)
+            ? _getWindowsOptions(options)
+            : const WindowsOptions(),
+        webOptions: kIsWeb ? _getWebOptions(options) : const WebOptions(),
+        mOptions: _runsOn(TargetPlatform.macOS)
+            ? _getMacOsOptions(options)
+            : const MacOsOptions());
   }
 
+  bool _runsOn(TargetPlatform platform) =>
+      !kIsWeb && defaultTargetPlatform == platform;
+
   IOSOptions _getIOSOptions(Map<String, dynamic>? options) {
     if (options == null || options.isEmpty) {
       return const IOSOptions();
@@ -310,7 +407,113 @@ class SecureStorageService extends FletService {
     );
   }
 
+  /// Reads every Key-Value pair and keeps the ones whose Key starts with
+  /// [prefix], so only matching entries are sent back to Python.
+  Future<Map<String, String>> _readAllWithPrefix(String? prefix) async {
+    final all = await _storage.readAll();
+    if (prefix == null || prefix.isEmpty) {
+      return all;
+    }
+    return {
+      for (final entry in all.entries)
+        if (entry.key.startsWith(prefix)) entry.key: entry.value,
+    };
+  }
+
+  /// Reads the value of [key], or null if it cannot be read.
+  Future<String?> _readOrNull(String key) async {
+    try {
+      return await _storage.read(key: key);
+    } catch (e) {
+      return null;
+    }
+  }
+
+  /// Sends a "change" event with the [keys] that were written ("set"),
+  /// deleted ("remove") or cleared ("clear"), while Python listens.
+  void _notifyChange(String kind, List<String> keys) {
+    if (keys.isEmpty && kind != "clear") {
+      return;
+    }
+    // Reported to every service with a handler, not only the one that made
+    // the change, as other parts of the app may cache the same keys
+    for (final service in _services.toList()) {
+      if (service.control.getBool("on_change", false) == true) {
+        service.control.triggerEvent("change", {"kind": kind, "keys": keys});
+      }
+    }
+  }
+
+  /// Writes the changes of a journal, then deletes the journal.
+  Future<void> _applyJournal(Map<String, dynamic> journal) async {
+    final writes = journal["writes"] as Map;
+    final removes = journal["removes"] as List;
+    for (final entry in writes.entries) {
+      await _storage.write(
+          key: entry.key as String, value: entry.value as String);
+    }
+    for (final key in removes.cast<String>()) {
+      await _storage.delete(key: key);
+    }
+    await _storage.delete(key: _journalKey);
+    _notifyChange("set", writes.keys.cast<String>().toList());
+    _notifyChange("remove", removes.cast<String>().toList());
+  }
+
+  /// Rolls forward a transaction left in the journal by an earlier run,
+  /// or discards the journal if it cannot be read.
+  Future<void> _recoverJournal() async {
+    try {
+      final raw = await _storage.read(key: _journalKey);
+      if (raw == null) {
+        return;
+      }
+      Map<String, dynamic>? journal;
+      try {
+        journal = jsonDecode(raw) as Map<String, dynamic>;
+      } catch (e) {
+        journal = null;
+      }
+      if (journal == null ||
+          journal["writes"] is! Map ||
+          journal["removes"] is! List) {
+        await _storage.delete(key: _journalKey);
+        return;
+      }
+      await _applyJournal(journal);
+    } catch (e) {
+      // Keep the journal; it is tried again by the next commit or start
+    }
+  }
+
+  /// Stores a transaction in the journal, then applies it. Once the
+  /// journal is written the transaction is committed, even if applying
+  /// it fails, as it is rolled forward later.
+  Future<Map<String, bool>> _commit(Map writes, List removes) async {
+    await _recoverJournal();
+    final journal = <String, dynamic>{
+      "writes": writes,
+      "removes": removes,
+    };
+    try {
+      await _storage.write(key: _journalKey, value: jsonEncode(journal));
+    } catch (e) {
+      return {"committed": false, "applied": false};
+    }
+    try {
+      await _applyJournal(journal);
+      return {"committed": true, "applied": true};
+    } catch (e) {
+      return {"committed": true, "applied": false};
+    }
+  }
+
   Future<dynamic> _invokeMethod(String name, dynamic args) async {
+    await _recovery;
+    if (!_readMethods.contains(name)) {
+      _storageGeneration++;
+      _scanCursor = null;
+    }
     switch (name) {
       // Set Key-Value pair
       case "set": // Returns bool
@@ -321,6 +524,7 @@ class SecureStorageService extends FletService {
         }
         try {
           await _storage.write(key: key, value: value);
+          _notifyChange("set", [key]);
           return true;
         } catch (e) {
           return false;
@@ -350,10 +554,85 @@ class SecureStorageService extends FletService {
           return false;
         }
 
-      // Get all Key-Value pairs
+      // Get all Key-Value pairs, optionally filtered by prefix
       case "get_keys": // returns Map<String, String>
         try {
-          return await _storage.readAll();
+          return await _readAllWithPrefix(args?["prefix"] as String?);
+        } catch (e) {
+          return <String, String>{};
+        }
+
+      // Get the Keys that start with a prefix
+      case "list_keys": // returns List<String>
+        try {
+          final items = await _readAllWithPrefix(args?["prefix"] as String?);
+          return items.keys.toList();
+        } catch (e) {
+          return <String>[];
+        }
+
+      // Count the Keys that start with a prefix
+      case "count": // returns int
+        try {
+          final items = await _readAllWithPrefix(args?["prefix"] as String?);
+          return items.length;
+        } catch (e) {
+          return 0;
+        }
+
+      // Get one sorted page of the Keys that start with a prefix
+      case "scan": // returns Map<String, dynamic>
+        final limit = args?["limit"] as int? ?? 100;
+        final startAfter = args?["start_after"] as String?;
+        final withValues = args?["values"] as bool? ?? false;
+        final prefix = args?["prefix"] as String?;
+        var scan = _scanCursor;
+        // The values read with the keys of a new scan, used for its first page
+        Map<String, String>? items;
+        if (scan == null || !scan.continues(this, prefix, startAfter)) {
+          // A new scan, or one changed since its last page: read it again
+          final generation = _storageGeneration;
+          Map<String, String> read;
+          try {
+            read = await _readAllWithPrefix(prefix);
+          } catch (e) {
+            read = <String, String>{};
+          }
+          items = read;
+          final keys = read.keys.toList()..sort();
+          scan = _ScanCursor(this, prefix, generation, keys);
+          final start = startAfter == null
+              ? 0
+              : scan.keys.indexWhere((key) => key.compareTo(startAfter) > 0);
+          scan.next = start < 0 ? scan.keys.length : start;
+        }
+        final end = scan.next + limit < scan.keys.length
+            ? scan.next + limit
+            : scan.keys.length;
+        final page = scan.keys.sublist(scan.next, end);
+        final more = end < scan.keys.length;
+        if (more) {
+          scan.cursor = page.last;
+          scan.next = end;
+        }
+        _scanCursor = more ? scan : null;
+        final values = !withValues
+            ? const <String?>[]
+            : items != null
+                ? [for (final key in page) items[key]]
+                : await Future.wait(page.map(_readOrNull));
+        return {
+          "keys": page,
+          "items": {
+            for (var i = 0; i < values.length; i++) page[i]: values[i],
+          },
+          "cursor": more ? page.last : null,
+        };
+
+      // Get the Key-Value pairs whose Key starts with a prefix
+      case "items": // returns Map<String, String>
+        try {
+          return await _readAllWithPrefix(args?["prefix"] as String?);
         } catch (e) {
           return <String, String>{};
         }
@@ -366,6 +645,7 @@ class SecureStorageService extends FletService {
         }
         try {
           await _storage.delete(key: key);
+          _notifyChange("remove", [key]);
           return true;
         } catch (e) {
           return false;
@@ -375,11 +655,123 @@ class SecureStorageService extends FletService {
       case "clear": // Returns bool
         try {
           await _storage.deleteAll();
+          _notifyChange("clear", []);
           return true;
         } catch (e) {
           return false;
         }
 
+      // Remove the Key-Value pairs whose Key starts with a prefix
+      case "clear_prefix": // Returns int
+        final prefix = args?["prefix"] as String?;
+        final removed = <String>[];
+        if (prefix == null || prefix.isEmpty) {
+          return removed.length;
+        }
+        try {
+          final items = await _readAllWithPrefix(prefix);
+          for (final key in items.keys) {
+            await _storage.delete(key: key);
+            removed.add(key);
+          }
+        } catch (e) {
+          // Report the keys deleted before the error
+        }
+        _notifyChange("remove", removed);
+        return removed.length;
+
+      // Set multiple Key-Value pairs
+      case "set_many": // Returns Map<String, bool>
+        final values = args["values"] as Map?;
+        final results = <String, bool>{};
+        if (values == null) {
+          return results;
+        }
+        for (final entry in values.entries) {
+          final key = entry.key as String;
+          final value = entry.value;
+          if (value == null) {
+            results[key] = false;
+            continue;
+          }
+          try {
+            await _storage.write(key: key, value: value);
+            results[key] = true;
+          } catch (e) {
+            results[key] = false;
+          }
+        }
+        _notifyChange("set", [
+          for (final entry in results.entries)
+            if (entry.value) entry.key,
+        ]);
+        return results;
+
+      // Get multiple Values by Key
+      case "get_many": // Returns Map<String, String?>
+        final keys = args["keys"] as List?;
+        final results = <String, String?>{};
+        if (keys == null) {
+          return results;
+        }
+        for (final key in keys.cast<String>()) {
+          try {
+            results[key] = await _storage.read(key: key);
+          } catch (e) {
+            results[key] = null;
+          }
+        }
+        return results;
+
+      // Check if multiple Keys exist
+      case "contains_many": // Returns Map<String, bool>
+        final keys = args["keys"] as List?;
+        final results = <String, bool>{};
+        if (keys == null) {
+          return results;
+        }
+        for (final key in keys.cast<String>()) {
+          try {
+            results[key] = await _storage.containsKey(key: key);
+          } catch (e) {
+            results[key] = false;
+          }
+        }
+        return results;
+
+      // Remove multiple Key-Value pairs
+      case "remove_many": // Returns Map<String, bool>
+        final keys = args["keys"] as List?;
+        final results = <String, bool>{};
+        if (keys == null) {
+          return results;
+        }
+        for (final key in keys.cast<String>()) {
+          try {
+            await _storage.delete(key: key);
+            results[key] = true;
+          } catch (e) {
+            results[key] = false;
+          }
+        }
+        _notifyChange("remove", [
+          for (final entry in results.entries)
+            if (entry.value) entry.key,
+        ]);
+        return results;
+
+      // Write and remove Key-Value pairs all together
+      case "commit": // Returns Map<String, bool>
+        final writes = args?["writes"] as Map? ?? {};
+        final removes = args?["removes"] as List? ?? [];
+        final valid = writes.entries.every(
+                (entry) => entry.key is String && entry.value is String) &&
+            removes.every((key) => key is String);
+        if (!valid) {
+          return {"committed": false, "applied": false};
+        }
+        return await _serializeJournal(() => _commit(writes, removes));
+
       default:
         throw Exception("Unknown SecureStorage method: $name");
     }
@@ -387,6 +779,10 @@ class SecureStorageService extends FletService {
 
   @override
   void dispose() {
+    _services.remove(this);
+    if (_scanCursor?.service == this) {
+      _scanCursor = null;
+    }
     control.removeInvokeMethodListener(_invokeMethod);
     super.dispose();
   }
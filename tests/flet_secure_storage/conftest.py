@@ -0,0 +1,131 @@
+from typing import Any
+
+import pytest
+
+from flet_secure_storage import SecureStorage, SecureStorageChangeEvent
+
+
+class FakeClient:
+    """
+    In-memory stand-in for the Dart `SecureStorageService._invokeMethod`.
+
+    Records every method name it receives in `calls` so tests can count
+    round trips to the client, and reports changes to every service in
+    `services` with an `on_change` handler, as the client does.
+    """
+
+    def __init__(self) -> None:
+        self.storage: dict[str, str] = {}
+        self.calls: list[str] = []
+        self.services: list[SecureStorage] = []
+
+    async def invoke(self, name: str, args: dict[str, Any] | None = None) -> Any:
+        self.calls.append(name)
+        args = args or {}
+        changes = self._changes(name, args)
+        result = self._run(name, args)
+        for kind, keys in changes:
+            if keys or kind == "clear":
+                self._notify(kind, keys)
+        return result
+
+    def _changes(self, name: str, args: dict[str, Any]) -> list[tuple[str, list]]:
+        if name in ("set", "remove"):
+            return [(name, [args["key"]])]
+        if name == "set_many":
+            return [("set", list(args["values"]))]
+        if name == "remove_many":
+            return [("remove", list(args["keys"]))]
+        if name == "clear_prefix":
+            return [("remove", list(self._items(args["prefix"])))]
+        if name == "commit":
+            return [("set", list(args["writes"])), ("remove", list(args["removes"]))]
+        if name == "clear":
+            return [("clear", [])]
+        return []
+
+    def _notify(self, kind: str, keys: list[str]) -> None:
+        for svc in self.services:
+            if svc.on_change is None:
+                continue
+            event = SecureStorageChangeEvent(
+                name="change", control=svc, kind=kind, keys=keys
+            )
+            if svc.before_event(event):
+                svc.on_change(event)
+
+    def _run(self, name: str, args: dict[str, Any]) -> Any:
+        if name == "set":
+            self.storage[args["key"]] = args["value"]
+            return True
+        if name == "get":
+            return self.storage.get(args["key"])
+        if name == "contains_key":
+            return args["key"] in self.storage
+        if name == "remove":
+            self.storage.pop(args["key"], None)
+            return True
+        if name in ("get_keys", "items"):
+            return self._items(args.get("prefix"))
+        if name == "list_keys":
+            return list(self._items(args.get("prefix")))
+        if name == "count":
+            return len(self._items(args.get("prefix")))
+        if name == "scan":
+            items = self._items(args.get("prefix"))
+            start_after = args.get("start_after")
+            keys = sorted(k for k in items if start_after is None or k > start_after)
+            page = keys[: args["limit"]]
+            return {
+                "keys": page,
+                "items": {k: items[k] for k in page} if args.get("values") else {},
+                "cursor": page[-1] if len(keys) > args["limit"] else None,
+            }
+        if name == "clear":
+            self.storage.clear()
+            return True
+        if name == "clear_prefix":
+            keys = list(self._items(args["prefix"]))
+            for key in keys:
+                del self.storage[key]
+            return len(keys)
+        if name == "set_many":
+            self.storage.update(args["values"])
+            return {key: True for key in args["values"]}
+        if name == "get_many":
+            return {key: self.storage.get(key) for key in args["keys"]}
+        if name == "contains_many":
+            return {key: key in self.storage for key in args["keys"]}
+        if name == "remove_many":
+            for key in args["keys"]:
+                self.storage.pop(key, None)
+            return {key: True for key in args["keys"]}
+        if name == "commit":
+            self.storage.update(args["writes"])
+            for key in args["removes"]:
+                self.storage.pop(key, None)
+            return {"committed": True, "applied": True}
+        raise AssertionError(f"unexpected method: {name}")
+
+    def _items(self, prefix: str | None) -> dict[str, str]:
+        return {
+            key: value
+            for key, value in self.storage.items()
+            if key.startswith(prefix or "")
+        }
+
+
+@pytest.fixture
+def client() -> FakeClient:
+    return FakeClient()
+
+
+@pytest.fixture
+def storage_factory(client):
+    def factory(**kwargs: Any) -> SecureStorage:
+        svc = SecureStorage(**kwargs)
+        svc._invoke_method = client.invoke
+        client.services.append(svc)
+        return svc
+
+    return factory
@@ -0,0 +1,186 @@
+import errno
+import os
+import stat
+
+import pytest
+
+from flet_secure_storage import (
+    EncryptedFileBackend,
+    FlutterBackend,
+    MemoryBackend,
+    SecureStorage,
+    StorageBackend,
+)
+
+KEY = bytes(range(32))
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / "storage.bin"
+
+
+@pytest.mark.asyncio
+@pytest.mark.smoke
+class TestMemoryBackend:
+    async def test_default_backend_is_the_flutter_client(self):
+        svc = SecureStorage()
+        assert isinstance(svc._backend, FlutterBackend)
+        assert isinstance(MemoryBackend(), StorageBackend)
+
+    async def test_runs_the_storage_api_without_a_client(self):
+        svc = SecureStorage(prefix="app", backend=MemoryBackend())
+
+        assert await svc.set("a", "1") is True
+        assert await svc.set_many({"b": "2", "c": "3"}) == {"b": True, "c": True}
+        assert await svc.get("a") == "1"
+        assert await svc.contains_key("b") is True
+        assert await svc.get_keys() == ["app.a:1", "app.b:2", "app.c:3"]
+        assert await svc.count() == 3
+        page = await svc.scan(limit=2)
+        assert page.keys == ["app.a", "app.b"] and page.cursor == "app.b"
+        assert await svc.remove("a") is True
+        assert await svc.clear_prefix("b") == 1
+        assert await svc.list_keys() == ["app.c"]
+
+    async def test_rejects_invalid_backends(self):
+        with pytest.raises(TypeError):
+            SecureStorage(backend=object())
+
+
+@pytest.mark.asyncio
+@pytest.mark.smoke
+class TestEncryptedFileBackend:
+    async def test_values_persist_across_instances(self, path):
+        svc = SecureStorage(backend=EncryptedFileBackend(path, KEY))
+        await svc.set("token", "secret-value")
+        await svc.set("other", "1")
+        await svc.remove("other")
+        svc._backend.close()
+
+        reopened = SecureStorage(backend=EncryptedFileBackend(path, KEY))
+        assert await reopened.get("token") == "secret-value"
+        assert await reopened.contains_key("other") is False
+
+    async def test_file_is_encrypted_and_private(self, path):
+        backend = EncryptedFileBackend(path, KEY)
+        await backend.invoke("set", {"key": "token", "value": "secret-value"})
+
+        data = path.read_bytes()
+        assert b"secret-value" not in data and b"token" not in data
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+
+    async def test_wrong_key_is_rejected(self, path):
+        EncryptedFileBackend(path, KEY).close()
+        with pytest.raises(ValueError):
+            EncryptedFileBackend(path, bytes(32))
+
+    async def test_passphrase(self, path):
+        backend = EncryptedFileBackend(path, "correct horse")
+        await backend.invoke("set", {"key": "a", "value": "1"})
+        backend.close()
+        assert (
+            await EncryptedFileBackend(path, "correct horse").invoke(
+                "get", {"key": "a"}
+            )
+            == "1"
+        )
+
+    async def test_tampered_records_are_rejected(self, path):
+        backend = EncryptedFileBackend(path, KEY)
+        await backend.invoke("set", {"key": "a", "value": "1"})
+        backend.close()
+
+        data = bytearray(path.read_bytes())
+        data[-40] ^= 1
+        path.write_bytes(bytes(data))
+        with pytest.raises(ValueError):
+            EncryptedFileBackend(path, KEY)
+
+    async def test_partly_written_record_is_dropped(self, path):
+        backend = EncryptedFileBackend(path, KEY)
+        await backend.invoke("set", {"key": "a", "value": "1"})
+        await backend.invoke("set", {"key": "b", "value": "2"})
+        backend.close()
+        path.write_bytes(path.read_bytes()[:-5])
+
+        reopened = EncryptedFileBackend(path, KEY)
+        assert await reopened.invoke("items") == {"a": "1"}
+        await reopened.invoke("set", {"key": "c", "value": "3"})
+        reopened.close()
+        assert await EncryptedFileBackend(path, KEY).invoke("items") == {
+            "a": "1",
+            "c": "3",
+        }
+
+    async def test_damaged_record_size_is_rejected_without_truncating(self, path):
+        backend = EncryptedFileBackend(path, KEY)
+        for i in range(5):
+            await backend.invoke("set", {"key": f"k{i}", "value": "v" * 20})
+        backend.close()
+
+        data = bytearray(path.read_bytes())
+        # The size of the first record follows the 41-byte header
+        data[41:45] = bytes(4)
+        path.write_bytes(bytes(data))
+        with pytest.raises(ValueError, match="corrupted"):
+            EncryptedFileBackend(path, KEY)
+        assert path.read_bytes() == bytes(data)
+
+    async def test_open_in_a_worker_thread(self, path):
+        backend = await EncryptedFileBackend.open(path, KEY)
+        await backend.invoke("set", {"key": "a", "value": "1"})
+        backend.close()
+        reopened = await EncryptedFileBackend.open(path, KEY)
+        assert await reopened.invoke("get", {"key": "a"}) == "1"
+
+    async def test_write_failure_is_reported_not_raised(self, path):
+        backend = EncryptedFileBackend(path, KEY)
+        await backend.invoke("set", {"key": "a", "value": "1"})
+        file = backend._file
+
+        class DiskFull:
+            # Writes part of the record, then fails like a full disk
+            def write(self, data):
+                file.write(bytes(data[:5]))
+                raise OSError(errno.ENOSPC, "No space left on device")
+
+            def fileno(self):
+                return file.fileno()
+
+        backend._file = DiskFull()
+        assert await backend.invoke("set", {"key": "a", "value": "2"}) is False
+        assert await backend.invoke("remove", {"key": "a"}) is False
+        assert await backend.invoke("clear") is False
+        commit = await backend.invoke("commit", {"writes": {"b": "1"}, "removes": []})
+        assert commit == {"committed": False, "applied": False}
+        assert await backend.invoke("get", {"key": "a"}) == "1"
+
+        backend._file = file
+        assert await backend.invoke("set", {"key": "b", "value": "2"}) is True
+        backend.close()
+        reopened = EncryptedFileBackend(path, KEY)
+        assert await reopened.invoke("get_many", {"keys": ["a", "b"]}) == {
+            "a": "1",
+            "b": "2",
+        }
+
+    async def test_compacts_overwritten_records(self, path):
+        backend = EncryptedFileBackend(path, KEY, compact_min_records=10)
+        for i in range(25):
+            await backend.invoke("set", {"key": "counter", "value": str(i)})
+        await backend.invoke("clear_prefix", {"prefix": "none"})
+
+        assert backend._records < 10
+        backend.close()
+        assert (
+            await EncryptedFileBackend(path, KEY).invoke("get", {"key": "counter"})
+            == "24"
+        )
+
+    async def test_clear(self, path):
+        backend = EncryptedFileBackend(path, KEY)
+        await backend.invoke("set_many", {"values": {"a": "1", "b": "2"}})
+        await backend.invoke("clear")
+        backend.close()
+        assert await EncryptedFileBackend(path, KEY).invoke("items") == {}
@@ -0,0 +1,134 @@
+import os
+
+import pytest
+
+from flet_secure_storage import SecureStorageBlobError, WriteBehindOptions
+
+DATA = os.urandom(10_000)
+
+
+async def read_all(svc, key, **kwargs) -> bytes:
+    return b"".join([piece async for piece in svc.read_blob(key, **kwargs)])
+
+
+async def pieces(data: bytes, size: int):
+    while data:
+        yield data[:size]
+        data = data[size:]
+
+
+@pytest.mark.asyncio
+@pytest.mark.smoke
+class TestBlob:
+    async def test_round_trip_across_chunk_keys(self, client, storage_factory):
+        svc = storage_factory()
+        assert await svc.write_blob("file", DATA, chunk_size=1024) is True
+
+        chunk_keys = [key for key in client.storage if key != "file"]
+        assert len(chunk_keys) == 10
+        assert all(key.startswith("file~") for key in chunk_keys)
+        assert await read_all(svc, "file") == DATA
+
+    async def test_default_chunks_fit_windows_entries(self, client, storage_factory):
+        svc = storage_factory()
+        await svc.write_blob("file", DATA)
+
+        chunks = [value for key, value in client.storage.items() if key != "file"]
+        assert len(chunks) == 7
+        assert max(len(value) for value in chunks) <= 2560
+        assert await read_all(svc, "file") == DATA
+
+    async def test_chunk_size_option(self, client, storage_factory):
+        svc = storage_factory(blob_chunk_size=5000)
+        await svc.write_blob("file", DATA)
+
+        assert len(client.storage) == 3
+        assert await read_all(svc, "file") == DATA
+        with pytest.raises(ValueError):
+            storage_factory(blob_chunk_size=0)
+
+    async def test_reads_in_windows(self, client, storage_factory):
+        svc = storage_factory()
+        await svc.write_blob("file", DATA, chunk_size=1000)
+        client.calls.clear()
+
+        sizes = [len(piece) async for piece in svc.read_blob("file", window=3)]
+
+        assert sizes == [1000] * 10
+        assert client.calls.count("get") == 11  # manifest + one per chunk
+
+    async def test_writes_async_iterables(self, storage_factory):
+        svc = storage_factory()
+        await svc.write_blob("file", pieces(DATA, 333), chunk_size=1024)
+        assert await read_all(svc, "file") == DATA
+
+    async def test_empty_blob(self, storage_factory):
+        svc = storage_factory()
+        await svc.write_blob("file", b"")
+        assert await read_all(svc, "file") == b""
+
+    async def test_overwrite_removes_old_chunks(self, client, storage_factory):
+        svc = storage_factory(prefix="app")
+        await svc.write_blob("file", DATA, chunk_size=1024)
+        await svc.write_blob("file", b"small", chunk_size=1024)
+
+        assert len(client.storage) == 2
+        assert await read_all(svc, "file") == b"small"
+
+    async def test_failed_write_keeps_previous_blob(self, client, storage_factory):
+        svc = storage_factory()
+        await svc.write_blob("file", b"old")
+
+        async def broken():
+            yield b"new data"
+            raise OSError("source failed")
+
+        with pytest.raises(OSError):
+            await svc.write_blob("file", broken(), chunk_size=2)
+
+        assert len(client.storage) == 2
+        assert await read_all(svc, "file") == b"old"
+
+    async def test_missing_chunk_raises(self, client, storage_factory):
+        svc = storage_factory()
+        await svc.write_blob("file", DATA, chunk_size=1024)
+        del client.storage[next(key for key in client.storage if key != "file")]
+
+        with pytest.raises(SecureStorageBlobError):
+            await read_all(svc, "file")
+
+    async def test_corrupted_chunk_raises(self, client, storage_factory):
+        svc = storage_factory()
+        await svc.write_blob("file", DATA, chunk_size=1024)
+        chunk = next(key for key in client.storage if key != "file")
+        client.storage[chunk] = "AAAA"
+
+        with pytest.raises(SecureStorageBlobError):
+            await read_all(svc, "file")
+
+    async def test_missing_blob_raises_key_error(self, client, storage_factory):
+        svc = storage_factory()
+        client.storage["plain"] = "value"
+        with pytest.raises(KeyError):
+            await read_all(svc, "missing")
+        with pytest.raises(KeyError):
+            await read_all(svc, "plain")
+
+    async def test_remove_blob(self, client, storage_factory):
+        svc = storage_factory()
+        await svc.write_blob("file", DATA, chunk_size=1024)
+        assert await svc.remove_blob("file") is True
+        assert client.storage == {}
+
+    async def test_with_write_behind(self, client, storage_factory):
+        svc = storage_factory(write_behind=WriteBehindOptions(flush_interval=60))
+        await svc.write_blob("file", DATA, chunk_size=4096)
+
+        assert "file" in client.storage
+        assert await read_all(svc, "file") == DATA
+
+    @pytest.mark.parametrize("kwargs", [{"chunk_size": 0}, {"window": 0}])
+    async def test_rejects_invalid_sizes(self, storage_factory, kwargs):
+        svc = storage_factory()
+        with pytest.raises(ValueError):
+            await svc.write_blob("file", DATA, **kwargs)
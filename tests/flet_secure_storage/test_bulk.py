@@ -0,0 +1,72 @@
+import pytest
+
+from flet_secure_storage import CacheOptions
+
+
+@pytest.mark.asyncio
+@pytest.mark.smoke
+class TestBulkOperations:
+    async def test_set_many_single_round_trip(self, client, storage_factory):
+        svc = storage_factory(prefix="app")
+
+        result = await svc.set_many({"a": "1", "b": "2", "c": "3"})
+
+        assert result == {"a": True, "b": True, "c": True}
+        assert client.storage == {"app.a": "1", "app.b": "2", "app.c": "3"}
+        assert client.calls == ["set_many"]
+
+    async def test_get_many_returns_missing_as_none(self, client, storage_factory):
+        svc = storage_factory(prefix="app")
+        await svc.set_many({"a": "1", "b": "2"})
+
+        result = await svc.get_many(["a", "b", "missing"])
+
+        assert result == {"a": "1", "b": "2", "missing": None}
+        assert client.calls == ["set_many", "get_many"]
+
+    async def test_contains_and_remove_many(self, client, storage_factory):
+        svc = storage_factory(prefix="app")
+        await svc.set_many({"a": "1", "b": "2"})
+
+        assert await svc.contains_many(["a", "x"]) == {"a": True, "x": False}
+        assert await svc.remove_many(["a", "b"]) == {"a": True, "b": True}
+        assert client.storage == {}
+
+    async def test_contains_many_sends_only_cache_misses(self, client, storage_factory):
+        svc = storage_factory(prefix="app", cache=CacheOptions())
+        await svc.set("a", "1")
+        assert await svc.contains_key("x") is False
+        client.calls.clear()
+
+        assert await svc.contains_many(["a", "x", "y"]) == {
+            "a": True,
+            "x": False,
+            "y": False,
+        }
+        assert client.calls == ["contains_many"]
+        assert await svc.contains_many(["a", "y"]) == {"a": True, "y": False}
+        assert client.calls == ["contains_many"]
+
+    async def test_contains_many_uses_key_index(self, client, storage_factory):
+        client.storage.update({"app.a": "1"})
+        svc = storage_factory(prefix="app", index_keys=True)
+
+        assert await svc.contains_many(["a", "b"]) == {"a": True, "b": False}
+        assert await svc.contains_many(["b"]) == {"b": False}
+        assert client.calls == ["list_keys"]
+
+    async def test_keys_keep_caller_form(self, storage_factory):
+        svc = storage_factory(prefix="app")
+        await svc.set_many({"app.a": "1"})
+
+        assert await svc.get_many(["app.a"]) == {"app.a": "1"}
+        assert await svc.get_many(["a"]) == {"a": "1"}
+
+    async def test_invalid_keys(self, storage_factory):
+        svc = storage_factory()
+        with pytest.raises(ValueError, match="Key cannot be empty"):
+            await svc.get_many(["ok", " "])
+        with pytest.raises(ValueError, match="collection of strings"):
+            await svc.remove_many("abc")
+        with pytest.raises(ValueError, match="must be a mapping"):
+            await svc.set_many(["a", "b"])  # type: ignore
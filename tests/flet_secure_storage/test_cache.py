@@ -0,0 +1,116 @@
+import asyncio
+
+import pytest
+
+from flet_secure_storage import CacheOptions
+from flet_secure_storage.cache import CacheState, ValueCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.smoke
+class TestValueCache:
+    def test_ttl_and_stale_window(self):
+        clock = FakeClock()
+        cache = ValueCache(CacheOptions(ttl=10, stale_ttl=5), clock=clock)
+        cache.store("a", "1", cache.begin())
+
+        assert cache.lookup("a") == (CacheState.FRESH, "1")
+        clock.now = 12
+        assert cache.lookup("a") == (CacheState.STALE, "1")
+        clock.now = 16
+        assert cache.lookup("a") == (CacheState.MISS, None)
+
+        stats = cache.stats
+        assert (stats.hits, stats.stale_hits, stats.misses) == (1, 1, 1)
+
+    def test_lru_bounds(self):
+        cache = ValueCache(CacheOptions(max_entries=2, max_bytes=10))
+        cache.store("a", "1", cache.begin())
+        cache.store("b", "2", cache.begin())
+        cache.lookup("a")
+        cache.store("c", "3", cache.begin())
+
+        assert cache.lookup("b")[0] is CacheState.MISS
+        assert cache.lookup("a")[0] is CacheState.FRESH
+
+        cache.store("d", "123456789", cache.begin())
+        assert cache.stats.bytes <= 10
+        assert cache.stats.evictions == 3
+
+    def test_invalidated_fetch_is_not_stored(self):
+        cache = ValueCache(CacheOptions())
+        token = cache.begin()
+        cache.invalidate("a")
+        cache.store("a", "old", token)
+
+        assert cache.lookup("a")[0] is CacheState.MISS
+
+    def test_exists_entry_does_not_answer_get(self):
+        cache = ValueCache(CacheOptions())
+        cache.store_exists("a", True, cache.begin())
+        cache.store_exists("b", False, cache.begin())
+
+        assert cache.lookup_exists("a") == (CacheState.FRESH, True)
+        assert cache.lookup("a")[0] is CacheState.MISS
+        assert cache.lookup("b") == (CacheState.FRESH, None)
+
+
+@pytest.mark.asyncio
+@pytest.mark.smoke
+class TestSecureStorageCache:
+    async def test_get_is_served_from_cache(self, client, storage_factory):
+        svc = storage_factory(prefix="app", cache=CacheOptions())
+        await svc.set("key", "value")
+
+        assert await svc.get("key") == "value"
+        assert await svc.get("key") == "value"
+        assert await svc.contains_key("key") is True
+        assert client.calls == ["set", "get"]
+        assert svc.cache_stats.hits == 2
+
+    async def test_writes_invalidate(self, client, storage_factory):
+        svc = storage_factory(cache=CacheOptions())
+        await svc.set("key", "one")
+        await svc.get("key")
+        await svc.set("key", "two")
+        assert await svc.get("key") == "two"
+
+        await svc.remove("key")
+        assert await svc.get("key") is None
+
+        await svc.set("key", "three")
+        await svc.get("key")
+        await svc.clear()
+        assert await svc.contains_key("key") is False
+
+    async def test_get_many_only_fetches_misses(self, client, storage_factory):
+        svc = storage_factory(cache=CacheOptions())
+        await svc.set_many({"a": "1", "b": "2"})
+        await svc.get("a")
+        client.calls.clear()
+
+        assert await svc.get_many(["a", "b"]) == {"a": "1", "b": "2"}
+        assert client.calls == ["get_many"]
+
+    async def test_stale_while_revalidate(self, client, storage_factory):
+        clock = FakeClock()
+        svc = storage_factory(cache=CacheOptions(ttl=1, stale_ttl=10))
+        svc._cache._clock = clock
+        await svc.set("key", "old")
+        await svc.get("key")
+        client.storage["key"] = "new"
+
+        clock.now = 5
+        assert await svc.get("key") == "old"
+        await asyncio.gather(*svc._refresh_tasks.values())
+        assert await svc.get("key") == "new"
+
+    async def test_disabled_by_default(self, storage_factory):
+        assert storage_factory().cache_stats is None
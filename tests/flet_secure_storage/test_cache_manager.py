@@ -0,0 +1,112 @@
+import gc
+from types import SimpleNamespace
+
+import pytest
+
+from flet_secure_storage import CacheManager, CacheOptions, SecureStorage
+from flet_secure_storage.cache import CacheState, ValueCache
+
+
+@pytest.mark.smoke
+class TestCacheManager:
+    def test_evicts_least_recently_used_across_caches(self):
+        manager = CacheManager(max_bytes=6)
+        options = CacheOptions(manager=manager)
+        first, second = ValueCache(options), ValueCache(options)
+        first.store("a", "1", first.begin())
+        second.store("b", "2", second.begin())
+        first.store("c", "3", first.begin())
+        first.lookup("a")
+
+        second.store("d", "4", second.begin())
+        assert manager.bytes == 6
+        assert second.lookup("b")[0] is CacheState.MISS
+        assert first.lookup("a")[0] is CacheState.FRESH
+        assert second.stats.evictions == 1
+        assert first.stats.evictions == 0
+
+    def test_reports_usage_per_cache(self):
+        manager = CacheManager(max_bytes=100)
+        options = CacheOptions(manager=manager)
+        first, second = ValueCache(options), ValueCache(options)
+        first.name, second.name = "s1", "s2"
+        first.store("a", "123", first.begin())
+        second.store("b", "1", second.begin())
+
+        usage = manager.usage()
+        assert (usage["s1"].bytes, usage["s2"].bytes) == (4, 2)
+        assert manager.bytes == 6
+
+        first.invalidate("a")
+        second.clear()
+        assert manager.bytes == 0
+
+    def test_close_releases_entries(self):
+        manager = CacheManager(max_bytes=100)
+        cache = ValueCache(CacheOptions(manager=manager))
+        cache.store("a", "1", cache.begin())
+
+        cache.close()
+        assert manager.bytes == 0
+        assert manager.usage() == {}
+
+        cache.reopen()
+        cache.store("a", "1", cache.begin())
+        assert manager.bytes == 2
+
+    def test_collected_cache_is_released(self):
+        manager = CacheManager(max_bytes=100)
+        cache = ValueCache(CacheOptions(manager=manager))
+        cache.store("a", "1", cache.begin())
+
+        del cache
+        gc.collect()
+        assert manager.bytes == 0
+        assert manager.usage() == {}
+
+    def test_caches_share_the_default_manager(self):
+        first, second = ValueCache(CacheOptions()), ValueCache(CacheOptions())
+        assert first.options.manager is CacheManager.default()
+        assert second.options.manager is CacheManager.default()
+
+        before = CacheManager.default().bytes
+        first.store("a", "1", first.begin())
+        second.store("b", "2", second.begin())
+        assert CacheManager.default().bytes == before + 4
+
+        first.close()
+        second.close()
+        assert CacheManager.default().bytes == before
+
+    def test_validates_arguments(self):
+        with pytest.raises(ValueError):
+            CacheManager(max_bytes=0)
+        with pytest.raises(TypeError):
+            CacheOptions(manager=object())  # type: ignore[arg-type]
+
+
+@pytest.mark.asyncio
+@pytest.mark.smoke
+class TestSecureStorageCacheManager:
+    async def test_sessions_share_the_budget(
+        self, client, storage_factory, monkeypatch
+    ):
+        page = SimpleNamespace(session=SimpleNamespace(id="session-1"))
+        monkeypatch.setattr(SecureStorage, "page", property(lambda self: page))
+        options = CacheOptions(manager=CacheManager(max_bytes=1024))
+        svc = storage_factory(cache=options)
+        svc.did_mount()
+        client.storage["a"] = "1"
+        await svc.get("a")
+
+        usage = options.manager.usage()
+        assert list(usage) == [f"session-1:{svc._i}"]
+        assert usage[f"session-1:{svc._i}"].bytes == 2
+
+        svc.will_unmount()
+        assert options.manager.bytes == 0
+        assert options.manager.usage() == {}
+
+        svc.did_mount()
+        await svc.get("a")
+        assert options.manager.bytes == 2
@@ -0,0 +1,74 @@
+import pytest
+
+from flet_secure_storage import CacheOptions, WriteBehindOptions
+
+
+@pytest.mark.asyncio
+@pytest.mark.smoke
+class TestClearPrefix:
+    async def test_deletes_matching_keys_in_one_call(self, client, storage_factory):
+        client.storage.update({"user.a": "1", "user.b": "2", "other": "3"})
+        svc = storage_factory()
+
+        assert await svc.clear_prefix("user.") == 2
+        assert client.storage == {"other": "3"}
+        assert client.calls == ["clear_prefix"]
+
+    async def test_clear_with_prefix_keeps_other_keys(self, client, storage_factory):
+        client.storage.update({"app.a": "1", "apple": "2", "other": "3"})
+        svc = storage_factory(prefix="app")
+
+        assert await svc.clear() is True
+        assert client.storage == {"apple": "2", "other": "3"}
+        assert "clear" not in client.calls
+
+    async def test_instance_prefix_keeps_keys_sharing_its_start(
+        self, client, storage_factory
+    ):
+        client.storage.update({"app.a": "1", "apple.b": "2", "apple": "3"})
+        svc = storage_factory(prefix="app")
+
+        assert await svc.clear_prefix("app") == 1
+        assert client.storage == {"apple.b": "2", "apple": "3"}
+        assert await svc.list_keys() == []
+
+    async def test_clear_without_prefix_deletes_everything(
+        self, client, storage_factory
+    ):
+        client.storage.update({"a": "1", "b": "2"})
+        assert await storage_factory().clear() is True
+        assert client.storage == {}
+        assert client.calls == ["clear"]
+
+    async def test_empty_prefix_requires_prefix_option(self, storage_factory):
+        with pytest.raises(ValueError):
+            await storage_factory().clear_prefix("")
+
+    async def test_invalidates_cached_keys_under_prefix(self, client, storage_factory):
+        client.storage.update({"user.a": "1", "other": "2"})
+        svc = storage_factory(cache=CacheOptions())
+        await svc.get_many(["user.a", "other"])
+
+        await svc.clear_prefix("user.")
+        client.calls.clear()
+
+        assert await svc.get("user.a") is None
+        assert await svc.get("other") == "2"
+        assert client.calls == ["get"]
+
+    async def test_drops_buffered_changes_under_prefix(self, client, storage_factory):
+        svc = storage_factory(write_behind=WriteBehindOptions(flush_interval=60))
+        await svc.set("user.a", "1")
+        await svc.set("other", "2")
+
+        await svc.clear_prefix("user.")
+        await svc.flush()
+
+        assert client.storage == {"other": "2"}
+
+    async def test_updates_key_index(self, client, storage_factory):
+        client.storage.update({"user.a": "1", "user.b": "2", "other": "3"})
+        svc = storage_factory(index_keys=True)
+
+        await svc.clear_prefix("user")
+        assert await svc.list_keys() == ["other"]
@@ -0,0 +1,77 @@
+import pytest
+
+from flet_secure_storage import CompressionOptions
+from flet_secure_storage.compression import HEADER, decode_value, encode_value
+
+LARGE = "value " * 1000
+
+
+@pytest.mark.smoke
+class TestCompressionFormat:
+    def test_small_values_are_not_compressed(self):
+        assert encode_value("value", CompressionOptions(threshold=16)) == "value"
+
+    @pytest.mark.parametrize("algorithm", ["zlib", "lzma"])
+    def test_round_trip(self, algorithm):
+        encoded = encode_value(LARGE, CompressionOptions(algorithm=algorithm))
+        assert encoded.startswith(HEADER)
+        assert len(encoded) < len(LARGE)
+        assert decode_value(encoded) == LARGE
+
+    def test_incompressible_values_are_stored_plain(self):
+        value = "".join(chr(0x4E00 + (i * 7919) % 20000) for i in range(2000))
+        assert encode_value(value, CompressionOptions(threshold=0)) == value
+
+    def test_values_starting_with_header_are_escaped(self):
+        value = f"{HEADER}z:not-base64"
+        encoded = encode_value(value, None)
+        assert encoded != value
+        assert decode_value(encoded) == value
+
+    def test_values_without_header_are_unchanged(self):
+        assert decode_value("plain") == "plain"
+        assert decode_value(None) is None
+
+    def test_invalid_options(self):
+        with pytest.raises(ValueError):
+            CompressionOptions(threshold=-1)
+        with pytest.raises(ValueError):
+            CompressionOptions(algorithm="gzip")
+
+
+@pytest.mark.asyncio
+@pytest.mark.smoke
+class TestCompressedStorage:
+    async def test_large_values_are_compressed_on_the_client(
+        self, client, storage_factory
+    ):
+        svc = storage_factory(compression=CompressionOptions(threshold=1024))
+        await svc.set("big", LARGE)
+        await svc.set("small", "value")
+
+        assert client.storage["big"].startswith(HEADER)
+        assert client.storage["small"] == "value"
+        assert await svc.get("big") == LARGE
+        assert await svc.get("small") == "value"
+
+    async def test_bulk_and_listing_reads_decompress(self, client, storage_factory):
+        svc = storage_factory(compression=CompressionOptions(threshold=1024))
+        await svc.set_many({"a": LARGE, "b": "value"})
+
+        assert client.storage["a"].startswith(HEADER)
+        assert await svc.get_many(["a", "b"]) == {"a": LARGE, "b": "value"}
+        assert await svc.items() == {"a": LARGE, "b": "value"}
+        assert f"a:{LARGE}" in await svc.get_keys("")
+        page = await svc.scan(include_values=True)
+        assert page.items == {"a": LARGE, "b": "value"}
+
+    async def test_reads_values_written_without_compression(
+        self, client, storage_factory
+    ):
+        client.storage["old"] = LARGE
+        svc = storage_factory(compression=CompressionOptions(threshold=1024))
+        assert await svc.get("old") == LARGE
+
+    async def test_rejects_invalid_compression(self, storage_factory):
+        with pytest.raises(TypeError):
+            storage_factory(compression={"threshold": 10})
@@ -0,0 +1,118 @@
+import asyncio
+
+import pytest
+
+from flet_secure_storage import CacheOptions, SecureStorageChangeEvent
+
+
+def _event(svc, kind, *keys):
+    return SecureStorageChangeEvent(
+        name="change", control=svc, kind=kind, keys=list(keys)
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.smoke
+class TestChangeEvents:
+    async def test_on_change_is_set_from_the_constructor(self, storage_factory):
+        def handler(e):
+            pass
+
+        assert storage_factory(on_change=handler).on_change is handler
+        assert storage_factory().on_change is None
+
+    async def test_changes_reach_every_instance(self, client, storage_factory):
+        received = []
+        writer = storage_factory()
+        storage_factory(on_change=lambda e: received.append((e.kind, e.keys)))
+
+        await writer.set("a", "1")
+        await writer.remove("a")
+
+        assert received == [("set", ["a"]), ("remove", ["a"])]
+
+    async def test_changes_drop_cached_values(self, client, storage_factory):
+        svc = storage_factory(cache=CacheOptions())
+        client.storage["a"] = "1"
+        assert await svc.get("a") == "1"
+
+        client.storage["a"] = "2"
+        assert svc.before_event(_event(svc, "set", "a")) is True
+        assert await svc.get("a") == "2"
+
+    async def test_clear_drops_every_cached_value(self, client, storage_factory):
+        svc = storage_factory(cache=CacheOptions())
+        client.storage.update({"a": "1", "b": "2"})
+        await svc.get_many(["a", "b"])
+
+        client.storage.clear()
+        svc.before_event(_event(svc, "clear"))
+        assert await svc.get_many(["a", "b"]) == {"a": None, "b": None}
+
+    async def test_changes_update_the_key_index(self, client, storage_factory):
+        svc = storage_factory(prefix="app", index_keys=True)
+        await svc.set("a", "1")
+        assert await svc.list_keys() == ["app.a"]
+
+        svc.before_event(_event(svc, "set", "app.b", "other.c"))
+        svc.before_event(_event(svc, "remove", "app.a"))
+        assert await svc.list_keys() == ["app.b"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.smoke
+class TestWatch:
+    async def test_yields_changes_under_the_prefix(self, storage_factory):
+        svc = storage_factory()
+        watch = svc.watch("session")
+        pending = asyncio.ensure_future(watch.__anext__())
+        await asyncio.sleep(0)
+
+        svc.before_event(_event(svc, "set", "other"))
+        svc.before_event(_event(svc, "set", "session.token", "other"))
+        event = await pending
+        assert (event.kind, event.keys) == ("set", ["session.token"])
+
+        svc.before_event(_event(svc, "clear"))
+        event = await watch.__anext__()
+        assert (event.kind, event.keys) == ("clear", [])
+        await watch.aclose()
+
+    async def test_uses_the_instance_prefix(self, storage_factory):
+        svc = storage_factory(prefix="app")
+        watch = svc.watch()
+        pending = asyncio.ensure_future(watch.__anext__())
+        await asyncio.sleep(0)
+
+        svc.before_event(_event(svc, "remove", "other.a", "app.a"))
+        assert (await pending).keys == ["app.a"]
+        await watch.aclose()
+
+    async def test_turns_change_events_on_while_watching(self, storage_factory):
+        svc = storage_factory()
+        watch = svc.watch()
+        pending = asyncio.ensure_future(watch.__anext__())
+        await asyncio.sleep(0)
+        assert svc.on_change is not None
+
+        pending.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await pending
+        await watch.aclose()
+        assert svc.on_change is None
+        assert svc._watchers == []
+
+    async def test_keeps_the_user_handler(self, storage_factory):
+        def handler(e):
+            pass
+
+        svc = storage_factory(on_change=handler)
+        watch = svc.watch()
+        pending = asyncio.ensure_future(watch.__anext__())
+        await asyncio.sleep(0)
+        assert svc.on_change is handler
+
+        svc.before_event(_event(svc, "set", "a"))
+        await pending
+        await watch.aclose()
+        assert svc.on_change is handler
@@ -0,0 +1,120 @@
+import copy
+import pickle
+from dataclasses import FrozenInstanceError, dataclass
+
+import pytest
+
+from flet_secure_storage import (
+    AccessControlFlag,
+    AndroidOptions,
+    FrozenOptions,
+    IOSOptions,
+    LinuxOptions,
+    MacOsOptions,
+    SecureStorage,
+    WebOptions,
+    WindowsOptions,
+)
+
+
+@dataclass
+class CountingOptions:
+    value: str = "a"
+    calls: int = 0
+
+    def options(self):
+        self.calls += 1
+        return {"value": self.value}
+
+
+@pytest.mark.smoke
+class TestFrozenOptions:
+    @pytest.mark.parametrize(
+        "options",
+        [
+            AndroidOptions(reset_on_error=False),
+            IOSOptions(label="app"),
+            MacOsOptions(uses_data_protection_keychain=False),
+            WebOptions(db_name="app"),
+            WindowsOptions(use_backward_compatibility=True),
+            LinuxOptions(),
+        ],
+    )
+    def test_serializes_like_the_options(self, options):
+        frozen = options.freeze()
+        assert isinstance(frozen, FrozenOptions)
+        assert frozen.options_type is type(options)
+        assert dict(frozen.options()) == options.options()
+
+    def test_is_read_only(self):
+        frozen = IOSOptions(access_control_flags=[AccessControlFlag.watch]).freeze()
+        assert frozen.label == ""
+        with pytest.raises(FrozenInstanceError):
+            frozen.label = "app"
+        with pytest.raises(TypeError):
+            frozen.options()["label"] = "app"
+
+        frozen.access_control_flags.append(AccessControlFlag.AND)
+        assert frozen.options()["accessControlFlags"] == ["watch"]
+
+    def test_copies_the_options(self):
+        options = WebOptions(db_name="app")
+        frozen = options.freeze()
+        options.db_name = "other"
+        assert frozen.db_name == "app"
+
+        thawed = frozen.thaw()
+        thawed.db_name = "changed"
+        assert frozen.db_name == "app"
+
+    def test_equality_and_hashing(self):
+        a = IOSOptions(access_control_flags=[AccessControlFlag.watch]).freeze()
+        b = IOSOptions(access_control_flags=[AccessControlFlag.watch]).freeze()
+        assert a == b and hash(a) == hash(b)
+        assert (
+            a != MacOsOptions(access_control_flags=[AccessControlFlag.watch]).freeze()
+        )
+        assert len({a, b}) == 1
+
+    def test_copy_and_pickle(self):
+        frozen = AndroidOptions(reset_on_error=False).freeze()
+        assert copy.deepcopy(frozen) is frozen
+        assert pickle.loads(pickle.dumps(frozen)) == frozen
+
+
+@pytest.mark.smoke
+class TestBeforeUpdate:
+    def test_serializes_unchanged_options_once(self):
+        options = CountingOptions()
+        svc = SecureStorage(a_options=options)  # type: ignore[arg-type]
+        svc.before_update()
+        svc.before_update()
+        assert options.calls == 1
+        assert svc._platform_options["a_options"] == {"value": "a"}
+
+    def test_serializes_changed_options_again(self):
+        options = CountingOptions()
+        svc = SecureStorage(a_options=options)  # type: ignore[arg-type]
+        svc.before_update()
+
+        options.value = "b"
+        svc.before_update()
+        assert svc._platform_options["a_options"] == {"value": "b"}
+
+        svc.a_options = CountingOptions(value="c")  # type: ignore[assignment]
+        svc.before_update()
+        assert svc._platform_options["a_options"] == {"value": "c"}
+
+    def test_keeps_the_options_objects(self):
+        frozen = AndroidOptions(reset_on_error=False).freeze()
+        svc = SecureStorage(a_options=frozen)
+        svc.before_update()
+        assert svc.a_options is frozen
+        assert svc._platform_options["a_options"] is frozen.options()
+
+    def test_notices_lists_changed_in_place(self):
+        svc = SecureStorage()
+        svc.before_update()
+        svc.i_options.access_control_flags.append(AccessControlFlag.watch)
+        svc.before_update()
+        assert svc._platform_options["i_options"]["accessControlFlags"] == ["watch"]
@@ -0,0 +1,136 @@
+import pytest
+
+from flet_secure_storage import (
+    HashedKeyOptions,
+    MemoryBackend,
+    SecureStorage,
+    SecureStorageChangeEvent,
+)
+from flet_secure_storage.hashed_keys import HEADER, MARK
+
+URL = "https://example.com/a/very/long/path?with=query&and=more"
+
+
+@pytest.mark.asyncio
+@pytest.mark.smoke
+class TestHashedKeys:
+    async def test_stores_a_short_hash_below_the_prefix(self, client, storage_factory):
+        svc = storage_factory(prefix="app", hashed_keys=HashedKeyOptions())
+        await svc.set(URL, "v")
+
+        [stored] = client.storage
+        assert stored.startswith(f"app.{MARK}") and len(stored) == len("app.#") + 16
+        assert client.storage[stored] == f"{HEADER}{len(URL)}:{URL}v"
+        assert await svc.get(URL) == "v"
+        assert await svc.contains_key(URL) is True
+
+    async def test_hashes_are_stable(self, client, storage_factory):
+        await storage_factory(prefix="app", hashed_keys=HashedKeyOptions()).set(
+            URL, "v"
+        )
+        other = storage_factory(prefix="app", hashed_keys=HashedKeyOptions())
+        assert await other.get(URL) == "v"
+
+    async def test_reads_plain_keys_written_before(self, client, storage_factory):
+        client.storage.update({"app.old": "1", "app.both": "plain"})
+        svc = storage_factory(prefix="app", hashed_keys=HashedKeyOptions())
+        await svc.set("both", "hashed")
+
+        assert await svc.get("old") == "1"
+        assert await svc.get("both") == "hashed"
+        assert await svc.contains_key("old") is True
+        assert await svc.get_many(["old", "both", "none"]) == {
+            "old": "1",
+            "both": "hashed",
+            "none": None,
+        }
+
+        await svc.remove("both")
+        assert await svc.get("both") is None
+        assert "app.both" not in client.storage
+
+    async def test_plain_keys_can_be_ignored(self, client, storage_factory):
+        client.storage["app.old"] = "1"
+        svc = storage_factory(
+            prefix="app", hashed_keys=HashedKeyOptions(read_plain_keys=False)
+        )
+        assert await svc.get("old") is None
+
+    async def test_listings_return_logical_keys(self, client, storage_factory):
+        client.storage.update({"app.user.legacy": "0", "app.user.a": "stale"})
+        svc = storage_factory(prefix="app", hashed_keys=HashedKeyOptions())
+        await svc.set_many({"user.a": "1", "user.b": "2", "session": "s"})
+
+        assert sorted(await svc.list_keys("user")) == [
+            "app.user.a",
+            "app.user.b",
+            "app.user.legacy",
+        ]
+        assert await svc.items("user.") == {
+            "app.user.legacy": "0",
+            "app.user.a": "1",
+            "app.user.b": "2",
+        }
+        assert await svc.count() == 4
+        assert sorted(await svc.get_keys("session")) == ["app.session:s"]
+
+        page = await svc.scan("user", limit=2, include_values=True)
+        assert page.keys == ["app.user.a", "app.user.b"]
+        assert page.items == {"app.user.a": "1", "app.user.b": "2"}
+        assert page.cursor == "app.user.b"
+
+    async def test_without_reverse_mapping_listings_show_hashes(
+        self, client, storage_factory
+    ):
+        svc = storage_factory(
+            prefix="app", hashed_keys=HashedKeyOptions(reverse_mapping=False)
+        )
+        await svc.set(URL, "v")
+        assert await svc.get(URL) == "v"
+        assert await svc.list_keys() == list(client.storage)
+        assert URL not in next(iter(client.storage.values()))
+
+    async def test_clear_prefix_removes_hashed_and_plain_keys(
+        self, client, storage_factory
+    ):
+        client.storage.update({"app.user.legacy": "0", "app.session": "s"})
+        svc = storage_factory(prefix="app", hashed_keys=HashedKeyOptions())
+        await svc.set("user.a", "1")
+
+        assert await svc.clear_prefix("user") == 2
+        assert await svc.items() == {"app.session": "s"}
+
+    async def test_transactions_and_index(self, client, storage_factory):
+        svc = storage_factory(
+            prefix="app", index_keys=True, hashed_keys=HashedKeyOptions()
+        )
+        async with svc.transaction() as tx:
+            tx.set("a", "1")
+            tx.set("b", "2")
+        assert all(MARK in key for key in client.storage)
+        assert sorted(await svc.list_keys()) == ["app.a", "app.b"]
+        assert await svc.get("a") == "1"
+
+    async def test_change_events_use_logical_keys(self, client, storage_factory):
+        svc = storage_factory(prefix="app", hashed_keys=HashedKeyOptions())
+        await svc.set("a", "1")
+        [stored] = client.storage
+
+        event = SecureStorageChangeEvent(
+            name="change", control=svc, kind="set", keys=[stored]
+        )
+        svc.before_event(event)
+        assert event.keys == ["app.a"]
+
+    async def test_memory_backend(self):
+        svc = SecureStorage(backend=MemoryBackend(), hashed_keys=HashedKeyOptions())
+        await svc.set(URL, "v")
+        assert await svc.items() == {URL: "v"}
+        assert await svc.remove(URL) is True
+        assert await svc.items() == {}
+
+    async def test_invalid_options(self):
+        with pytest.raises(ValueError):
+            HashedKeyOptions(digest_size=4)
+        with pytest.raises(TypeError):
+            SecureStorage(hashed_keys={"digest_size": 12})  # type: ignore[arg-type]
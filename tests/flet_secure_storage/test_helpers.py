@@ -1,8 +1,16 @@
+from dataclasses import dataclass
+from datetime import datetime
 from enum import Enum
 
 import pytest
 
-from flet_secure_storage._helpers import add_prefix, parse_bool, parse_enum, parse_str
+from flet_secure_storage._helpers import (
+    add_prefix,
+    is_immutable,
+    parse_bool,
+    parse_enum,
+    parse_str,
+)
 
 
 @pytest.mark.smoke
@@ -70,3 +78,25 @@ def test_add_prefix():
     assert add_prefix("app", "&", "key") == "app&key"
     assert add_prefix("app", "longprefix", "key") == "applongprefixkey"
     assert add_prefix("app", 7, "key") == "app7key"
+
+
+@pytest.mark.smoke
+def test_is_immutable():
+    @dataclass(frozen=True)
+    class Point:
+        x: int
+        tags: tuple = ()
+
+    @dataclass
+    class Box:
+        x: int
+
+    assert is_immutable(1) and is_immutable("a") and is_immutable(None)
+    assert is_immutable(datetime(2024, 1, 1))
+    assert is_immutable((1, ("a", 2.0)))
+    assert is_immutable(Point(1, ("a",)))
+    assert not is_immutable({"a": 1})
+    assert not is_immutable([1])
+    assert not is_immutable((1, [2]))
+    assert not is_immutable(Point(1, ([],)))
+    assert not is_immutable(Box(1))
@@ -0,0 +1,70 @@
+import pytest
+
+from flet_secure_storage.key_index import KeyIndex
+
+
+@pytest.mark.smoke
+class TestKeyIndex:
+    def test_prefix_queries(self):
+        index = KeyIndex(".", ["user.a.x", "user.a.y", "user.b", "users", "cfg"])
+
+        assert len(index) == 5
+        assert index.contains("user.b") and not index.contains("user.a")
+        assert sorted(index.keys("user.")) == ["user.a.x", "user.a.y", "user.b"]
+        assert sorted(index.keys("user")) == ["user.a.x", "user.a.y", "user.b", "users"]
+        assert index.count("user.a") == 2
+        assert index.count("us") == 4
+        assert index.children() == ["cfg", "user", "users"]
+        assert index.children("user") == ["a", "b"]
+
+    def test_remove_prunes_empty_branches(self):
+        index = KeyIndex(".", ["a.b.c", "a.d"])
+
+        assert index.remove("a.b.c") is True
+        assert index.remove("a.b.c") is False
+        assert index.children("a") == ["d"]
+        assert index.count() == 1
+
+        index.clear("a.")
+        assert len(index) == 0 and index.children() == []
+
+
+@pytest.fixture
+def populated(client):
+    client.storage.update({"app.user.a": "1", "app.user.b": "2", "app.cfg.x": "3"})
+    return client
+
+
+@pytest.mark.asyncio
+@pytest.mark.smoke
+class TestSecureStorageIndex:
+    async def test_index_answers_locally(self, populated, storage_factory):
+        svc = storage_factory(prefix="app", index_keys=True)
+
+        assert await svc.contains_key("user.a") is True
+        assert await svc.contains_key("user.z") is False
+        assert await svc.count("user") == 2
+        assert await svc.list_keys("cfg") == ["app.cfg.x"]
+        assert await svc.list_children() == ["cfg", "user"]
+        assert populated.calls == ["list_keys"]
+
+    async def test_index_follows_writes(self, populated, storage_factory):
+        svc = storage_factory(prefix="app", index_keys=True)
+        await svc.count()
+
+        await svc.set("user.c", "4")
+        await svc.remove("user.a")
+        await svc.set_many({"new.k": "5"})
+
+        assert await svc.list_children("user") == ["b", "c"]
+        assert await svc.list_children() == ["cfg", "new", "user"]
+        assert populated.calls.count("list_keys") == 1
+
+        await svc.clear()
+        assert await svc.count() == 0
+
+    async def test_list_children_without_index(self, populated, storage_factory):
+        svc = storage_factory(prefix="app")
+
+        assert await svc.list_children("user") == ["a", "b"]
+        assert await svc.list_children() == ["cfg", "user"]
@@ -0,0 +1,53 @@
+import subprocess
+import sys
+
+import pytest
+
+import flet_secure_storage
+from flet_secure_storage import backends, options
+
+
+def _loaded_after(statement: str) -> set[str]:
+    # A fresh interpreter, since this one already imported everything
+    code = f"import sys\n{statement}\nprint(' '.join(sys.modules))"
+    completed = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, check=True, text=True
+    )
+    return set(completed.stdout.split())
+
+
+# Not smoke tests: each one starts a fresh interpreter
+class TestImportTime:
+    def test_package_import_loads_no_submodules(self):
+        modules = _loaded_after("import flet_secure_storage")
+        assert "flet" not in modules
+        assert "flet_secure_storage.secure_storage" not in modules
+        assert "flet_secure_storage.options" not in modules
+
+    def test_options_load_only_the_platform_used(self):
+        modules = _loaded_after("from flet_secure_storage.options import LinuxOptions")
+        assert "flet_secure_storage.options.linux_options" in modules
+        assert "flet_secure_storage.options.android_options" not in modules
+        assert "flet" not in modules
+
+
+@pytest.mark.smoke
+class TestLazyImports:
+    @pytest.mark.parametrize("module", [flet_secure_storage, options, backends])
+    def test_every_public_name_resolves(self, module):
+        for name in module.__all__:
+            assert getattr(module, name) is not None
+            assert name in dir(module)
+
+    @pytest.mark.parametrize("module", [flet_secure_storage, options, backends])
+    def test_unknown_names_raise(self, module):
+        with pytest.raises(AttributeError):
+            module.NotAName
+
+    def test_names_are_the_submodule_objects(self):
+        from flet_secure_storage.options.android_options import AndroidOptions
+        from flet_secure_storage.secure_storage import SecureStorage
+
+        assert flet_secure_storage.SecureStorage is SecureStorage
+        assert flet_secure_storage.AndroidOptions is AndroidOptions
+        assert options.AndroidOptions is AndroidOptions
@@ -0,0 +1,80 @@
+import pytest
+
+from flet_secure_storage import CallRecord
+from flet_secure_storage.metrics import LatencyHistogram
+
+
+@pytest.mark.smoke
+class TestLatencyHistogram:
+    def test_percentiles_are_within_one_bucket(self):
+        histogram = LatencyHistogram()
+        for ms in range(1, 101):
+            histogram.record(ms / 1000)
+
+        assert histogram.count == 100
+        assert 0.050 <= histogram.percentile(0.50) <= 0.050 * 1.25
+        assert 0.095 <= histogram.percentile(0.95) <= 0.095 * 1.25
+        assert histogram.percentile(0.99) <= histogram.max == 0.1
+
+    def test_empty(self):
+        assert LatencyHistogram().percentile(0.5) == 0.0
+
+
+@pytest.mark.asyncio
+@pytest.mark.smoke
+class TestStorageMetrics:
+    async def test_disabled_by_default(self, storage_factory):
+        svc = storage_factory()
+        await svc.set("key", "value")
+        assert svc.metrics is None
+
+    async def test_records_each_method(self, storage_factory):
+        svc = storage_factory(metrics=True)
+        await svc.set("key", "value")
+        await svc.get("key")
+        await svc.get("missing")
+
+        snapshot = svc.metrics.snapshot()
+        assert set(snapshot) == {"set", "get"}
+        assert snapshot["get"]["count"] == 2
+        assert snapshot["get"]["errors"] == 0
+        assert snapshot["set"]["request_bytes"] > 0
+        assert snapshot["get"]["response_bytes"] == len("value")
+        assert (
+            0
+            <= snapshot["get"]["latency_p50"]
+            <= snapshot["get"]["latency_p99"]
+            <= snapshot["get"]["latency_max"]
+        )
+
+    async def test_records_errors_and_calls_listeners(self, storage_factory):
+        svc = storage_factory(metrics=True)
+        records: list[CallRecord] = []
+        svc.metrics.add_listener(records.append)
+
+        async def failing(name, args=None):
+            raise RuntimeError("channel closed")
+
+        svc._invoke_method = failing
+        with pytest.raises(RuntimeError):
+            await svc.get("key")
+
+        assert svc.metrics.snapshot()["get"]["errors"] == 1
+        assert [record.method for record in records] == ["get"]
+        assert isinstance(records[0].error, RuntimeError)
+
+    async def test_failing_listener_does_not_break_calls(self, storage_factory):
+        svc = storage_factory(metrics=True)
+
+        def broken(record):
+            raise ValueError("broken")
+
+        svc.metrics.add_listener(broken)
+        with pytest.warns(RuntimeWarning):
+            assert await svc.set("key", "value") is True
+
+    async def test_reset(self, storage_factory):
+        svc = storage_factory(metrics=True)
+        await svc.get("key")
+        svc.metrics.reset()
+        assert svc.metrics.snapshot() == {}
@@ -0,0 +1,65 @@
+import pytest
+
+from flet_secure_storage import CacheOptions, SecureStorageNamespace
+
+
+@pytest.mark.asyncio
+@pytest.mark.smoke
+class TestNamespace:
+    async def test_keys_are_scoped(self, client, storage_factory):
+        svc = storage_factory(prefix="app")
+        billing = svc.namespace("billing")
+        assert isinstance(billing, SecureStorageNamespace)
+
+        assert await billing.set("card", "1234") is True
+        assert client.storage == {"app.billing.card": "1234"}
+        assert await billing.get("card") == "1234"
+        assert await billing.contains_key("card") is True
+        assert await svc.get("billing.card") == "1234"
+        assert await billing.remove("card") is True
+        assert client.storage == {}
+
+    async def test_nested_namespaces_use_prefix_separator(
+        self, client, storage_factory
+    ):
+        svc = storage_factory(prefix="app", prefix_separator="/")
+        invoices = svc.namespace("billing").namespace("invoices")
+        await invoices.set("1", "paid")
+        assert client.storage == {"app/billing/invoices/1": "paid"}
+
+    async def test_listings_stay_inside_the_namespace(self, client, storage_factory):
+        client.storage.update(
+            {"billing.a": "1", "billing.b": "2", "billing2.c": "3", "user.d": "4"}
+        )
+        billing = storage_factory().namespace("billing")
+
+        assert sorted(await billing.list_keys()) == ["billing.a", "billing.b"]
+        assert await billing.count() == 2
+        assert await billing.items("a") == {"billing.a": "1"}
+        assert sorted(await billing.get_keys()) == ["billing.a:1", "billing.b:2"]
+
+    async def test_clear_only_removes_the_namespace(self, client, storage_factory):
+        client.storage.update({"billing.a": "1", "billing2.c": "3", "user.d": "4"})
+        billing = storage_factory().namespace("billing")
+
+        assert await billing.clear() is True
+        assert client.storage == {"billing2.c": "3", "user.d": "4"}
+
+    async def test_bulk_calls_use_namespace_keys(self, client, storage_factory):
+        billing = storage_factory().namespace("billing")
+
+        assert await billing.set_many({"a": "1", "b": "2"}) == {"a": True, "b": True}
+        assert await billing.get_many(["a", "c"]) == {"a": "1", "c": None}
+        assert await billing.contains_many(["b"]) == {"b": True}
+        assert await billing.remove_many(["a"]) == {"a": True}
+        assert client.storage == {"billing.b": "2"}
+
+    async def test_shares_the_parent_cache(self, client, storage_factory):
+        svc = storage_factory(cache=CacheOptions())
+        await svc.namespace("billing").get("a")
+        await svc.get("billing.a")
+        assert client.calls == ["get"]
+
+    async def test_rejects_empty_names(self, storage_factory):
+        with pytest.raises(ValueError):
+            storage_factory().namespace(" ")
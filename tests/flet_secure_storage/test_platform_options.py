@@ -0,0 +1,106 @@
+from types import SimpleNamespace
+
+import flet as ft
+import pytest
+
+from flet_secure_storage import (
+    AndroidOptions,
+    IOSOptions,
+    LinuxOptions,
+    MacOsOptions,
+    SecureStorage,
+    WebOptions,
+    WindowsOptions,
+)
+
+
+@pytest.fixture
+def session(monkeypatch):
+    """
+    Puts every SecureStorage on a fake page; set `web` and `platform` on it.
+    """
+    page = SimpleNamespace(web=False, platform=ft.PagePlatform.ANDROID)
+    monkeypatch.setattr(SecureStorage, "page", property(lambda self: page))
+    return page
+
+
+@pytest.mark.smoke
+class TestPlatformOptions:
+    def test_sends_no_options_by_default(self, session):
+        svc = SecureStorage()
+        svc.before_update()
+        assert svc.options == {}
+
+    def test_sends_every_platform_that_was_set(self, session):
+        svc = SecureStorage(
+            i_options=IOSOptions(),
+            a_options=AndroidOptions(),
+            l_options=LinuxOptions(),
+            w_options=WindowsOptions(),
+            web_options=WebOptions(),
+            m_options=MacOsOptions(),
+        )
+        svc.before_update()
+        assert svc.options is not None
+        assert set(svc.options) == {
+            "iOptions",
+            "aOptions",
+            "lOptions",
+            "wOptions",
+            "webOptions",
+            "mOptions",
+        }
+
+    def test_sends_default_options_once_changed(self, session):
+        svc = SecureStorage()
+        svc.before_update()
+        svc.web_options.db_name = "app"
+        svc.before_update()
+        assert svc.options == {"webOptions": svc.web_options.options()}
+
+    def test_sends_only_the_native_platform(self, session):
+        svc = SecureStorage(
+            a_options=AndroidOptions(reset_on_error=False), active_platform_only=True
+        )
+        svc.before_update()
+        assert svc.options is not None
+        assert list(svc.options) == ["aOptions"]
+        assert svc.options["aOptions"]["resetOnError"] is False
+
+    def test_sends_only_the_web_options_on_the_web(self, session):
+        session.web = True
+        svc = SecureStorage(
+            web_options=WebOptions(db_name="app"), active_platform_only=True
+        )
+        svc.before_update()
+        assert svc.options == {"webOptions": WebOptions(db_name="app").options()}
+
+    def test_sends_every_platform_off_the_page(self):
+        svc = SecureStorage(
+            a_options=AndroidOptions(),
+            web_options=WebOptions(),
+            active_platform_only=True,
+        )
+        svc.before_update()
+        assert svc.options is not None
+        assert set(svc.options) == {"aOptions", "webOptions"}
+
+    def test_keeps_the_options_when_nothing_changed(self, session):
+        svc = SecureStorage(active_platform_only=True)
+        svc.before_update()
+        sent = svc.options
+        svc.before_update()
+        assert svc.options is sent
+
+        svc.a_options = AndroidOptions(reset_on_error=False)
+        svc.before_update()
+        assert svc.options is not sent
+        assert svc.options["aOptions"]["resetOnError"] is False
+
+    def test_drops_options_set_to_none(self, session):
+        svc = SecureStorage(m_options=MacOsOptions())
+        svc.before_update()
+        svc.m_options = None  # type: ignore[assignment]
+        svc.before_update()
+        assert svc.options is not None
+        assert "mOptions" not in svc.options
@@ -0,0 +1,44 @@
+import pytest
+
+from flet_secure_storage import WriteBehindOptions
+
+
+@pytest.fixture
+def populated(client):
+    client.storage.update(
+        {"app.user.a": "1", "app.user.b": "2", "app.cfg": "3", "other": "4"}
+    )
+    return client
+
+
+@pytest.mark.asyncio
+@pytest.mark.smoke
+class TestPrefixQueries:
+    async def test_list_keys(self, populated, storage_factory):
+        svc = storage_factory(prefix="app")
+
+        assert await svc.list_keys("user") == ["app.user.a", "app.user.b"]
+        assert await svc.list_keys() == ["app.user.a", "app.user.b", "app.cfg"]
+        assert populated.calls == ["list_keys", "list_keys"]
+
+    async def test_count(self, populated, storage_factory):
+        svc = storage_factory(prefix="app")
+
+        assert await svc.count("user") == 2
+        assert await svc.count() == 3
+        assert await storage_factory().count() == 4
+
+    async def test_items(self, populated, storage_factory):
+        svc = storage_factory(prefix="app")
+
+        assert await svc.items("user") == {"app.user.a": "1", "app.user.b": "2"}
+        assert await svc.get_keys("user") == ["app.user.a:1", "app.user.b:2"]
+
+    async def test_pending_writes_are_included(self, populated, storage_factory):
+        svc = storage_factory(prefix="app", write_behind=WriteBehindOptions())
+        await svc.set("user.c", "5")
+        await svc.remove("user.a")
+
+        assert await svc.list_keys("user") == ["app.user.b", "app.user.c"]
+        assert await svc.count("user") == 2
+        assert await svc.items("user") == {"app.user.b": "2", "app.user.c": "5"}
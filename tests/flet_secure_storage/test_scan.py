@@ -0,0 +1,48 @@
+import pytest
+
+from flet_secure_storage import WriteBehindOptions
+
+
+@pytest.fixture
+def populated(client):
+    client.storage.update({f"app.k{i:02d}": str(i) for i in range(25)})
+    client.storage["other"] = "x"
+    return client
+
+
+@pytest.mark.asyncio
+@pytest.mark.smoke
+class TestScan:
+    async def test_pages_follow_cursor(self, populated, storage_factory):
+        svc = storage_factory(prefix="app")
+
+        first = await svc.scan(limit=10)
+        assert first.keys == [f"app.k{i:02d}" for i in range(10)]
+        assert first.items == {}
+        assert first.cursor == "app.k09"
+
+        last = await svc.scan(start_after="app.k19", limit=10, include_values=True)
+        assert last.keys == [f"app.k{i:02d}" for i in range(20, 25)]
+        assert last.items["app.k24"] == "24"
+        assert last.cursor is None
+
+    async def test_iter_items(self, populated, storage_factory):
+        svc = storage_factory(prefix="app")
+
+        items = [item async for item in svc.iter_items(page_size=10)]
+
+        assert items == [(f"app.k{i:02d}", str(i)) for i in range(25)]
+        assert populated.calls == ["scan", "scan", "scan"]
+
+    async def test_pending_changes_in_page(self, populated, storage_factory):
+        svc = storage_factory(prefix="app", write_behind=WriteBehindOptions())
+        await svc.remove("k01")
+        await svc.set("k015", "new")
+
+        page = await svc.scan(limit=3, include_values=True)
+        assert page.keys == ["app.k00", "app.k015", "app.k02"]
+        assert page.items["app.k015"] == "new"
+
+    async def test_invalid_limit(self, storage_factory):
+        with pytest.raises(ValueError, match="limit"):
+            await storage_factory().scan(limit=0)
@@ -0,0 +1,174 @@
+import asyncio
+from typing import Any
+
+import pytest
+
+from flet_secure_storage import SecureStorage, WriteBehindOptions
+from flet_secure_storage.scheduler import OperationScheduler
+
+
+class GatedClient:
+    """
+    Holds every call until its method is released, recording the order in
+    which calls start and the largest number running at once.
+    """
+
+    def __init__(self) -> None:
+        self.storage: dict[str, str] = {}
+        self.started: list[tuple[str, Any]] = []
+        self.running = 0
+        self.max_running = 0
+        self.gates: dict[str, asyncio.Event] = {}
+
+    def gate(self, method: str) -> asyncio.Event:
+        return self.gates.setdefault(method, asyncio.Event())
+
+    async def invoke(self, name: str, args: dict[str, Any] | None = None) -> Any:
+        args = args or {}
+        self.started.append((name, args.get("key") or args.get("keys")))
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            if name in self.gates:
+                await self.gates[name].wait()
+            else:
+                await asyncio.sleep(0.01)
+        finally:
+            self.running -= 1
+        if name == "set":
+            self.storage[args["key"]] = args["value"]
+            return True
+        if name == "get":
+            return self.storage.get(args["key"])
+        if name == "contains_key":
+            return args["key"] in self.storage
+        if name == "set_many":
+            self.storage.update(args["values"])
+            return {key: True for key in args["values"]}
+        if name == "clear":
+            self.storage.clear()
+            return True
+        raise AssertionError(f"unexpected method: {name}")
+
+
+async def _settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def _storage(client: GatedClient, **kwargs: Any) -> SecureStorage:
+    svc = SecureStorage(**kwargs)
+    svc._invoke_method = client.invoke
+    return svc
+
+
+@pytest.mark.asyncio
+@pytest.mark.smoke
+class TestScheduler:
+    async def test_same_key_runs_in_order(self):
+        client = GatedClient()
+        svc = _storage(client)
+        set_gate = client.gate("set")
+
+        write = asyncio.ensure_future(svc.set("key", "new"))
+        read = asyncio.ensure_future(svc.get("key"))
+        await _settle()
+        assert client.started == [("set", "key")]
+
+        set_gate.set()
+        assert await write is True
+        assert await read == "new"
+
+    async def test_different_keys_run_in_parallel(self):
+        client = GatedClient()
+        svc = _storage(client)
+
+        await asyncio.gather(*(svc.set(f"key{i}", "value") for i in range(5)))
+
+        assert client.max_running == 5
+
+    async def test_reads_of_one_key_share_the_client(self):
+        client = GatedClient()
+        svc = _storage(client)
+
+        await asyncio.gather(svc.get("key"), svc.contains_key("key"))
+
+        assert client.max_running == 2
+
+    async def test_concurrency_limit(self):
+        client = GatedClient()
+        svc = _storage(client, max_concurrency=2)
+
+        await asyncio.gather(*(svc.set(f"key{i}", "value") for i in range(6)))
+
+        assert client.max_running == 2
+        assert len(client.storage) == 6
+
+    async def test_clear_waits_for_earlier_writes(self):
+        client = GatedClient()
+        svc = _storage(client)
+        set_gate = client.gate("set")
+
+        write = asyncio.ensure_future(svc.set("key", "value"))
+        clear = asyncio.ensure_future(svc.clear())
+        await _settle()
+        assert [name for name, _ in client.started] == ["set"]
+
+        set_gate.set()
+        await asyncio.gather(write, clear)
+        assert client.storage == {}
+
+    async def test_reads_go_before_background_writes(self):
+        client = GatedClient()
+        svc = _storage(
+            client,
+            max_concurrency=1,
+            write_behind=WriteBehindOptions(flush_interval=60),
+        )
+        get_gate = client.gate("get")
+        await svc.set("buffered", "value")
+
+        busy = asyncio.ensure_future(svc.get("busy"))
+        await _settle()
+        flush = asyncio.ensure_future(svc.flush())
+        read = asyncio.ensure_future(svc.get("other"))
+        await _settle()
+        get_gate.set()
+        await asyncio.gather(busy, flush, read)
+
+        assert [name for name, _ in client.started] == ["get", "get", "set_many"]
+
+    async def test_cancelled_call_releases_its_key(self):
+        client = GatedClient()
+        svc = _storage(client)
+        set_gate = client.gate("set")
+
+        first = asyncio.ensure_future(svc.set("key", "first"))
+        second = asyncio.ensure_future(svc.set("key", "second"))
+        await _settle()
+        second.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await second
+        set_gate.set()
+        await first
+
+        assert await svc.get("key") == "first"
+        assert svc._scheduler._keyed == {}
+
+    async def test_invalid_concurrency(self):
+        with pytest.raises(ValueError):
+            SecureStorage(max_concurrency=0)
+
+    async def test_uncontended_call_starts_without_waiting(self):
+        scheduler = OperationScheduler(max_concurrency=1)
+        first = scheduler.enter("set", {"key": "a", "value": "1"})
+        assert scheduler.start(first) is True
+
+        same_key = scheduler.enter("get", {"key": "a"})
+        other_key = scheduler.enter("get", {"key": "b"})
+        assert scheduler.start(same_key) is False
+        assert scheduler.start(other_key) is False
+
+        scheduler.release()
+        scheduler.leave(first)
+        assert scheduler.start(other_key) is True
@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+
+
+@pytest.fixture
+def slow_client(client):
+    """
+    Makes reads wait until `release` is set, so concurrent calls overlap.
+    """
+    release = asyncio.Event()
+    invoke = client.invoke
+
+    async def slow_invoke(name, args=None):
+        if name in ("get", "contains_key", "get_keys"):
+            client.calls.append(name)
+            await release.wait()
+            client.calls.pop()
+        return await invoke(name, args)
+
+    client.slow_invoke = slow_invoke
+    client.release = release
+    return client
+
+
+@pytest.mark.asyncio
+@pytest.mark.smoke
+class TestSingleFlight:
+    async def test_concurrent_gets_share_one_call(self, slow_client, storage_factory):
+        svc = storage_factory()
+        svc._invoke_method = slow_client.slow_invoke
+        slow_client.storage["auth.token"] = "t"
+
+        tasks = [asyncio.create_task(svc.get("auth.token")) for _ in range(5)]
+        await asyncio.sleep(0)
+        slow_client.release.set()
+
+        assert await asyncio.gather(*tasks) == ["t"] * 5
+        assert slow_client.calls == ["get"]
+
+    async def test_different_methods_do_not_share(self, slow_client, storage_factory):
+        svc = storage_factory()
+        svc._invoke_method = slow_client.slow_invoke
+        slow_client.storage["a"] = "1"
+
+        tasks = [
+            asyncio.create_task(svc.get("a")),
+            asyncio.create_task(svc.contains_key("a")),
+            asyncio.create_task(svc.get_keys("a")),
+            asyncio.create_task(svc.get_keys("a")),
+        ]
+        await asyncio.sleep(0)
+        slow_client.release.set()
+
+        assert await asyncio.gather(*tasks) == ["1", True, ["a:1"], ["a:1"]]
+        assert slow_client.calls == ["get", "contains_key", "get_keys"]
+
+    async def test_write_ends_sharing(self, slow_client, storage_factory):
+        svc = storage_factory()
+        svc._invoke_method = slow_client.slow_invoke
+
+        first = asyncio.create_task(svc.get("a"))
+        await asyncio.sleep(0)
+        await svc.set("a", "new")
+        second = asyncio.create_task(svc.get("a"))
+        await asyncio.sleep(0)
+        slow_client.release.set()
+
+        await first
+        assert await second == "new"
+        assert slow_client.calls.count("get") == 2
+
+    async def test_cancelled_caller_does_not_cancel_others(
+        self, slow_client, storage_factory
+    ):
+        svc = storage_factory()
+        svc._invoke_method = slow_client.slow_invoke
+        slow_client.storage["a"] = "1"
+
+        first = asyncio.create_task(svc.get("a"))
+        second = asyncio.create_task(svc.get("a"))
+        await asyncio.sleep(0)
+        first.cancel()
+        slow_client.release.set()
+
+        assert await second == "1"
+        with pytest.raises(asyncio.CancelledError):
+            await first
@@ -0,0 +1,183 @@
+import zlib
+from types import SimpleNamespace
+
+import flet as ft
+import pytest
+
+from flet_secure_storage import (
+    CompressionOptions,
+    MemoryBackend,
+    SecureStorage,
+    SecureStorageSnapshotError,
+    WriteBehindOptions,
+)
+from flet_secure_storage.snapshot import MAGIC, decode_snapshot, encode_snapshot
+
+
+@pytest.mark.smoke
+class TestSnapshotFormat:
+    def test_round_trip(self):
+        data = encode_snapshot("app", {"app.a": "1", "app.b": "ü"})
+        assert data.startswith(MAGIC)
+        assert decode_snapshot(data) == ("app", {"app.a": "1", "app.b": "ü"})
+
+    @pytest.mark.parametrize(
+        "data",
+        [
+            b"",
+            b"nope",
+            MAGIC + bytes([99]) + zlib.compress(b"{}"),
+            MAGIC + bytes([1]) + b"not zlib",
+            MAGIC + bytes([1]) + zlib.compress(b'{"prefix": "", "items": {"a": 1}}'),
+            MAGIC + bytes([1]) + zlib.compress(b"[]"),
+        ],
+    )
+    def test_rejects_invalid_data(self, data):
+        with pytest.raises(SecureStorageSnapshotError):
+            decode_snapshot(data)
+
+
+@pytest.mark.asyncio
+@pytest.mark.smoke
+class TestSnapshots:
+    async def test_export_in_one_call(self, client, storage_factory):
+        svc = storage_factory(prefix="app")
+        client.storage.update({"app.a": "1", "app.b": "2", "other": "3"})
+
+        data = await svc.export_snapshot()
+
+        assert client.calls == ["items"]
+        assert decode_snapshot(data) == ("app.", {"app.a": "1", "app.b": "2"})
+
+    async def test_export_with_progress(self, client, storage_factory):
+        svc = storage_factory()
+        client.storage.update({f"k{i}": str(i) for i in range(5)})
+        reports = []
+
+        data = await svc.export_snapshot(
+            progress=lambda done, total: reports.append((done, total)), page_size=2
+        )
+
+        assert reports == [(0, 5), (2, 5), (4, 5), (5, 5)]
+        assert len(decode_snapshot(data)[1]) == 5
+
+    async def test_merge_import_in_one_call(self, client, storage_factory):
+        source = storage_factory(prefix="app")
+        client.storage.update({"app.a": "1", "app.b": "2"})
+        data = await source.export_snapshot()
+        client.storage.clear()
+        client.storage["app.c"] = "kept"
+        client.calls.clear()
+
+        assert await storage_factory(prefix="app").import_snapshot(data) == 2
+
+        assert client.calls == ["commit"]
+        assert client.storage == {"app.a": "1", "app.b": "2", "app.c": "kept"}
+
+    async def test_replace_import(self, client, storage_factory):
+        svc = storage_factory(prefix="app")
+        data = encode_snapshot("app", {"app.a": "1"})
+        client.storage.update(
+            {"app.a": "old", "app.b": "2", "apple.c": "3", "other": "4"}
+        )
+
+        await svc.import_snapshot(data, mode="replace")
+
+        assert client.storage == {"app.a": "1", "apple.c": "3", "other": "4"}
+
+    async def test_replace_without_prefix_needs_confirmation(
+        self, client, storage_factory
+    ):
+        svc = storage_factory()
+        data = encode_snapshot("", {"a": "1"})
+        client.storage.update({"a": "old", "b": "2"})
+
+        with pytest.raises(ValueError):
+            await svc.import_snapshot(data, mode="replace")
+        assert client.storage == {"a": "old", "b": "2"}
+
+        await svc.import_snapshot(data, mode="replace", replace_all=True)
+        assert client.storage == {"a": "1"}
+
+    async def test_import_batches_and_progress(self, client, storage_factory):
+        svc = storage_factory()
+        data = encode_snapshot("", {f"k{i}": str(i) for i in range(5)})
+        reports = []
+
+        await svc.import_snapshot(
+            data,
+            progress=lambda done, total: reports.append((done, total)),
+            batch_size=2,
+        )
+
+        assert client.calls == ["commit"] * 3
+        assert reports == [(2, 5), (4, 5), (5, 5)]
+
+    async def test_import_is_one_commit_by_default(self, client, storage_factory):
+        svc = storage_factory()
+        values = {f"k{i}": "x" * 900 for i in range(5)}
+
+        assert await svc.import_snapshot(encode_snapshot("", values)) == 5
+
+        assert client.calls == ["commit"]
+        assert client.storage == values
+
+    async def test_import_batches_by_bytes(self, client, storage_factory):
+        svc = storage_factory()
+        values = {f"k{i}": "x" * 900 for i in range(5)}
+
+        await svc.import_snapshot(encode_snapshot("", values), batch_bytes=2048)
+
+        assert client.calls == ["commit"] * 3
+        assert client.storage == values
+
+    async def test_import_batches_by_bytes_on_windows(
+        self, client, storage_factory, monkeypatch
+    ):
+        page = SimpleNamespace(web=False, platform=ft.PagePlatform.WINDOWS)
+        monkeypatch.setattr(SecureStorage, "page", property(lambda self: page))
+        svc = storage_factory()
+        values = {f"k{i}": "x" * 900 for i in range(5)}
+
+        await svc.import_snapshot(encode_snapshot("", values))
+
+        assert client.calls == ["commit"] * 3
+        assert client.storage == values
+
+    async def test_import_drops_stale_cache(self, client, storage_factory):
+        svc = storage_factory(index_keys=True)
+        await svc.set("a", "old")
+        assert await svc.get("a") == "old"
+
+        await svc.import_snapshot(encode_snapshot("", {"a": "new", "b": "2"}))
+
+        assert await svc.get("a") == "new"
+        assert await svc.list_keys() == ["a", "b"]
+
+    async def test_export_includes_buffered_changes(self, client, storage_factory):
+        svc = storage_factory(write_behind=WriteBehindOptions(flush_interval=60))
+        await svc.set("a", "1")
+
+        assert decode_snapshot(await svc.export_snapshot())[1] == {"a": "1"}
+
+    async def test_values_are_recompressed_on_import(self):
+        compression = CompressionOptions(threshold=10)
+        source = SecureStorage(backend=MemoryBackend(), compression=compression)
+        await source.set("big", "x" * 100)
+        data = await source.export_snapshot()
+        assert decode_snapshot(data)[1] == {"big": "x" * 100}
+
+        target = SecureStorage(backend=MemoryBackend())
+        await target.import_snapshot(data)
+        assert await target.get("big") == "x" * 100
+
+    async def test_invalid_arguments(self, storage_factory):
+        svc = storage_factory()
+        with pytest.raises(ValueError):
+            await svc.import_snapshot(encode_snapshot("", {}), mode="overwrite")
+        with pytest.raises(ValueError):
+            await svc.import_snapshot(encode_snapshot("", {}), batch_size=0)
+        with pytest.raises(ValueError):
+            await svc.import_snapshot(encode_snapshot("", {}), batch_bytes=0)
+        with pytest.raises(SecureStorageSnapshotError):
+            await svc.import_snapshot(b"garbage")
@@ -0,0 +1,169 @@
+import asyncio
+from typing import Any
+
+import pytest
+
+from flet_secure_storage import (
+    SecureStorage,
+    SecureStorageFlushError,
+    SecureStorageTimeoutError,
+    WriteBehindOptions,
+)
+
+
+class SlowClient:
+    """
+    Answers every call after `delay` seconds and records the timeout that
+    `SecureStorage` passed down with it.
+    """
+
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+        self.storage: dict[str, str] = {}
+        self.timeouts: list[float | None] = []
+
+    async def invoke(
+        self,
+        name: str,
+        args: dict[str, Any] | None = None,
+        timeout: float | None = None,
+    ) -> Any:
+        self.timeouts.append(timeout)
+        await asyncio.sleep(self.delay)
+        args = args or {}
+        if name == "set":
+            self.storage[args["key"]] = args["value"]
+            return True
+        if name == "get":
+            return self.storage.get(args["key"])
+        if name == "set_many":
+            self.storage.update(args["values"])
+            return {key: True for key in args["values"]}
+        raise AssertionError(f"unexpected method: {name}")
+
+
+def _storage(client: SlowClient, **kwargs: Any) -> SecureStorage:
+    svc = SecureStorage(**kwargs)
+    svc._invoke_method = client.invoke
+    return svc
+
+
+@pytest.mark.asyncio
+@pytest.mark.smoke
+class TestTimeouts:
+    async def test_per_call_timeout(self):
+        svc = _storage(SlowClient(delay=1))
+
+        with pytest.raises(SecureStorageTimeoutError) as info:
+            await svc.get("key", timeout=0.01)
+
+        assert info.value.method == "get"
+        assert info.value.timeout == 0.01
+        assert isinstance(info.value, TimeoutError)
+
+    async def test_default_timeout(self):
+        svc = _storage(SlowClient(delay=1), default_timeout=0.01)
+
+        with pytest.raises(SecureStorageTimeoutError):
+            await svc.set("key", "value")
+
+    async def test_call_timeout_overrides_default(self):
+        client = SlowClient(delay=0.02)
+        svc = _storage(client, default_timeout=0.001)
+
+        assert await svc.set("key", "value", timeout=5) is True
+        assert client.timeouts == [5]
+
+    async def test_no_timeout_by_default(self):
+        client = SlowClient(delay=0)
+        svc = _storage(client)
+
+        await svc.set("key", "value")
+        assert await svc.get("key") == "value"
+        assert client.timeouts == [None, None]
+
+    async def test_namespace_passes_timeout(self):
+        svc = _storage(SlowClient(delay=1))
+
+        with pytest.raises(SecureStorageTimeoutError):
+            await svc.namespace("users").get("key", timeout=0.01)
+
+    async def test_joined_read_keeps_its_own_timeout(self):
+        svc = _storage(SlowClient(delay=1))
+        first = asyncio.ensure_future(svc.get("key"))
+        await asyncio.sleep(0)
+
+        with pytest.raises(SecureStorageTimeoutError) as info:
+            await asyncio.wait_for(svc.get("key", timeout=0.01), 0.5)
+        assert info.value.method == "get"
+        first.cancel()
+
+    async def test_typed_and_blob_methods_pass_timeout(self):
+        client = SlowClient(delay=0)
+        svc = _storage(client)
+
+        await svc.set_json("config", {"a": 1}, timeout=3)
+        assert await svc.get_json("config", timeout=3) == {"a": 1}
+        await svc.write_blob("blob", b"data", timeout=3)
+        assert [piece async for piece in svc.read_blob("blob", timeout=3)] == [b"data"]
+        assert set(client.timeouts) == {3}
+
+    async def test_metrics_count_timeouts_separately(self):
+        svc = _storage(SlowClient(delay=1), metrics=True)
+
+        with pytest.raises(SecureStorageTimeoutError):
+            await svc.get("key", timeout=0.01)
+
+        snapshot = svc.metrics.snapshot()["get"]
+        assert snapshot["count"] == 1
+        assert snapshot["timeouts"] == 1
+        assert snapshot["errors"] == 0
+
+    async def test_metrics_count_cancelled_calls(self):
+        svc = _storage(SlowClient(delay=1), metrics=True)
+
+        task = asyncio.ensure_future(svc.set("key", "value"))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        snapshot = svc.metrics.snapshot()["set"]
+        assert snapshot["cancelled"] == 1
+        assert snapshot["errors"] == 0
+
+    async def test_flush_timeout(self):
+        svc = _storage(
+            SlowClient(delay=1),
+            write_behind=WriteBehindOptions(flush_interval=60),
+        )
+        await svc.set("key", "value")
+
+        with pytest.raises(SecureStorageFlushError) as info:
+            await svc.flush(timeout=0.01)
+
+        assert isinstance(info.value.__cause__, SecureStorageTimeoutError)
+        assert info.value.failed_writes == {"key": "value"}
+
+    async def test_cancelled_flush_keeps_changes(self):
+        client = SlowClient(delay=1)
+        svc = _storage(client, write_behind=WriteBehindOptions(flush_interval=60))
+        await svc.set("key", "value")
+
+        task = asyncio.ensure_future(svc.flush())
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        client.delay = 0
+        await svc.flush()
+        assert client.storage == {"key": "value"}
+
+    @pytest.mark.parametrize("timeout", [0, -1])
+    async def test_invalid_timeout(self, timeout):
+        with pytest.raises(ValueError):
+            SecureStorage(default_timeout=timeout)
+        svc = _storage(SlowClient(delay=0))
+        with pytest.raises(ValueError):
+            await svc.get("key", timeout=timeout)
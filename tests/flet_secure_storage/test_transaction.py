@@ -0,0 +1,202 @@
+from types import SimpleNamespace
+
+import flet as ft
+import pytest
+
+from flet_secure_storage import (
+    EncryptedFileBackend,
+    MemoryBackend,
+    SecureStorage,
+    SecureStorageTransactionError,
+    WriteBehindOptions,
+)
+from flet_secure_storage.transaction import JOURNAL_KEY
+
+KEY = bytes(range(32))
+
+
+@pytest.mark.asyncio
+@pytest.mark.smoke
+class TestTransaction:
+    async def test_too_large_for_windows_is_rejected(
+        self, client, storage_factory, monkeypatch
+    ):
+        page = SimpleNamespace(web=False, platform=ft.PagePlatform.WINDOWS)
+        monkeypatch.setattr(SecureStorage, "page", property(lambda self: page))
+        svc = storage_factory()
+
+        with pytest.raises(SecureStorageTransactionError):
+            async with svc.transaction() as tx:
+                tx.set("a", "x" * 1500)
+                tx.set("b", "x" * 1500)
+        assert client.calls == []
+
+        async with svc.transaction() as tx:
+            tx.set("a", "x" * 1500)
+        assert client.storage == {"a": "x" * 1500}
+
+    async def test_commits_in_one_call(self, client, storage_factory):
+        svc = storage_factory(prefix="app")
+        client.storage["app.expires"] = "old"
+
+        async with svc.transaction() as tx:
+            tx.set("access", "a")
+            tx.set("refresh", "r")
+            tx.remove("expires")
+            assert client.calls == []
+
+        assert client.calls == ["commit"]
+        assert client.storage == {"app.access": "a", "app.refresh": "r"}
+
+    async def test_discards_on_error(self, client, storage_factory):
+        svc = storage_factory()
+
+        with pytest.raises(KeyError):
+            async with svc.transaction() as tx:
+                tx.set("access", "a")
+                raise KeyError("boom")
+
+        assert client.calls == []
+        assert client.storage == {}
+
+    async def test_empty_transaction_skips_the_client(self, client, storage_factory):
+        svc = storage_factory()
+        async with svc.transaction():
+            pass
+        assert client.calls == []
+
+    async def test_reads_its_own_changes(self, client, storage_factory):
+        svc = storage_factory()
+        client.storage.update({"a": "1", "b": "2"})
+
+        async with svc.transaction() as tx:
+            tx.set("a", "new")
+            tx.remove("b")
+            assert await tx.get("a") == "new"
+            assert await tx.get("b") is None
+            assert await tx.get("c") is None
+            assert len(tx) == 2
+
+    async def test_last_change_to_a_key_wins(self, client, storage_factory):
+        svc = storage_factory()
+
+        async with svc.transaction() as tx:
+            tx.set("a", "1")
+            tx.remove("a")
+            tx.set("b", "1")
+            tx.set("b", "2")
+
+        assert client.storage == {"b": "2"}
+
+    async def test_updates_cache_and_index(self, client, storage_factory):
+        svc = storage_factory(index_keys=True, cache=None)
+        await svc.set("a", "1")
+        assert await svc.list_keys() == ["a"]
+
+        async with svc.transaction() as tx:
+            tx.remove("a")
+            tx.set("b", "2")
+
+        assert await svc.list_keys() == ["b"]
+        assert await svc.get("b") == "2"
+
+    async def test_flushes_write_behind_first(self, client, storage_factory):
+        svc = storage_factory(write_behind=WriteBehindOptions(flush_interval=60))
+        await svc.set("a", "buffered")
+
+        async with svc.transaction() as tx:
+            tx.set("a", "committed")
+
+        await svc.flush()
+        assert client.calls == ["set_many", "commit"]
+        assert client.storage == {"a": "committed"}
+
+    async def test_namespace_scopes_keys(self, client, storage_factory):
+        svc = storage_factory(prefix="app")
+
+        async with svc.namespace("session").transaction() as tx:
+            tx.set("token", "t")
+
+        assert client.storage == {"app.session.token": "t"}
+
+    async def test_closed_transaction(self, storage_factory):
+        tx = storage_factory().transaction()
+        await tx.commit()
+        with pytest.raises(RuntimeError):
+            tx.set("a", "1")
+        with pytest.raises(RuntimeError):
+            await tx.commit()
+
+    async def test_rejects_none_values(self, storage_factory):
+        tx = storage_factory().transaction()
+        with pytest.raises(ValueError):
+            tx.set("a", None)
+
+    @pytest.mark.parametrize(
+        "response",
+        [
+            {"committed": False, "applied": False},
+            {"committed": True, "applied": False},
+            None,
+        ],
+    )
+    async def test_client_failures_raise(self, client, storage_factory, response):
+        svc = storage_factory()
+
+        async def invoke(name, args=None):
+            client.calls.append(name)
+            return response
+
+        svc._invoke_method = invoke
+        with pytest.raises(SecureStorageTransactionError):
+            async with svc.transaction() as tx:
+                tx.set("a", "1")
+
+    async def test_journal_key_is_reserved(self, storage_factory):
+        with pytest.raises(ValueError):
+            await storage_factory().set(JOURNAL_KEY, "x")
+        await storage_factory(prefix="app").set(JOURNAL_KEY, "x")
+
+
+@pytest.mark.asyncio
+@pytest.mark.smoke
+class TestBackendTransactions:
+    async def test_memory_backend(self):
+        svc = SecureStorage(backend=MemoryBackend())
+        await svc.set("old", "1")
+
+        async with svc.transaction() as tx:
+            tx.set("new", "2")
+            tx.remove("old")
+
+        assert await svc.items() == {"new": "2"}
+
+    async def test_encrypted_file_backend_persists(self, tmp_path):
+        path = tmp_path / "storage.bin"
+        svc = SecureStorage(backend=EncryptedFileBackend(path, KEY))
+        await svc.set("old", "1")
+        async with svc.transaction() as tx:
+            tx.set("new", "2")
+            tx.remove("old")
+        svc._backend.close()
+
+        reopened = SecureStorage(backend=EncryptedFileBackend(path, KEY))
+        assert await reopened.items() == {"new": "2"}
+
+    async def test_encrypted_file_backend_is_all_or_nothing(self, tmp_path):
+        path = tmp_path / "storage.bin"
+        svc = SecureStorage(backend=EncryptedFileBackend(path, KEY))
+        await svc.set("a", "1")
+        size = path.stat().st_size
+        async with svc.transaction() as tx:
+            tx.set("a", "2")
+            tx.set("b", "2")
+        svc._backend.close()
+
+        # Cut the transaction record short, as a crash while writing it would
+        with open(path, "r+b") as file:
+            file.truncate(path.stat().st_size - 10)
+        assert path.stat().st_size > size
+
+        reopened = SecureStorage(backend=EncryptedFileBackend(path, KEY))
+        assert await reopened.items() == {"a": "1"}
@@ -0,0 +1,148 @@
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Optional
+
+import pytest
+
+from flet_secure_storage import CacheOptions, CodecRegistry, WriteBehindOptions
+from flet_secure_storage.value_codecs import DataclassCodec, JsonCodec
+
+
+class Plan(Enum):
+    FREE = "free"
+    PRO = "pro"
+
+
+@dataclass
+class Address:
+    city: str = ""
+
+
+@dataclass
+class Profile:
+    name: str
+    age: int
+    active: bool
+    plan: Plan
+    joined: datetime
+    nickname: Optional[str] = None
+    addresses: list[Address] = field(default_factory=list)
+
+
+PROFILE = Profile(
+    name="Ada",
+    age=36,
+    active=True,
+    plan=Plan.PRO,
+    joined=datetime(2024, 1, 1, 12, tzinfo=timezone.utc),
+    addresses=[Address("London")],
+)
+
+
+@pytest.mark.smoke
+def test_dataclass_codec_round_trip():
+    codec = DataclassCodec(Profile)
+    raw = codec.encode(PROFILE)
+
+    assert '"plan":"PRO"' in raw
+    assert codec.decode(raw) == PROFILE
+
+
+@pytest.mark.smoke
+def test_dataclass_codec_parses_loose_values():
+    codec = DataclassCodec(Profile)
+    raw = (
+        '{"name":"Bob","age":"7","active":"yes","plan":"FREE",'
+        '"joined":"2024-01-01T00:00:00"}'
+    )
+
+    profile = codec.decode(raw)
+    assert (profile.age, profile.active, profile.plan) == (7, True, Plan.FREE)
+
+
+@pytest.mark.smoke
+def test_registry_lookup():
+    registry = CodecRegistry.default()
+
+    assert isinstance(registry.get(dict), JsonCodec)
+    assert isinstance(registry.get(Profile), DataclassCodec)
+    with pytest.raises(KeyError):
+        registry.get(set)
+
+
+@pytest.mark.asyncio
+@pytest.mark.smoke
+class TestTypedAccessors:
+    async def test_scalars(self, client, storage_factory):
+        svc = storage_factory()
+
+        await svc.set_int("i", 5)
+        await svc.set_float("f", 0.1)
+        await svc.set_bool("b", False)
+        await svc.set_datetime("d", PROFILE.joined)
+        await svc.set_json("j", {"a": [1, 2]})
+
+        assert client.storage["b"] == "false"
+        assert await svc.get_int("i") == 5
+        assert await svc.get_float("f") == 0.1
+        assert await svc.get_bool("b") is False
+        assert await svc.get_datetime("d") == PROFILE.joined
+        assert await svc.get_json("j") == {"a": [1, 2]}
+        assert await svc.get_int("missing", 3) == 3
+
+    async def test_dataclass(self, storage_factory):
+        svc = storage_factory()
+
+        await svc.set_dataclass("profile", PROFILE)
+        assert await svc.get_dataclass("profile", Profile) == PROFILE
+        assert await svc.get_typed("profile", Profile) == PROFILE
+
+    async def test_immutable_objects_are_reused(self, client, storage_factory):
+        svc = storage_factory(write_behind=WriteBehindOptions())
+        await svc.set_datetime("at", PROFILE.joined)
+
+        first = await svc.get_datetime("at")
+        assert await svc.get_datetime("at") is first
+
+        await svc.set_datetime("at", datetime(2025, 1, 1, tzinfo=timezone.utc))
+        assert await svc.get_datetime("at") == datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+    async def test_mutating_a_result_does_not_change_later_reads(
+        self, client, storage_factory
+    ):
+        svc = storage_factory(write_behind=WriteBehindOptions())
+        await svc.set_json("cfg", {"flags": [1]})
+
+        first = await svc.get_json("cfg")
+        first["flags"].append(2)
+        first["extra"] = True
+
+        assert await svc.get_json("cfg") == {"flags": [1]}
+
+    async def test_decoded_objects_stay_within_cache_bytes(
+        self, client, storage_factory
+    ):
+        svc = storage_factory(cache=CacheOptions(max_bytes=100))
+        client.storage.update({"a": '"' + "x" * 60 + '"', "b": '"' + "y" * 60 + '"'})
+
+        first = await svc.get_json("a")
+        await svc.get_json("b")
+        assert list(svc._decoded) == ["b"]
+        assert svc._decoded_bytes <= 100
+        assert await svc.get_json("a") is not first
+
+    async def test_custom_codec(self, client, storage_factory):
+        class Upper:
+            def encode(self, value: str) -> str:
+                return value.upper()
+
+            def decode(self, raw: str) -> str:
+                return raw.lower()
+
+        svc = storage_factory()
+        svc.codecs.register(str, Upper())
+
+        await svc.set_typed("k", "hi")
+        assert client.storage["k"] == "HI"
+        assert await svc.get_typed("k", str) == "hi"
@@ -0,0 +1,117 @@
+import asyncio
+
+import pytest
+
+from flet_secure_storage import (
+    MemoryBackend,
+    SecureStorage,
+    SecureStorageFlushError,
+    WriteBehindOptions,
+)
+
+
+@pytest.mark.asyncio
+@pytest.mark.smoke
+class TestWriteBehind:
+    async def test_writes_coalesce_until_flush(self, client, storage_factory):
+        svc = storage_factory(prefix="app", write_behind=WriteBehindOptions())
+
+        for value in ("1", "2", "3"):
+            assert await svc.set("key", value) is True
+        await svc.set("other", "x")
+        await svc.remove("other")
+        assert client.calls == []
+
+        await svc.flush()
+        assert client.calls == ["set_many", "remove_many"]
+        assert client.storage == {"app.key": "3"}
+
+    async def test_reads_see_pending_changes(self, client, storage_factory):
+        svc = storage_factory(write_behind=WriteBehindOptions())
+        client.storage.update({"gone": "old", "kept": "v"})
+
+        await svc.set("new", "pending")
+        await svc.remove("gone")
+
+        assert await svc.get("new") == "pending"
+        assert await svc.get("gone") is None
+        assert await svc.contains_key("gone") is False
+        assert await svc.contains_many(["new", "kept"]) == {"new": True, "kept": True}
+        assert await svc.get_many(["new", "gone"]) == {"new": "pending", "gone": None}
+        assert sorted(await svc.get_keys()) == ["kept:v", "new:pending"]
+
+    async def test_flush_on_size_threshold(self, client, storage_factory):
+        svc = storage_factory(write_behind=WriteBehindOptions(max_pending=2))
+
+        await svc.set("a", "1")
+        assert client.calls == []
+        await svc.set("b", "2")
+        assert client.calls == ["set_many"]
+
+    async def test_flush_on_interval(self, client, storage_factory):
+        svc = storage_factory(write_behind=WriteBehindOptions(flush_interval=0.01))
+
+        await svc.set("a", "1")
+        await asyncio.sleep(0.05)
+        assert client.storage == {"a": "1"}
+
+    async def test_flush_failure_is_reported(self, client, storage_factory):
+        svc = storage_factory(write_behind=WriteBehindOptions())
+
+        async def rejecting(name, args=None):
+            client.calls.append(name)
+            return {key: False for key in args["values"]}
+
+        svc._invoke_method = rejecting
+        await svc.set("a", "1")
+        with pytest.raises(SecureStorageFlushError) as exc_info:
+            await svc.flush()
+        assert exc_info.value.failed_writes == {"a": "1"}
+
+    async def test_background_failure_raised_on_next_call(self, storage_factory):
+        svc = storage_factory(write_behind=WriteBehindOptions(flush_interval=0))
+
+        async def broken(name, args=None):
+            raise RuntimeError("client gone")
+
+        svc._invoke_method = broken
+        await svc.set("a", "1")
+        await asyncio.sleep(0.01)
+        with pytest.raises(SecureStorageFlushError, match="client gone"):
+            await svc.set("b", "2")
+
+    async def test_clear_drops_pending(self, client, storage_factory):
+        svc = storage_factory(write_behind=WriteBehindOptions())
+        await svc.set("a", "1")
+
+        assert await svc.clear() is True
+        await svc.flush()
+        assert client.storage == {}
+        assert await svc.get("a") is None
+
+    async def test_close_flushes_pending(self, client, storage_factory):
+        svc = storage_factory(write_behind=WriteBehindOptions())
+        await svc.set("a", "1")
+
+        await svc.close()
+        assert client.storage == {"a": "1"}
+
+    async def test_unmount_with_pending_writes_warns(self, client, storage_factory):
+        svc = storage_factory(write_behind=WriteBehindOptions(flush_interval=0.01))
+        await svc.set("a", "1")
+        await svc.remove("b")
+
+        with pytest.warns(RuntimeWarning, match="a, b"):
+            svc.will_unmount()
+        await asyncio.sleep(0.02)
+        assert client.calls == []
+        assert await svc.get("a") == "1"
+
+    async def test_unmount_flushes_python_backends(self):
+        backend = MemoryBackend()
+        svc = SecureStorage(backend=backend, write_behind=WriteBehindOptions())
+        await svc.set("a", "1")
+
+        svc.will_unmount()
+        await asyncio.sleep(0)
+        assert await backend.invoke("get", {"key": "a"}) == "1"